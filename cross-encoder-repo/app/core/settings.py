@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 BASE_DIR = Path(__file__).parent.parent.parent
 
@@ -17,6 +17,46 @@ class Settings(BaseSettings):
     redis_password: Optional[str] = None
     redis_db: int = 1
 
+    # Cross-Encoder 모델 설정
+    cross_encoder_default_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    cross_encoder_device: str = "auto"  # auto / cpu / cuda / cuda:0
+    cross_encoder_max_length: Optional[int] = 512
+    cross_encoder_warmup_models: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # 콤마 구분, 빈 값이면 워밍업 안 함
+
+    # 점수 계산 backend (torch: sentence-transformers / onnx: ONNX Runtime + 길이 버킷 배치)
+    cross_encoder_backend: str = "torch"
+    cross_encoder_onnx_dir: str = "/models/onnx"  # export된 onnx 모델 캐시 경로
+    cross_encoder_onnx_quantize: bool = False  # dynamic int8 양자화 모델 사용
+    cross_encoder_onnx_threads: int = 0  # intra-op 스레드 수 (0이면 onnxruntime 기본값)
+    cross_encoder_token_budget: int = 8192  # 배치당 padding 포함 토큰 수 상한
+    cross_encoder_max_batch_size: int = 64
+
+    @property
+    def cross_encoder_warmup_models_list(self) -> List[str]:
+        return [name.strip() for name in self.cross_encoder_warmup_models.split(",") if name.strip()]
+
+    # 동적 배치 (동시 요청의 쌍을 모아 forward 1회로 계산)
+    cross_encoder_dynamic_batching: bool = True
+    cross_encoder_batch_max_pairs: int = 128
+    cross_encoder_batch_max_wait_ms: float = 5.0
+    cross_encoder_batch_timeout_seconds: float = 60.0  # 요청이 배치 결과를 기다리는 최대 시간
+
+    # rerank 점수 캐시 (모델, 정규화 질의 해시, 문단 해시)
+    rerank_cache_enabled: bool = True
+    rerank_cache_max_entries: int = 100_000
+    rerank_cache_redis_enabled: bool = False  # Redis 2차 캐시 (인스턴스 간 공유)
+    rerank_cache_redis_ttl_seconds: int = 86400
+
+    # cascade 전략 (중복 제거 → 저비용 1차 점수 → 상위 topN만 cross-encoder)
+    cascade_top_n: int = 20
+    cascade_prescore_model: str = ""  # 비우면 검색 점수(normalizedScore, metricType을 아는 score)로 1차 선별
+
+    # /process/joint 텍스트 + 이미지 동시 재정렬
+    joint_image_scorer: str = "caption"  # caption / clip
+    # 보정 sigmoid(a * x + b) 계수 "a,b" (cross-encoder는 x = logit(점수), clip은 x = 코사인 유사도)
+    joint_text_calibration: str = "1.0,0.0"
+    joint_clip_calibration: str = "20.0,-5.0"
+
     # 로깅 설정
     logging_level: str = "INFO"
     log_file_enabled: bool = False
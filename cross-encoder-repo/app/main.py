@@ -5,6 +5,9 @@ from .config import settings
 from .routers import router
 from datetime import datetime
 from .core.openapi import custom_openapi
+from .service.model_registry import get_model_registry
+from loguru import logger
+import asyncio
 
 
 
@@ -27,6 +30,16 @@ app.openapi = lambda: custom_openapi(app)
 # Router 등록
 app.include_router(router)
 
+
+@app.on_event("startup")
+async def startup_event():
+    """Cross-encoder 모델을 미리 로드하여 첫 rerank 요청의 모델 로드 비용 제거"""
+    try:
+        await asyncio.to_thread(get_model_registry().warmup)
+    except Exception as e:
+        logger.warning(f"Cross-encoder warm-up failed (will load on first request): {e}")
+
+
 @app.get("/")
 async def root():
     return {
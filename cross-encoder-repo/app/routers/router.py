@@ -1,9 +1,20 @@
 from fastapi import APIRouter, HTTPException
-from app.schemas.request.crossEncoderRequest import CrossEncoderProcessRequest
-from app.schemas.response.crossEncoderProcessResponse import CrossEncoderProcessResponse, CrossEncoderProcessResult, RetrievedChunk
+from app.schemas.request.crossEncoderRequest import CrossEncoderProcessRequest, CrossEncoderJointRequest
+from app.schemas.response.crossEncoderProcessResponse import (
+    CrossEncoderProcessResponse,
+    CrossEncoderProcessResult,
+    RetrievedChunk,
+    CrossEncoderJointResponse,
+    CrossEncoderJointResult,
+    JointRankedChunk,
+)
 from app.schemas.response.errorResponse import ErrorResponse
 from app.middleware.metrics_middleware import with_cross_encoder_metrics
+from app.service.model_registry import get_model_registry
+from app.service.score_cache_service import get_score_cache_service
+from app.service.joint_rerank_service import joint_rerank
 from typing import Dict, Any
+import asyncio
 import importlib
 from loguru import logger
 
@@ -53,6 +64,18 @@ def get_strategy(strategy_name: str, parameters: Dict[Any, Any] = None) -> Any:
         )
 
 
+@router.get("/models")
+async def loaded_models():
+    """로드된 cross-encoder 모델 목록과 메모리 사용량"""
+    return get_model_registry().stats()
+
+
+@router.get("/cache/stats")
+async def score_cache_stats():
+    """rerank 점수 캐시 적중률"""
+    return get_score_cache_service().stats()
+
+
 @router.post("/process")
 @with_cross_encoder_metrics
 async def cross_encoder_process(request: CrossEncoderProcessRequest):
@@ -72,8 +95,9 @@ async def cross_encoder_process(request: CrossEncoderProcessRequest):
         strategy = get_strategy(strategy_name, parameters)
 
         # rerank() 메서드 호출 (기존 코드와 호환을 위해 Dict 형태로 변환)
+        # 스레드 풀에서 실행해 동시 요청이 이벤트 루프를 막지 않고 동적 배치로 합쳐지도록 함
         query_embedding_dict = {"query": query}
-        result = strategy.rerank(query_embedding_dict, candidate_embeddings)
+        result = await asyncio.to_thread(strategy.rerank, query_embedding_dict, candidate_embeddings)
 
         # retrievedChunks 변환
         retrieved_chunks = [
@@ -99,7 +123,8 @@ async def cross_encoder_process(request: CrossEncoderProcessRequest):
                 retrievedChunks=retrieved_chunks,
                 count=result.get("count", len(retrieved_chunks)),
                 strategy=result.get("strategy", strategy_name),
-                parameters=result.get("parameters", parameters)
+                parameters=result.get("parameters", parameters),
+                cascade=result.get("cascade")
             )
         )
         return response
@@ -146,8 +171,9 @@ async def cross_encoder_process_image(request: CrossEncoderProcessRequest):
         strategy = get_strategy(strategy_name, parameters)
 
         # rerank() 메서드 호출 (기존 코드와 호환을 위해 Dict 형태로 변환)
+        # 스레드 풀에서 실행해 동시 요청이 이벤트 루프를 막지 않고 동적 배치로 합쳐지도록 함
         query_embedding_dict = {"query": query}
-        result = strategy.rerank(query_embedding_dict, candidate_embeddings)
+        result = await asyncio.to_thread(strategy.rerank, query_embedding_dict, candidate_embeddings)
 
         # retrievedChunks 변환
         retrieved_chunks = [
@@ -173,7 +199,8 @@ async def cross_encoder_process_image(request: CrossEncoderProcessRequest):
                 retrievedChunks=retrieved_chunks,
                 count=result.get("count", len(retrieved_chunks)),
                 strategy=result.get("strategy", strategy_name),
-                parameters=result.get("parameters", parameters)
+                parameters=result.get("parameters", parameters),
+                cascade=result.get("cascade")
             )
         )
         return response
@@ -196,3 +223,81 @@ async def cross_encoder_process_image(request: CrossEncoderProcessRequest):
             result={}
         )
         raise HTTPException(status_code=500, detail=error_response.dict())
+
+
+@router.post("/process/joint")
+@with_cross_encoder_metrics
+async def cross_encoder_process_joint(request: CrossEncoderJointRequest):
+    """Cross Encoder /process/joint 엔드포인트
+    - 텍스트 후보(candidateEmbeddings)와 이미지 후보(imageCandidateEmbeddings)를 한 번에 받아 동시에 재정렬
+    - 모달리티별 결과(retrievedChunks / retrievedChunksImage)와 보정 점수로 병합한 rankedChunks 반환
+    """
+    try:
+        query = request.query
+        strategy_name = request.crossEncoderStrategy
+        parameters = request.crossEncoderParameter
+
+        logger.info(
+            f"Processing joint cross-encoder: {len(request.candidateEmbeddings)} text / "
+            f"{len(request.imageCandidateEmbeddings)} image candidates, strategy={strategy_name}"
+        )
+
+        if not query:
+            raise HTTPException(status_code=400, detail="query cannot be empty")
+
+        # 전략 로드
+        strategy = get_strategy(strategy_name, parameters)
+
+        try:
+            result = await joint_rerank(
+                query,
+                request.candidateEmbeddings,
+                request.imageCandidateEmbeddings,
+                strategy,
+                parameters=parameters,
+                image_scorer=request.imageScorer,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        retrieved_chunks = [RetrievedChunk(**chunk) for chunk in result["retrievedChunks"]]
+        retrieved_chunks_image = [RetrievedChunk(**chunk) for chunk in result["retrievedChunksImage"]]
+        ranked_chunks = [JointRankedChunk(**chunk) for chunk in result["rankedChunks"]]
+
+        response = CrossEncoderJointResponse(
+            status=200,
+            code="OK",
+            message="요청에 성공하였습니다.",
+            isSuccess=True,
+            result=CrossEncoderJointResult(
+                query=query,
+                retrievedChunks=retrieved_chunks,
+                retrievedChunksImage=retrieved_chunks_image,
+                rankedChunks=ranked_chunks,
+                count=len(ranked_chunks),
+                strategy=result.get("strategy") or strategy_name,
+                imageScorer=result["imageScorer"],
+                parameters=parameters,
+                cascade=result.get("cascade")
+            )
+        )
+        return response
+    except HTTPException as e:
+        error_response = ErrorResponse(
+            status=e.status_code,
+            code="VALIDATION_ERROR" if e.status_code == 400 else "NOT_FOUND" if e.status_code == 404 else "INTERNAL_ERROR",
+            message=str(e.detail),
+            isSuccess=False,
+            result={}
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response.dict())
+    except Exception as e:
+        logger.error(f"Error processing joint cross-encoder: {str(e)}", exc_info=True)
+        error_response = ErrorResponse(
+            status=500,
+            code="INTERNAL_ERROR",
+            message=f"Internal server error: {str(e)}",
+            isSuccess=False,
+            result={}
+        )
+        raise HTTPException(status_code=500, detail=error_response.dict())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 class CrossEncoderProcessRequest(BaseModel):
@@ -9,3 +9,13 @@ class CrossEncoderProcessRequest(BaseModel):
     crossEncoderStrategy: str
     crossEncoderParameter: Dict[Any, Any] = {}
 
+
+class CrossEncoderJointRequest(BaseModel):
+    """Cross Encoder /process/joint 요청 스키마 (텍스트 + 이미지 후보)"""
+    query: str
+    candidateEmbeddings: List[Dict[str, Any]] = []
+    imageCandidateEmbeddings: List[Dict[str, Any]] = []
+    crossEncoderStrategy: str
+    crossEncoderParameter: Dict[Any, Any] = {}
+    # caption: 이미지 캡션 텍스트를 cross-encoder로 / clip: 검색 CLIP 유사도 사용 (기본: joint_image_scorer)
+    imageScorer: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 class RetrievedChunk(BaseModel):
@@ -19,6 +19,8 @@ class CrossEncoderProcessResult(BaseModel):
     count: int
     strategy: str
     parameters: Dict[Any, Any]
+    # cascade 전략의 단계별 후보 수 / 제거 수
+    cascade: Optional[Dict[str, Any]] = None
 
 
 class CrossEncoderProcessResponse(BaseModel):
@@ -30,10 +32,29 @@ class CrossEncoderProcessResponse(BaseModel):
     result: CrossEncoderProcessResult
 
 
+class JointRankedChunk(RetrievedChunk):
+    """텍스트/이미지 병합 순위 항목 (score는 보정 점수, rawScore는 모달리티별 원 점수)"""
+    modality: str
+    rawScore: float
 
 
+class CrossEncoderJointResult(BaseModel):
+    """Cross Encoder Joint 결과 스키마"""
+    query: str
+    retrievedChunks: List[RetrievedChunk]
+    retrievedChunksImage: List[RetrievedChunk]
+    rankedChunks: List[JointRankedChunk]
+    count: int
+    strategy: str
+    imageScorer: str
+    parameters: Dict[Any, Any]
+    cascade: Optional[Dict[str, Any]] = None
 
 
-
-
-
+class CrossEncoderJointResponse(BaseModel):
+    """Cross Encoder /process/joint 응답 스키마"""
+    status: int
+    code: str
+    message: str
+    isSuccess: bool
+    result: CrossEncoderJointResult
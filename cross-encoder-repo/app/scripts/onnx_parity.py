@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+ONNX backend 점수/순위 일치 및 지연 검증 스크립트
+python -m app.scripts.onnx_parity [--input pairs.jsonl] [--quantize] [--candidates 50]
+
+cross_encoder_backend=onnx로 전환하기 전(또는 int8 양자화 적용 전) 실행합니다.
+
+1) 같은 모델을 torch(sentence-transformers)와 onnx backend로 로드 (onnx 모델이 없으면 export)
+2) 질의별 후보 점수를 두 backend로 계산해 최대 절대 오차, top-k 집합/순서 일치, 순위 상관(Spearman) 비교
+3) 후보 --candidates개 rerank 1회의 지연(p50/p95)을 backend별로 측정
+4) 결과를 JSON으로 출력하고, 허용 오차/top-k 불일치/지연 예산(--latency-budget-ms)을 넘으면 exit 1
+
+--input JSONL 형식 (한 줄에 질의 하나):
+    {"query": "...", "passages": ["...", "..."]}
+지정하지 않으면 내장 샘플 질의/문단으로 후보를 만듭니다.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from app.core.settings import settings
+from app.service.model_registry import get_model_registry
+
+SAMPLE_QUERIES = [
+    "연차 휴가는 언제까지 사용해야 하나요?",
+    "출장비 정산 절차를 알려주세요",
+    "How do I reset my VPN password?",
+]
+
+SAMPLE_SENTENCES = [
+    "연차 휴가는 발생일로부터 1년 이내에 사용해야 하며 미사용 연차는 회계연도 말에 정산됩니다.",
+    "출장비는 출장 종료 후 7일 이내에 영수증을 첨부하여 전자결재로 정산 신청합니다.",
+    "VPN 비밀번호는 사내 포털의 계정 관리 메뉴에서 재설정할 수 있습니다.",
+    "The VPN password can be reset from the account page of the internal portal.",
+    "법인카드 사용 내역은 매월 5일까지 증빙 자료와 함께 제출해야 합니다.",
+    "신규 입사자는 입사 첫 주에 보안 교육과 개인정보보호 교육을 이수해야 합니다.",
+    "회의실 예약은 그룹웨어 일정 메뉴에서 최대 2주 전까지 가능합니다.",
+    "Remote work requests must be approved by the team lead one day in advance.",
+    "건강검진은 매년 상반기에 지정 병원에서 실시하며 비용은 회사가 부담합니다.",
+    "퇴직금은 퇴사일로부터 14일 이내에 지급됩니다.",
+]
+
+
+def sample_dataset(num_candidates: int) -> List[Dict[str, Any]]:
+    """내장 문장을 길이가 다르게 이어 붙여 질의별 후보 생성"""
+    rng = np.random.default_rng(0)
+    dataset = []
+    for query in SAMPLE_QUERIES:
+        passages = []
+        for _ in range(num_candidates):
+            count = int(rng.integers(1, 8))
+            passages.append(" ".join(rng.choice(SAMPLE_SENTENCES, size=count)))
+        dataset.append({"query": query, "passages": passages})
+    return dataset
+
+
+def load_dataset(path: str, num_candidates: int) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [{"query": row["query"], "passages": list(row["passages"])[:num_candidates]} for row in rows if row.get("passages")]
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    """순위 상관계수 (동점 처리 없이 argsort 순위 사용)"""
+    if len(a) < 2:
+        return 1.0
+    rank_a = np.argsort(np.argsort(a)).astype(np.float64)
+    rank_b = np.argsort(np.argsort(b)).astype(np.float64)
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def compare(query: str, passages: List[str], reference, candidate, k: int) -> Dict[str, Any]:
+    pairs = [(query, passage) for passage in passages]
+    ref_scores = np.asarray(reference.predict(pairs, show_progress_bar=False), dtype=np.float64)
+    onnx_scores = np.asarray(candidate.predict(pairs, show_progress_bar=False), dtype=np.float64)
+    ref_top = list(np.argsort(-ref_scores)[:k])
+    onnx_top = list(np.argsort(-onnx_scores)[:k])
+    return {
+        "query": query,
+        "candidates": len(passages),
+        "maxAbsDiff": float(np.max(np.abs(ref_scores - onnx_scores))),
+        "topKOverlap": len(set(ref_top) & set(onnx_top)) / max(len(ref_top), 1),
+        "topKOrderEqual": ref_top == onnx_top,
+        "spearman": spearman(ref_scores, onnx_scores),
+    }
+
+
+def measure_latency(model, query: str, passages: List[str], repeats: int) -> Dict[str, float]:
+    """후보 전체 rerank 1회 지연(ms)"""
+    pairs = [(query, passage) for passage in passages]
+    model.predict(pairs, show_progress_bar=False)
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        model.predict(pairs, show_progress_bar=False)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50Ms": float(np.percentile(latencies, 50)),
+        "p95Ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ONNX backend parity / latency check")
+    parser.add_argument("--model", default=settings.cross_encoder_default_model, help="모델 이름")
+    parser.add_argument("--device", default="cpu", help="device (기본: cpu)")
+    parser.add_argument("--input", default=None, help="질의/후보 JSONL (기본: 내장 샘플)")
+    parser.add_argument("--candidates", type=int, default=50, help="질의당 후보 수")
+    parser.add_argument("--quantize", action="store_true", default=settings.cross_encoder_onnx_quantize, help="int8 양자화 모델 검증")
+    parser.add_argument("--k", type=int, default=5, help="순위 비교 top-k")
+    parser.add_argument("--max-abs-diff", type=float, default=None, help="허용 점수 오차 (기본: fp32 1e-3, int8 5e-2)")
+    parser.add_argument("--min-topk-overlap", type=float, default=1.0, help="허용 top-k 집합 일치율")
+    parser.add_argument("--latency-budget-ms", type=float, default=100.0, help="onnx p95 지연 예산 (0이면 검사 안 함)")
+    parser.add_argument("--repeats", type=int, default=20, help="지연 측정 반복 수")
+    parser.add_argument("--output", default=None, help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    settings.cross_encoder_onnx_quantize = args.quantize
+    # backend 자체 지연을 재도록 동적 배치 대기 시간 제외
+    settings.cross_encoder_dynamic_batching = False
+    max_abs_diff = args.max_abs_diff if args.max_abs_diff is not None else (5e-2 if args.quantize else 1e-3)
+    dataset = load_dataset(args.input, args.candidates) if args.input else sample_dataset(args.candidates)
+
+    registry = get_model_registry()
+    reference = registry.get(args.model, args.device, "torch")
+    candidate = registry.get(args.model, args.device, "onnx")
+
+    results = [compare(row["query"], row["passages"], reference, candidate, args.k) for row in dataset]
+    latency_row = max(dataset, key=lambda row: len(row["passages"]))
+    latency = {
+        "candidates": len(latency_row["passages"]),
+        "torch": measure_latency(reference, latency_row["query"], latency_row["passages"], args.repeats),
+        "onnx": measure_latency(candidate, latency_row["query"], latency_row["passages"], args.repeats),
+    }
+
+    failures = []
+    worst_diff = max(result["maxAbsDiff"] for result in results)
+    if worst_diff > max_abs_diff:
+        failures.append(f"max abs diff {worst_diff:.4g} > {max_abs_diff:.4g}")
+    worst_overlap = min(result["topKOverlap"] for result in results)
+    if worst_overlap < args.min_topk_overlap:
+        failures.append(f"top-{args.k} overlap {worst_overlap:.2f} < {args.min_topk_overlap:.2f}")
+    if args.latency_budget_ms > 0 and latency["onnx"]["p95Ms"] > args.latency_budget_ms:
+        failures.append(f"onnx p95 {latency['onnx']['p95Ms']:.1f}ms > {args.latency_budget_ms:.0f}ms")
+
+    report = {
+        "model": args.model,
+        "device": args.device,
+        "quantize": args.quantize,
+        "tokenBudget": settings.cross_encoder_token_budget,
+        "queries": results,
+        "latency": latency,
+        "models": registry.stats(),
+        "passed": not failures,
+        "failures": failures,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    for failure in failures:
+        logger.error(f"[Parity] {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
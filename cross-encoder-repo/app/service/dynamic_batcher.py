@@ -0,0 +1,107 @@
+"""
+Cross-Encoder 동적 배치 (cross_encoder_dynamic_batching)
+동시 요청이 각자 작은 배치로 forward를 돌리면 CPU가 작은 연산 사이를 오가며 처리량이 떨어지므로,
+모델별 작업 스레드 하나가 요청들의 (query, passage) 쌍을 모아 한 번에 계산합니다.
+- predict 호출은 쌍 목록을 큐에 넣고 결과(Future)를 기다림
+- 작업 스레드는 첫 요청 도착 후 cross_encoder_batch_max_wait_ms 동안, 또는 쌍이 cross_encoder_batch_max_pairs개가 될 때까지 모음
+- 모은 쌍을 forward 1회로 계산한 뒤 요청별로 잘라 Future에 전달 (실패 시 모든 요청에 예외 전달)
+- 요청은 cross_encoder_batch_timeout_seconds까지만 기다리고, 시간 초과로 취소된 요청은 계산에서 제외
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from app.core.settings import settings
+
+
+class DynamicBatcher:
+    """모델 predict를 감싸 동시 요청을 하나의 배치로 합치는 래퍼 (predict 인터페이스 동일)"""
+
+    def __init__(self, model: Any, name: str):
+        self.model = model
+        self.name = name
+        self.max_pairs = max(settings.cross_encoder_batch_max_pairs, 1)
+        self.max_wait = max(settings.cross_encoder_batch_max_wait_ms, 0.0) / 1000
+        self.timeout = settings.cross_encoder_batch_timeout_seconds if settings.cross_encoder_batch_timeout_seconds > 0 else None
+        self._queue: "queue.Queue[Tuple[List[Tuple[str, str]], Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "requests": 0, "pairs": 0}
+        self._worker = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._worker.start()
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], **kwargs) -> np.ndarray:
+        """
+        (query, passage) 쌍 점수 (다른 요청과 합쳐 계산, 입력 순서 유지)
+
+        batch_size, show_progress_bar 등 인자는 무시합니다.
+
+        Raises:
+            concurrent.futures.TimeoutError: cross_encoder_batch_timeout_seconds 안에 결과가 없을 때
+        """
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+        future: Future = Future()
+        self._queue.put((list(pairs), future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # 아직 계산 전이면 배치에서 제외되도록 취소
+            future.cancel()
+            logger.error(f"[Batcher:{self.name}] Request of {len(pairs)} pairs timed out after {self.timeout}s")
+            raise
+
+    def _collect(self, items: List[Tuple[List[Tuple[str, str]], Future]]) -> None:
+        """첫 요청을 기다린 뒤 최대 대기 시간/쌍 수까지 items에 모음"""
+        items.append(self._queue.get())
+        count = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_pairs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            count += len(item[0])
+
+    def _run(self) -> None:
+        # 작업 스레드는 하나뿐이므로 어떤 예외도 루프를 끝내지 않고, 모은 요청 모두에 예외를 전달
+        while True:
+            items: List[Tuple[List[Tuple[str, str]], Future]] = []
+            try:
+                self._collect(items)
+                # 시간 초과로 취소된 요청 제외 (이후에는 취소 불가)
+                items = [item for item in items if item[1].set_running_or_notify_cancel()]
+                if not items:
+                    continue
+                pairs = [pair for item_pairs, _ in items for pair in item_pairs]
+                scores = np.asarray(self.model.predict(pairs, batch_size=min(len(pairs), self.max_pairs), show_progress_bar=False))
+                offset = 0
+                for item_pairs, future in items:
+                    future.set_result(scores[offset:offset + len(item_pairs)])
+                    offset += len(item_pairs)
+                with self._lock:
+                    self._stats["batches"] += 1
+                    self._stats["requests"] += len(items)
+                    self._stats["pairs"] += len(pairs)
+            except Exception as e:
+                logger.error(f"[Batcher:{self.name}] Batch of {len(items)} requests failed: {e}")
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """배치 수, 배치당 평균 요청/쌍 수"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        batches = stats["batches"]
+        stats["avgRequestsPerBatch"] = stats["requests"] / batches if batches else 0.0
+        stats["avgPairsPerBatch"] = stats["pairs"] / batches if batches else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
@@ -0,0 +1,144 @@
+"""
+텍스트 + 이미지 후보 동시 재정렬 서비스 (/process/joint)
+쿼리 경로에서 텍스트 rerank 후 이미지 rerank를 순서대로 호출하던 왕복 2회를 1회로 합칩니다.
+- 텍스트: 요청 전략(crossEncoder / cascade)으로 재정렬
+- 이미지 (imageScorer):
+  - caption: 이미지 후보의 캡션 텍스트를 같은 전략으로 재정렬 (기존 /process/image와 동일)
+  - clip: 검색 단계의 CLIP 유사도(score)를 그대로 점수로 사용 (모델 호출 없음)
+- 두 작업은 스레드 풀에서 동시에 실행
+- 점수 척도가 다르므로 sigmoid(a * x + b)로 보정한 뒤 하나의 순위(rankedChunks)로 합침
+  - cross-encoder 점수(0~1 확률)는 logit으로 되돌린 값을 x로 사용, CLIP은 코사인 유사도를 x로 사용
+  - (a, b)는 joint_*_calibration 설정 또는 parameters.calibration {"text": [a, b], "image": [a, b]}
+"""
+import asyncio
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from app.core.settings import settings
+from app.src.crossEncoder import parse_top_k, to_retrieved_chunk
+
+IMAGE_SCORERS = ("caption", "clip")
+
+
+def _parse_calibration(value: Any, default: str) -> Tuple[float, float]:
+    """[a, b] 또는 "a,b" 형식 보정 계수"""
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return float(value[0]), float(value[1])
+    scale, bias = (float(part) for part in str(value or default).split(",", 1))
+    return scale, bias
+
+
+def calibrate(score: float, calibration: Tuple[float, float], probability: bool) -> float:
+    """sigmoid(a * x + b), probability면 x = logit(score)"""
+    x = float(score)
+    if probability:
+        p = min(max(x, 1e-6), 1.0 - 1e-6)
+        x = math.log(p / (1.0 - p))
+    z = calibration[0] * x + calibration[1]
+    if z < -60:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def clip_rank(candidates: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    """검색 단계 CLIP 유사도 순 이미지 retrievedChunks"""
+    def similarity(candidate: Dict[str, Any]) -> float:
+        if candidate.get("score") is not None:
+            return float(candidate["score"])
+        if candidate.get("normalizedScore") is not None:
+            # /process/multi COSINE 정규화 (s + 1) / 2 역변환
+            return float(candidate["normalizedScore"]) * 2.0 - 1.0
+        return -1.0
+
+    ranked = sorted(candidates, key=similarity, reverse=True)
+    if top_k > 0:
+        ranked = ranked[:top_k]
+    return [to_retrieved_chunk(candidate, i, similarity(candidate)) for i, candidate in enumerate(ranked)]
+
+
+def fuse(
+    text_chunks: Sequence[Dict[str, Any]],
+    image_chunks: Sequence[Dict[str, Any]],
+    text_calibration: Tuple[float, float],
+    image_calibration: Tuple[float, float],
+    image_probability: bool,
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """모달리티별 점수를 보정해 하나의 순위로 병합"""
+    fused = [
+        {**chunk, "modality": "text", "rawScore": chunk["score"], "score": calibrate(chunk["score"], text_calibration, True)}
+        for chunk in text_chunks
+    ] + [
+        {**chunk, "modality": "image", "rawScore": chunk["score"], "score": calibrate(chunk["score"], image_calibration, image_probability)}
+        for chunk in image_chunks
+    ]
+    fused.sort(key=lambda chunk: chunk["score"], reverse=True)
+    return fused[:top_k] if top_k > 0 else fused
+
+
+async def joint_rerank(
+    query: str,
+    text_candidates: List[Dict[str, Any]],
+    image_candidates: List[Dict[str, Any]],
+    strategy: Any,
+    parameters: Optional[Dict[Any, Any]] = None,
+    image_scorer: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    텍스트/이미지 후보 동시 재정렬 후 보정 점수로 병합
+
+    Args:
+        strategy: 재정렬 전략 인스턴스 (rerank는 인스턴스 상태를 바꾸지 않아 두 스레드에서 공유)
+        image_scorer: caption / clip (기본: joint_image_scorer)
+
+    Returns:
+        {"retrievedChunks", "retrievedChunksImage", "rankedChunks", "strategy", "imageScorer", "cascade"}
+        (이미지 재정렬 실패 시 retrievedChunksImage는 빈 목록)
+    """
+    parameters = parameters or {}
+    image_scorer = (image_scorer or settings.joint_image_scorer).lower()
+    if image_scorer not in IMAGE_SCORERS:
+        raise ValueError(f"Unsupported imageScorer '{image_scorer}' (expected one of {IMAGE_SCORERS})")
+    top_k = parse_top_k(parameters)
+    query_embedding = {"query": query}
+
+    def rerank_text() -> Dict[str, Any]:
+        return strategy.rerank(query_embedding, text_candidates)
+
+    def rerank_image() -> List[Dict[str, Any]]:
+        if not image_candidates:
+            return []
+        if image_scorer == "clip":
+            return clip_rank(image_candidates, top_k)
+        return strategy.rerank(query_embedding, image_candidates).get("retrievedChunks", [])
+
+    text_result, image_chunks = await asyncio.gather(
+        asyncio.to_thread(rerank_text),
+        asyncio.to_thread(rerank_image),
+        return_exceptions=True,
+    )
+    if isinstance(text_result, Exception):
+        raise text_result
+    if isinstance(image_chunks, Exception):
+        logger.warning(f"[Joint] Image rerank failed, continuing without images: {image_chunks}")
+        image_chunks = []
+
+    calibration = parameters.get("calibration") if isinstance(parameters.get("calibration"), dict) else {}
+    text_calibration = _parse_calibration(calibration.get("text"), settings.joint_text_calibration)
+    default_image = settings.joint_clip_calibration if image_scorer == "clip" else settings.joint_text_calibration
+    image_calibration = _parse_calibration(calibration.get("image"), default_image)
+    text_chunks = text_result.get("retrievedChunks", [])
+    ranked = fuse(text_chunks, image_chunks, text_calibration, image_calibration, image_scorer != "clip", top_k)
+    logger.info(
+        f"[Joint] text={len(text_candidates)}->{len(text_chunks)}, image={len(image_candidates)}->{len(image_chunks)} "
+        f"(imageScorer={image_scorer}), fused={len(ranked)}"
+    )
+    return {
+        "retrievedChunks": text_chunks,
+        "retrievedChunksImage": image_chunks,
+        "rankedChunks": ranked,
+        "strategy": text_result.get("strategy"),
+        "imageScorer": image_scorer,
+        "cascade": text_result.get("cascade"),
+    }
@@ -0,0 +1,182 @@
+"""
+Cross-Encoder 모델 레지스트리
+/process 요청마다 전략 인스턴스가 새로 만들어지므로, 모델 가중치/토크나이저는 프로세스 단위로 한 번만 로드해 공유합니다.
+- (모델 이름, device, backend) 키로 로드된 모델 보관 (backend: torch / onnx)
+- 키별 잠금으로 동시 첫 요청의 중복 로드를 한 번으로 합침 (singleflight)
+- 시작 시 cross_encoder_warmup_models를 미리 로드하고 더미 추론 1회로 초기화 비용 제거
+- 로드된 모델 전체의 파라미터/버퍼 메모리와 로드 시간 집계
+- cross_encoder_dynamic_batching이면 모델을 DynamicBatcher로 감싸 동시 요청을 한 배치로 계산
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from app.core.settings import settings
+from app.service.dynamic_batcher import DynamicBatcher
+
+try:
+    from sentence_transformers import CrossEncoder as STCrossEncoder
+except ImportError:
+    STCrossEncoder = None
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+ModelKey = Tuple[str, str, str]
+BACKENDS = ("torch", "onnx")
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """device 이름 정규화 ("auto"/빈 값이면 CUDA 사용 가능 여부로 결정)"""
+    device = (device or settings.cross_encoder_device or "auto").strip().lower()
+    if device != "auto":
+        return device
+    if torch is not None and torch.cuda.is_available():
+        return "cuda"
+    return "cpu"
+
+
+def _model_memory_bytes(model: Any) -> int:
+    """모델 파라미터 + 버퍼 크기 (ONNX 모델은 가중치 파일 크기, 알 수 없으면 0)"""
+    if hasattr(model, "memory_bytes"):
+        return int(model.memory_bytes)
+    module = getattr(model, "model", None)
+    if module is None or not hasattr(module, "parameters"):
+        return 0
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+class ModelRegistry:
+    """프로세스 전역 Cross-Encoder 모델 저장소"""
+
+    def __init__(self):
+        self._models: Dict[ModelKey, Any] = {}
+        self._info: Dict[ModelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+
+    @staticmethod
+    def resolve_key(model_name: Optional[str] = None, device: Optional[str] = None, backend: Optional[str] = None) -> ModelKey:
+        """
+        기본값을 채운 (모델 이름, device, backend) 키
+
+        Args:
+            model_name: 모델 이름 (기본: cross_encoder_default_model)
+            device: cpu / cuda / cuda:0 / auto (기본: cross_encoder_device)
+            backend: torch / onnx (기본: cross_encoder_backend)
+        """
+        backend = (backend or settings.cross_encoder_backend or "torch").lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported cross-encoder backend '{backend}' (expected one of {BACKENDS})")
+        return (model_name or settings.cross_encoder_default_model, resolve_device(device), backend)
+
+    @staticmethod
+    def model_id(key: ModelKey) -> str:
+        """점수가 같은 모델 식별자 (device는 점수에 영향이 없어 제외, int8 양자화는 구분)"""
+        model_name, _, backend = key
+        if backend == "onnx" and settings.cross_encoder_onnx_quantize:
+            backend = "onnx-int8"
+        return f"{model_name}@{backend}"
+
+    def get(self, model_name: Optional[str] = None, device: Optional[str] = None, backend: Optional[str] = None) -> Any:
+        """로드된 모델 반환 (없으면 로드, 인자는 resolve_key 참고)"""
+        key = self.resolve_key(model_name, device, backend)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            # 잠금 대기 중 다른 요청이 로드를 끝냈으면 그대로 사용
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(key)
+        return model
+
+    def _load(self, key: ModelKey) -> Any:
+        model_name, device, backend = key
+        logger.info(f"[ModelRegistry] Loading cross-encoder model: {model_name} (device={device}, backend={backend})")
+        started = time.perf_counter()
+        if backend == "onnx":
+            from app.service.onnx_cross_encoder import OnnxCrossEncoder
+
+            model = OnnxCrossEncoder(
+                model_name,
+                device=device,
+                max_length=settings.cross_encoder_max_length or 512,
+                quantize=settings.cross_encoder_onnx_quantize,
+            )
+        else:
+            if STCrossEncoder is None:
+                raise ImportError("sentence-transformers is required for cross-encoder models. Install it with: pip install sentence-transformers")
+            model = STCrossEncoder(model_name, device=device, max_length=settings.cross_encoder_max_length)
+        load_ms = (time.perf_counter() - started) * 1000
+        memory_bytes = _model_memory_bytes(model)
+        if settings.cross_encoder_dynamic_batching:
+            model = DynamicBatcher(model, f"{model_name}@{backend}")
+        info = {
+            "model": model_name,
+            "device": device,
+            "backend": backend,
+            "memoryBytes": memory_bytes,
+            "loadMs": round(load_ms, 1),
+            "loadedAt": time.time(),
+        }
+        with self._lock:
+            self._models[key] = model
+            self._info[key] = info
+        stats = self.stats()
+        logger.info(
+            f"[ModelRegistry] Loaded {model_name} on {device}/{backend} in {load_ms:.0f}ms "
+            f"({info['memoryBytes'] / 1024 ** 2:.1f}MB, total {stats['models']} models / {stats['totalMemoryBytes'] / 1024 ** 2:.1f}MB)"
+        )
+        return model
+
+    def warmup(self, model_names: Optional[List[str]] = None) -> List[str]:
+        """
+        모델 미리 로드 + 더미 추론 1회
+
+        Returns:
+            워밍업에 성공한 모델 이름 목록
+        """
+        names = model_names if model_names is not None else settings.cross_encoder_warmup_models_list
+        warmed: List[str] = []
+        for name in names:
+            try:
+                model = self.get(name)
+                model.predict([("warmup", "warmup")], show_progress_bar=False)
+                warmed.append(name)
+            except Exception as e:
+                logger.warning(f"[ModelRegistry] Warmup failed for '{name}': {e}")
+        logger.info(f"[ModelRegistry] Warmed up {len(warmed)} models: {warmed}")
+        return warmed
+
+    def stats(self) -> Dict[str, Any]:
+        """로드된 모델별 메모리/로드 시간과 전체 합계"""
+        with self._lock:
+            entries = [dict(info) for info in self._info.values()]
+            batchers = [self._models.get(key) for key in self._info]
+        for entry, model in zip(entries, batchers):
+            if isinstance(model, DynamicBatcher):
+                entry["batching"] = model.stats()
+        return {
+            "models": len(entries),
+            "totalMemoryBytes": sum(entry["memoryBytes"] for entry in entries),
+            "entries": entries,
+        }
+
+
+# 싱글톤 인스턴스
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """ModelRegistry 싱글톤 인스턴스 반환"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
@@ -0,0 +1,167 @@
+"""
+ONNX Runtime Cross-Encoder 스코어러 (cross_encoder_backend=onnx)
+sentence-transformers CrossEncoder.predict와 같은 인터페이스로 점수를 계산합니다.
+- 최초 로드 시 HF 모델을 ONNX로 export (cross_encoder_onnx_dir/<모델>/model.onnx), 이후 재사용
+- cross_encoder_onnx_quantize=true면 dynamic int8 양자화 모델(model.int8.onnx) 사용
+- (query, passage) 쌍을 토큰 길이 순으로 정렬해 비슷한 길이끼리 묶고,
+  배치당 (배치 크기 × 최대 길이)가 cross_encoder_token_budget을 넘지 않게 나눠 padding 최소화
+- 계산 후 입력 순서로 되돌려 반환
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from app.core.settings import settings
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+try:
+    from transformers import AutoTokenizer
+except ImportError:
+    AutoTokenizer = None
+
+
+def token_budget_batches(lengths: Sequence[int], token_budget: int, max_batch_size: int) -> List[List[int]]:
+    """
+    길이 오름차순으로 인덱스를 묶은 배치 목록
+
+    배치의 padding 후 토큰 수(배치 크기 × 배치 내 최대 길이)가 token_budget 이하가 되도록 나눕니다.
+    (단일 쌍이 budget보다 길어도 배치 하나로 처리)
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for index in order:
+        # 오름차순이므로 추가할 쌍의 길이가 배치 최대 길이
+        padded_tokens = lengths[index] * (len(current) + 1)
+        if current and (padded_tokens > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _model_dir(model_name: str) -> Path:
+    return Path(settings.cross_encoder_onnx_dir) / model_name.replace("/", "__")
+
+
+def export_onnx(model_name: str, quantize: bool = False) -> Path:
+    """
+    HF 모델을 ONNX로 export (이미 있으면 그대로 사용)
+
+    Returns:
+        세션에 사용할 .onnx 경로 (quantize면 int8 모델)
+    """
+    model_dir = _model_dir(model_name)
+    fp32_path = model_dir / "model.onnx"
+    int8_path = model_dir / "model.int8.onnx"
+    if not fp32_path.exists():
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        logger.info(f"[ONNX] Exporting {model_name} to {fp32_path}")
+        model_dir.mkdir(parents=True, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        dummy = tokenizer([("query", "passage")], return_tensors="pt")
+        input_names = list(dummy.keys())
+
+        class _Logits(torch.nn.Module):
+            """positional 입력을 이름 있는 입력으로 넘기고 logits만 반환"""
+
+            def __init__(self, wrapped):
+                super().__init__()
+                self.wrapped = wrapped
+
+            def forward(self, *tensors):
+                return self.wrapped(**dict(zip(input_names, tensors))).logits
+
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+        tmp_path = fp32_path.with_suffix(".tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                _Logits(model),
+                tuple(dummy[name] for name in input_names),
+                str(tmp_path),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+            )
+        tokenizer.save_pretrained(str(model_dir))
+        tmp_path.replace(fp32_path)
+    if not quantize:
+        return fp32_path
+    if not int8_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"[ONNX] Quantizing {fp32_path.name} to int8")
+        quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxCrossEncoder:
+    """ONNX Runtime 기반 cross-encoder (predict 인터페이스는 sentence-transformers와 동일)"""
+
+    def __init__(self, model_name: str, device: str = "cpu", max_length: int = 512, quantize: bool = False):
+        if ort is None or AutoTokenizer is None:
+            raise ImportError("onnxruntime and transformers are required for the onnx backend. Install it with: pip install onnxruntime")
+        self.model_name = model_name
+        self.max_length = max_length
+        self.model_path = export_onnx(model_name, quantize=quantize)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_path.parent))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.cross_encoder_onnx_threads > 0:
+            options.intra_op_num_threads = settings.cross_encoder_onnx_threads
+        providers = ["CPUExecutionProvider"]
+        if device.startswith("cuda"):
+            providers.insert(0, "CUDAExecutionProvider")
+        self.session = ort.InferenceSession(str(self.model_path), sess_options=options, providers=providers)
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    @property
+    def memory_bytes(self) -> int:
+        """모델 가중치 크기 (onnx 파일 크기)"""
+        return self.model_path.stat().st_size
+
+    def _run(self, features: List[Dict[str, Any]]) -> np.ndarray:
+        batch = self.tokenizer.pad(features, padding=True, return_tensors="np")
+        inputs = {name: batch[name].astype(np.int64) for name in self.input_names}
+        logits = self.session.run(["logits"], inputs)[0]
+        if logits.shape[1] == 1:
+            # sentence-transformers 기본 동작과 동일하게 label 1개면 sigmoid
+            return 1.0 / (1.0 + np.exp(-logits[:, 0]))
+        return logits
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], **kwargs) -> np.ndarray:
+        """
+        (query, passage) 쌍 점수 계산 (입력 순서 유지)
+
+        batch_size, show_progress_bar 등 sentence-transformers 인자는 무시합니다.
+        """
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+        encoded = self.tokenizer(
+            [pair[0] for pair in pairs],
+            [pair[1] for pair in pairs],
+            truncation=True,
+            max_length=self.max_length,
+        )
+        keys = list(encoded.keys())
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        scores = None
+        for batch in token_budget_batches(lengths, settings.cross_encoder_token_budget, settings.cross_encoder_max_batch_size):
+            batch_scores = self._run([{key: encoded[key][i] for key in keys} for i in batch])
+            if scores is None:
+                scores = np.zeros((len(pairs),) + batch_scores.shape[1:], dtype=np.float32)
+            scores[batch] = batch_scores
+        return scores
@@ -0,0 +1,152 @@
+"""
+Cross-Encoder 점수 캐시 서비스
+후속 질문/반복 FAQ 질의가 같은 (query, chunk) 쌍을 반복해서 점수 계산하지 않도록 점수를 캐시합니다.
+- 키: (모델, 정규화한 질의 해시, 문단 해시)
+  질의는 NFKC + 소문자 + 문장부호 제거 + 공백 정리 후 해시하므로 표기만 다른 질의도 같은 키를 사용
+- 1차: 프로세스 메모리 LRU (rerank_cache_max_entries)
+- 2차(선택): Redis rerank:score:* (rerank_cache_redis_enabled, 인스턴스 간 공유, TTL)
+- 조회/적중(memory, redis)/미스 횟수로 적중률 집계
+"""
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+from app.core.settings import settings
+
+SCORE_KEY_PREFIX = "rerank:score"
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (점수 계산에는 원문 사용)"""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return " ".join(text.split())
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def score_key(model_id: str, query: str, passage: str) -> str:
+    """점수 캐시 키 (Redis 키와 메모리 키 공용)"""
+    return f"{SCORE_KEY_PREFIX}:{model_id}:{_digest(normalize_query(query))}:{_digest(passage or '')}"
+
+
+class ScoreCacheService:
+    """rerank 점수 LRU 캐시 (동기, rerank 경로에서 호출)"""
+
+    def __init__(self):
+        self.max_entries = settings.rerank_cache_max_entries
+        self.redis_enabled = settings.rerank_cache_redis_enabled
+        self.redis_ttl_seconds = settings.rerank_cache_redis_ttl_seconds
+        self._client = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, float]" = OrderedDict()
+        self._stats = {"lookups": 0, "memoryHits": 0, "redisHits": 0, "misses": 0}
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True,
+                socket_timeout=0.5,
+            )
+        return self._client
+
+    def _remember(self, key: str, score: float) -> None:
+        """메모리 LRU에 저장 (잠금 보유 상태에서 호출)"""
+        self._cache[key] = score
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def get_many(self, model_id: str, query: str, passages: Sequence[str]) -> List[Optional[float]]:
+        """
+        문단별 캐시 점수 조회
+
+        Returns:
+            passages와 같은 순서의 점수 목록 (캐시에 없으면 None)
+        """
+        keys = [score_key(model_id, query, passage) for passage in passages]
+        scores: List[Optional[float]] = [None] * len(keys)
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self._cache.get(key)
+                if score is not None:
+                    self._cache.move_to_end(key)
+                    scores[i] = score
+        memory_hits = sum(score is not None for score in scores)
+
+        redis_hits = 0
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing and self.redis_enabled:
+            try:
+                values = self._get_client().mget([keys[i] for i in missing])
+                with self._lock:
+                    for i, value in zip(missing, values):
+                        if value is not None:
+                            scores[i] = float(value)
+                            self._remember(keys[i], scores[i])
+                            redis_hits += 1
+            except Exception as e:
+                logger.warning(f"[ScoreCache] Redis lookup failed: {e}")
+
+        with self._lock:
+            self._stats["lookups"] += len(keys)
+            self._stats["memoryHits"] += memory_hits
+            self._stats["redisHits"] += redis_hits
+            self._stats["misses"] += len(keys) - memory_hits - redis_hits
+        return scores
+
+    def set_many(self, model_id: str, query: str, passages: Sequence[str], scores: Sequence[float]) -> None:
+        """계산한 점수 저장 (메모리 + Redis)"""
+        keys = [score_key(model_id, query, passage) for passage in passages]
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._remember(key, float(score))
+        if not self.redis_enabled or not keys:
+            return
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            for key, score in zip(keys, scores):
+                pipe.set(key, float(score), ex=self.redis_ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"[ScoreCache] Redis store failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """조회 수, 계층별 적중 수와 적중률"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._cache)
+        lookups = stats["lookups"]
+        stats["hitRate"] = (stats["memoryHits"] + stats["redisHits"]) / lookups if lookups else 0.0
+        stats["maxEntries"] = self.max_entries
+        stats["redisEnabled"] = self.redis_enabled
+        return stats
+
+    def clear(self) -> None:
+        """메모리 캐시와 통계 초기화 (Redis 항목은 TTL로 만료)"""
+        with self._lock:
+            self._cache.clear()
+            self._stats = {key: 0 for key in self._stats}
+
+
+# 싱글톤 인스턴스
+_score_cache_service: Optional[ScoreCacheService] = None
+
+
+def get_score_cache_service() -> ScoreCacheService:
+    """ScoreCacheService 싱글톤 인스턴스 반환"""
+    global _score_cache_service
+    if _score_cache_service is None:
+        _score_cache_service = ScoreCacheService()
+    return _score_cache_service
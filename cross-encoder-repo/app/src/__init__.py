@@ -5,9 +5,11 @@ Cross Encoder Strategy 모듈
 
 from .base import BaseCrossEncoderStrategy
 from .crossEncoder import CrossEncoder
+from .cascade import Cascade
 
 __all__ = [
     "BaseCrossEncoderStrategy",
-    "CrossEncoder"
+    "CrossEncoder",
+    "Cascade"
 ]
 
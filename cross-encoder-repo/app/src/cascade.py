@@ -0,0 +1,139 @@
+from .crossEncoder import CrossEncoder
+from typing import Dict, Any, List, Optional
+from loguru import logger
+import hashlib
+from app.core.settings import settings
+from app.service.model_registry import get_model_registry
+
+
+def _text_hash(text: str) -> str:
+    """공백만 다른 텍스트도 같은 해시"""
+    return hashlib.blake2b(" ".join((text or "").split()).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# 점수가 작을수록 가까운 metric (원 점수를 부호 반전해 사용)
+DISTANCE_METRICS = {"L2"}
+
+
+def _retrieval_score(candidate: Dict[str, Any], metric_type: Optional[str] = None) -> Optional[float]:
+    """
+    검색 단계 유사도 (클수록 유사)
+
+    /process/multi 정규화 점수(normalizedScore)를 우선 사용하고,
+    없으면 metric(후보의 metricType 또는 cascade.metricType)을 아는 경우에만 원 점수 사용 (L2 거리는 부호 반전).
+    metric을 모르는 원 점수는 방향을 알 수 없으므로 None
+    """
+    try:
+        if candidate.get("normalizedScore") is not None:
+            return float(candidate["normalizedScore"])
+        metric = candidate.get("metricType") or metric_type
+        if metric is None or candidate.get("score") is None:
+            return None
+        score = float(candidate["score"])
+    except (TypeError, ValueError):
+        return None
+    return -score if str(metric).upper() in DISTANCE_METRICS else score
+
+
+class Cascade(CrossEncoder):
+    """
+    단계적(cascade) Cross Encoder 전략
+    1) 텍스트 해시로 중복 후보 제거
+    2) 저비용 점수로 1차 정렬 후 상위 topN개만 남김
+       - signal=retrieval: 검색 서비스가 준 bi-encoder 유사도 (normalizedScore, 없으면 metricType을 아는 score)
+         유사도를 알 수 없는 후보가 있으면 1차 선별을 생략하고 모두 재정렬
+       - signal=model: 작은 cross-encoder (cascade.model 또는 cascade_prescore_model)
+    3) 남은 후보만 cross-encoder로 재정렬하고 단계별 제거 수를 결과 cascade 필드에 보고
+
+    parameters 예시:
+        {"topK": 5, "cascade": {"topN": 20, "signal": "retrieval", "metricType": "L2"}}
+    """
+
+    def __init__(self, parameters: Dict[Any, Any] = None):
+        super().__init__(parameters)
+
+        options = self.parameters.get("cascade")
+        options = options if isinstance(options, dict) else {}
+        try:
+            self.top_n = int(options.get("topN") or settings.cascade_top_n)
+        except (TypeError, ValueError):
+            self.top_n = settings.cascade_top_n
+        self.prescore_model_name = options.get("model") or settings.cascade_prescore_model or None
+        self.signal = str(options.get("signal") or ("model" if self.prescore_model_name else "retrieval")).lower()
+        self.metric_type = options.get("metricType")
+
+        self.prescore_model = None
+        self.prescore_model_id = None
+        if self.signal == "model":
+            if not self.prescore_model_name:
+                raise ValueError("cascade.signal=model requires cascade.model or cascade_prescore_model")
+            registry = get_model_registry()
+            key = registry.resolve_key(self.prescore_model_name, self.parameters.get("device"), self.parameters.get("backend"))
+            self.prescore_model_id = registry.model_id(key)
+            self.prescore_model = registry.get(*key)
+        elif self.signal != "retrieval":
+            raise ValueError(f"Unsupported cascade signal '{self.signal}' (expected retrieval or model)")
+
+    def _dedupe(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """같은 텍스트 후보 중 검색 점수가 가장 높은 것만 유지 (입력 순서 유지)"""
+        scores = self._retrieval_scores(candidates)
+        best: Dict[str, int] = {}
+        for i, candidate in enumerate(candidates):
+            key = _text_hash(candidate.get("text", ""))
+            kept = best.get(key)
+            if kept is None or scores[i] > scores[kept]:
+                best[key] = i
+        return [candidates[i] for i in sorted(best.values())]
+
+    def _retrieval_scores(self, candidates: List[Dict[str, Any]]) -> List[float]:
+        # 점수가 없는 후보는 맨 뒤로
+        scores = (_retrieval_score(candidate, self.metric_type) for candidate in candidates)
+        return [score if score is not None else float("-inf") for score in scores]
+
+    def _prescore(self, query: str, candidates: List[Dict[str, Any]]) -> Optional[List[float]]:
+        """저비용 점수 (retrieval 신호에서 유사도를 알 수 없는 후보가 있으면 None → 선별 생략)"""
+        if self.signal == "model":
+            return self._score(query, [candidate.get("text", "") for candidate in candidates], self.prescore_model, self.prescore_model_id)
+        if any(_retrieval_score(candidate, self.metric_type) is None for candidate in candidates):
+            logger.warning("[Cascade] Retrieval scores without normalizedScore or metricType, skipping prescore pruning")
+            return None
+        return self._retrieval_scores(candidates)
+
+    def rerank(self, query_embedding: Dict[Any, Any], candidate_embeddings: List[Dict[str, Any]]) -> Dict[Any, Any]:
+        """
+        중복 제거 → 저비용 점수로 상위 topN 선별 → cross-encoder 재정렬
+
+        Returns:
+            CrossEncoder.rerank 결과 + cascade (단계별 후보 수 / 제거 수)
+        """
+        if not query_embedding or "query" not in query_embedding:
+            raise ValueError("query_embedding must contain 'query' field")
+
+        query = query_embedding["query"]
+        candidates = candidate_embeddings or []
+        unique = self._dedupe(candidates)
+
+        survivors = unique
+        if self.top_n > 0 and len(unique) > self.top_n:
+            prescores = self._prescore(query, unique)
+            if prescores is not None:
+                order = sorted(range(len(unique)), key=lambda i: prescores[i], reverse=True)[:self.top_n]
+                survivors = [unique[i] for i in sorted(order)]
+
+        report = {
+            "signal": self.signal,
+            "topN": self.top_n,
+            "input": len(candidates),
+            "dedupPruned": len(candidates) - len(unique),
+            "prescorePruned": len(unique) - len(survivors),
+            "reranked": len(survivors),
+        }
+        logger.info(
+            f"[Cascade] {report['input']} candidates -> {len(unique)} unique -> {len(survivors)} reranked "
+            f"(signal={self.signal}, topN={self.top_n})"
+        )
+
+        result = super().rerank(query_embedding, survivors)
+        result["strategy"] = "cascade"
+        result["cascade"] = report
+        return result
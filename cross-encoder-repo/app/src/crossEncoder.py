@@ -2,41 +2,87 @@ from .base import BaseCrossEncoderStrategy
 from typing import Dict, Any, List
 from loguru import logger
 import json
-try:
-    from sentence_transformers import CrossEncoder as STCrossEncoder
-except ImportError:
-    STCrossEncoder = None
-    logger.warning("sentence-transformers not installed. MiniLM cross-encoder will not work.")
+from app.core.settings import settings
+from app.service.model_registry import get_model_registry
+from app.service.score_cache_service import get_score_cache_service
+
+
+def to_retrieved_chunk(candidate: Dict[str, Any], index: int, score: float) -> Dict[str, Any]:
+    """검색 후보를 retrievedChunks 항목으로 변환 (fileNo/fileName 등 메타 포함)"""
+    meta_outer = candidate.get("metadata", {}) or {}
+    meta_inner = {}
+    if isinstance(meta_outer.get("metadata"), dict):
+        meta_inner = meta_outer.get("metadata") or {}
+    # Attempt to read file_no and file name
+    # 이미지의 경우 IMAGE_FILE_NO를 우선 사용, 없으면 기존 방식 사용
+    file_no = meta_inner.get("IMAGE_FILE_NO") or meta_outer.get("file_no") or meta_outer.get("FILE_NO") or meta_inner.get("FILE_NO")
+    file_name = meta_inner.get("FILE_NAME") or meta_outer.get("file_name")
+    page_no = meta_inner.get("PAGE_NO", 1)
+    index_no = meta_inner.get("INDEX_NO", index)
+    return {
+        "page": page_no if page_no is not None else 1,
+        "chunk_id": index_no if index_no is not None else index,
+        "text": candidate.get("text", ""),
+        "score": score,
+        "fileNo": str(file_no) if file_no else "",
+        "fileName": file_name or "",
+    }
+
+
+def parse_top_k(parameters: Dict[Any, Any], default: int = 5) -> int:
+    """파라미터의 topK (없거나 잘못된 값이면 default)"""
+    try:
+        if isinstance(parameters, dict) and parameters.get("topK") is not None:
+            return int(parameters.get("topK"))
+    except Exception:
+        pass
+    return default
 
 
 class CrossEncoder(BaseCrossEncoderStrategy):
     """
     MiniLM 기반 Cross Encoder 전략
     query와 candidate들을 cross-encoder로 재정렬합니다.
+    모델은 요청마다 로드하지 않고 프로세스 전역 레지스트리에서 공유하고,
+    점수 캐시에 있는 (query, text) 쌍은 모델에 넣지 않습니다.
     """
     
     def __init__(self, parameters: Dict[Any, Any] = None):
         super().__init__(parameters)
         
-        if STCrossEncoder is None:
-            raise ImportError("sentence-transformers is required for MiniLM cross-encoder. Install it with: pip install sentence-transformers")
-        
-        # 파라미터에서 설정값 가져오기 (기본값: cross-encoder/mmarco-mMiniLMv2-L12-H384-v1)
-        model_name = (
-            self.parameters.get("model_name")
-            or self.parameters.get("model")
-            or "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
-        )
-        
-        logger.info(f"[MiniLM] Loading cross-encoder model: {model_name}")
+        # 파라미터에서 설정값 가져오기 (기본값: settings.cross_encoder_default_model)
+        model_name = self.parameters.get("model_name") or self.parameters.get("model")
+        device = self.parameters.get("device")
+        backend = self.parameters.get("backend")
         
         try:
-            self.cross_encoder = STCrossEncoder(model_name)
-            logger.info(f"[MiniLM] Cross-encoder model loaded successfully")
+            registry = get_model_registry()
+            key = registry.resolve_key(model_name, device, backend)
+            self.model_id = registry.model_id(key)
+            self.cross_encoder = registry.get(*key)
         except Exception as e:
             logger.error(f"[MiniLM] Failed to load model: {str(e)}")
             raise
     
+    def _score(self, query: str, texts: List[str], model: Any = None, model_id: str = None) -> List[float]:
+        """점수 캐시 조회 후 미스만 모델로 계산 (model 미지정 시 이 전략의 cross-encoder)"""
+        model = model or self.cross_encoder
+        model_id = model_id or self.model_id
+        if not settings.rerank_cache_enabled or self.parameters.get("useCache") is False:
+            return [float(score) for score in model.predict([(query, text) for text in texts])]
+        
+        cache = get_score_cache_service()
+        scores = cache.get_many(model_id, query, texts)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            predicted = [float(score) for score in model.predict([(query, text) for text in missing_texts])]
+            for i, score in zip(missing, predicted):
+                scores[i] = score
+            cache.set_many(model_id, query, missing_texts, predicted)
+        logger.info(f"[MiniLM] Score cache: {len(texts) - len(missing)}/{len(texts)} hits")
+        return scores
+    
     def rerank(self, query_embedding: Dict[Any, Any], candidate_embeddings: List[Dict[str, Any]]) -> Dict[Any, Any]:
         """
         쿼리와 후보들을 cross-encoder로 재정렬
@@ -67,10 +113,10 @@ class CrossEncoder(BaseCrossEncoderStrategy):
         
         try:
         # query와 각 candidate 텍스트를 페어로 만들어 cross-encoder에 입력
-            pairs = [(query, candidate.get("text", "")) for candidate in candidate_embeddings]
+            texts = [candidate.get("text", "") for candidate in candidate_embeddings]
             
-            # Cross-encoder로 점수 예측
-            scores = self.cross_encoder.predict(pairs)
+            # Cross-encoder로 점수 예측 (캐시 적중분 제외)
+            scores = self._score(query, texts)
             
             # 점수와 함께 후보들 결합 및 정렬
             ranked_candidates = []
@@ -84,36 +130,15 @@ class CrossEncoder(BaseCrossEncoderStrategy):
             ranked_candidates.sort(key=lambda x: x["crossEncoderScore"], reverse=True)
 
             # 상위 topK만 유지 (파라미터에 지정되면 사용, 없으면 기본 5)
-            top_k = 5
-            try:
-                if isinstance(self.parameters, dict) and self.parameters.get("topK") is not None:
-                    top_k = int(self.parameters.get("topK"))
-            except Exception:
-                top_k = 5
+            top_k = parse_top_k(self.parameters)
             if top_k > 0:
                 ranked_candidates = ranked_candidates[:top_k]
             
             # retrievedChunks 형식으로 변환 (fileNo/fileName 등 메타 포함)
-            retrieved_chunks = []
-            for i, candidate in enumerate(ranked_candidates):
-                meta_outer = candidate.get("metadata", {}) or {}
-                meta_inner = {}
-                if isinstance(meta_outer.get("metadata"), dict):
-                    meta_inner = meta_outer.get("metadata") or {}
-                # Attempt to read file_no and file name
-                # 이미지의 경우 IMAGE_FILE_NO를 우선 사용, 없으면 기존 방식 사용
-                file_no = meta_inner.get("IMAGE_FILE_NO") or meta_outer.get("file_no") or meta_outer.get("FILE_NO") or meta_inner.get("FILE_NO")
-                file_name = meta_inner.get("FILE_NAME") or meta_outer.get("file_name")
-                page_no = meta_inner.get("PAGE_NO", 1)
-                index_no = meta_inner.get("INDEX_NO", i)
-                retrieved_chunks.append({
-                    "page": page_no if page_no is not None else 1,
-                    "chunk_id": index_no if index_no is not None else i,
-                    "text": candidate.get("text", ""),
-                    "score": candidate.get("crossEncoderScore", 0.0),
-                    "fileNo": str(file_no) if file_no else "",
-                    "fileName": file_name or "",
-                })
+            retrieved_chunks = [
+                to_retrieved_chunk(candidate, i, candidate.get("crossEncoderScore", 0.0))
+                for i, candidate in enumerate(ranked_candidates)
+            ]
             
             logger.info(f"[MiniLM] Reranking completed. Top score: {ranked_candidates[0]['crossEncoderScore'] if ranked_candidates else 'N/A'}")
             return {
@@ -13,9 +13,32 @@ class Settings(BaseSettings):
     # External Embedding Provider
     embedding_provider_url: str = "https://aloojgpo171my1-8000.proxy.runpod.net"
 
-    # Milvus 설정
-    milvus_host: str
+    # 벡터 저장소 백엔드: "milvus" 또는 "local" (Milvus 없이 단일 노드/부하 테스트)
+    vector_store_backend: str = "milvus"
+    # local 백엔드 컬렉션 디렉터리 (search 서비스와 같은 경로를 공유)와 새 컬렉션 metric
+    local_vector_store_path: str = "./data/vector_store"
+    local_vector_store_metric: str = "COSINE"
+
+    # Milvus 설정 (vector_store_backend=local이면 사용하지 않음)
+    milvus_host: str = ""
     milvus_port: int = 19530
+    # 텍스트 컬렉션 생성 시 BM25 희소 벡터 필드 추가 (hybrid 검색용)
+    sparse_enabled: bool = False
+    # 새 컬렉션 스키마 버전 (1: metadata JSON, 2: 타입 스칼라 필드 + 스칼라 인덱스)
+    milvus_schema_version: int = 1
+    # 오퍼 컬렉션 레이아웃: "per_offer"(h{offerNo}_{version} 컬렉션) 또는
+    # "partition_key"({prefix}_{version} 공유 컬렉션 + offer_no partition key, search/backend와 같은 값 사용)
+    collection_layout: str = "per_offer"
+    shared_collection_prefix: str = "offers"
+    # 공유 컬렉션 생성 시 partition key 해시 파티션 수
+    partition_key_num_partitions: int = 64
+
+    # 삭제 후 유지보수(app/scripts/compact_collections.py): 삭제 행 비율/행 수가 임계값을 넘으면 compact,
+    # 삭제 비율이 rebuild 비율 이상이면 벡터 인덱스 재생성, 실행 허용 시간대(KST, HH:MM-HH:MM)
+    maintenance_compact_deleted_ratio: float = 0.1
+    maintenance_compact_min_deleted_rows: int = 1000
+    maintenance_rebuild_deleted_ratio: float = 0.3
+    maintenance_window: str = "02:00-06:00"
 
     # Database 설정
     db_host: str
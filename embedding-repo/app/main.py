@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -8,6 +9,7 @@ from datetime import datetime
 from .models.database import Base, engine, AsyncSessionLocal
 from .core.openapi import custom_openapi
 from .service.runpod_service import RunpodService
+from .service.projection_service import run_invalidation_listener as run_projection_invalidation_listener
 from loguru import logger
 
 
@@ -38,9 +40,13 @@ async def lifespan(app: FastAPI):
             exc_info=True
         )
     
+    # 투영 캐시 무효화 메시지 구독 (fit_projection --apply 시 발행)
+    projection_listener_task = asyncio.create_task(run_projection_invalidation_listener())
+
     yield
     
     # 애플리케이션 종료 시 (필요한 경우 정리 작업 수행)
+    projection_listener_task.cancel()
     logger.info("애플리케이션 종료")
 
 
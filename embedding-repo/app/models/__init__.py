@@ -2,6 +2,7 @@ from .database import get_db, Base, engine, async_engine
 from .collection import Collection
 from .chunk import Chunk
 from .runpod import Runpod
+from .collection_projection import CollectionProjection
 
-__all__ = ["get_db", "Base", "engine", "async_engine", "Collection", "Chunk", "Runpod"]
+__all__ = ["get_db", "Base", "engine", "async_engine", "Collection", "Chunk", "Runpod", "CollectionProjection"]
 
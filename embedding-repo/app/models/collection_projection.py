@@ -0,0 +1,29 @@
+"""
+COLLECTION_PROJECTION 테이블 모델
+컬렉션별 PCA 투영 행렬(차원 축소)을 저장하는 모델
+"""
+
+from sqlalchemy import Column, String, Integer, Float, DateTime, func
+from sqlalchemy.dialects.mysql import LONGBLOB
+from app.models.database import Base
+
+
+class CollectionProjection(Base):
+    """
+    COLLECTION_PROJECTION 테이블 모델
+    - MEAN: float32 평균 벡터 (SOURCE_DIM)
+    - COMPONENTS: float32 주성분 행렬 (TARGET_DIM x SOURCE_DIM, row-major)
+    """
+    __tablename__ = "COLLECTION_PROJECTION"
+
+    COLLECTION_NAME = Column(String(255), primary_key=True, nullable=False, comment="Milvus 컬렉션 이름")
+    SOURCE_DIM = Column(Integer, nullable=False, comment="원본 벡터 차원")
+    TARGET_DIM = Column(Integer, nullable=False, comment="투영 후 벡터 차원")
+    MEAN = Column(LONGBLOB, nullable=False, comment="float32 평균 벡터")
+    COMPONENTS = Column(LONGBLOB, nullable=False, comment="float32 주성분 행렬")
+    EXPLAINED_VARIANCE = Column(Float, nullable=True, comment="누적 설명 분산 비율")
+    CREATED_AT = Column(DateTime, nullable=False, default=func.now())
+    UPDATED_AT = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CollectionProjection(COLLECTION_NAME={self.COLLECTION_NAME}, SOURCE_DIM={self.SOURCE_DIM}, TARGET_DIM={self.TARGET_DIM})>"
@@ -5,9 +5,11 @@ from app.schemas.request.embeddingRequest import EmbeddingProcessRequest
 from app.schemas.request.imageEmbeddingRequest import ImageEmbeddingProcessRequest
 from app.schemas.response.embeddingProcessResponse import EmbeddingProcessResponse, EmbeddingProcessResult
 from app.schemas.response.errorResponse import ErrorResponse
-from app.service.milvus_service import MilvusService
+from app.service.vector_store import create_vector_store
 from app.service.ingest_progress_client import IngestProgressClient
 from app.service.runpod_service import RunpodService
+from app.service.projection_service import ProjectionService
+from app.service.search_cache_invalidator import bump_collection_version
 from app.core.settings import settings
 from app.models.database import get_db
 from app.models.collection import Collection
@@ -289,10 +291,7 @@ async def embedding_process(
                     logger.debug(f"Failed to send vector_store start progress: {e}")
             
             try:
-                milvus_service = MilvusService(
-                    host=settings.milvus_host,
-                    port=settings.milvus_port,
-                )
+                vector_store = create_vector_store()
 
                 # 임베딩 데이터 준비
                 now = datetime.utcnow().isoformat()
@@ -359,6 +358,20 @@ async def embedding_process(
                             except Exception as pe:
                                 logger.debug(f"Failed to send vector_store advance progress: {pe}")
                 
+                # 문서 카테고리 (v2 스키마 category 필드, v1 컬렉션의 후처리 필터용 metadata CATEGORY)
+                if request.category:
+                    for item in milvus_data:
+                        item["category"] = request.category
+                        item["metadata"]["CATEGORY"] = request.category
+
+                # 컬렉션 PCA 투영 적용 (COLLECTION_PROJECTION에 등록된 경우)
+                projection = await ProjectionService.get_projection(db, collection_name)
+                if projection and milvus_data:
+                    projected = projection.apply([item["vector"] for item in milvus_data])
+                    for item, projected_vector in zip(milvus_data, projected):
+                        item["vector"] = projected_vector
+                    logger.info(f"Applied projection {projection.source_dim} -> {projection.target_dim} for '{collection_name}'")
+
                 # 벡터 차원 확인 (첫 번째 벡터의 길이 사용)
                 if milvus_data and milvus_data[0]["vector"]:
                     vector_dim = len(milvus_data[0]["vector"])
@@ -366,22 +379,27 @@ async def embedding_process(
                     vector_dim = 1024  # 기본값
                 
                 # Milvus 컬렉션 확인 및 생성 (새로 생성되었는지 확인)
-                _, is_newly_created = milvus_service.ensure_collection(collection_name, vector_dim)
+                _, is_newly_created = vector_store.ensure_collection(
+                    collection_name, vector_dim, sparse=settings.sparse_enabled
+                )
                 if (x_user_role or "").lower() == "admin":
                     try:
-                        milvus_service.ensure_partitions(collection_name, ["public", "hebees"])
+                        vector_store.ensure_partitions(collection_name, ["public", "hebees"])
                     except Exception as pe:
                         logger.warning(f"Partition ensure failed: {str(pe)}")
                 # Milvus에 삽입
                 target_partition = None
                 if (x_user_role or "").lower() == "admin" and bucket in {"public", "hebees"}:
                     target_partition = bucket
-                milvus_service.insert_embeddings(
+                vector_store.insert_embeddings(
                     collection_name=collection_name,
                     embeddings=milvus_data,
                     vector_dim=vector_dim,
-                    partition_name=target_partition
+                    partition_name=target_partition,
+                    sparse=settings.sparse_enabled
                 )
+                # 검색 캐시 무효화
+                await bump_collection_version(collection_name)
                 
                 logger.info(f"Inserted {len(milvus_data)} embeddings into Milvus collection '{collection_name}'")
                 
@@ -742,21 +760,24 @@ async def image_embedding_process(
         # 5) Milvus에 저장
         if collection_name and vectors:
             try:
-                milvus_service = MilvusService(
-                    host=settings.milvus_host,
-                    port=settings.milvus_port,
-                )
+                vector_store = create_vector_store()
                 
+                # 컬렉션 PCA 투영 적용 (COLLECTION_PROJECTION에 등록된 경우)
+                projection = await ProjectionService.get_projection(db, collection_name)
+                if projection:
+                    vectors = projection.apply(vectors)
+                    logger.info(f"Applied projection {projection.source_dim} -> {projection.target_dim} for '{collection_name}'")
+
                 # 벡터 차원 확인
                 vector_dim = len(vectors[0]) if vectors else 512
                 
                 # 컬렉션 확인 및 생성
-                _, is_newly_created = milvus_service.ensure_collection(collection_name, vector_dim)
+                _, is_newly_created = vector_store.ensure_collection(collection_name, vector_dim)
                 
                 # publicRetina_image의 경우 파티션 생성
                 if "publicRetina_image" in collection_name:
                     try:
-                        milvus_service.ensure_partitions(collection_name, ["public", "hebees"])
+                        vector_store.ensure_partitions(collection_name, ["public", "hebees"])
                     except Exception as pe:
                         logger.warning(f"Partition ensure failed: {str(pe)}")
                 
@@ -781,18 +802,27 @@ async def image_embedding_process(
                         "metadata": metadata,
                     })
                 
+                # 문서 카테고리 (v2 스키마 category 필드, v1 컬렉션의 후처리 필터용 metadata CATEGORY)
+                if request.category:
+                    for item in milvus_data:
+                        item["category"] = request.category
+                        item["metadata"]["CATEGORY"] = request.category
+                
                 # 파티션 결정 (publicRetina_image의 경우)
                 target_partition = None
                 if "publicRetina_image" in collection_name and bucket in {"public", "hebees"}:
                     target_partition = bucket
                 
                 # Milvus에 삽입
-                milvus_service.insert_embeddings(
+                vector_store.insert_embeddings(
                     collection_name=collection_name,
                     embeddings=milvus_data,
                     vector_dim=vector_dim,
-                    partition_name=target_partition
+                    partition_name=target_partition,
+                    modality="image"
                 )
+                # 검색 캐시 무효화
+                await bump_collection_version(collection_name)
                 
                 logger.info(f"Inserted {len(milvus_data)} image embeddings into Milvus collection '{collection_name}'" + (f" (partition: {target_partition})" if target_partition else ""))
                 
@@ -12,4 +12,6 @@ class EmbeddingProcessRequest(BaseModel):
     fileNo: Optional[str] = None
     embeddingStrategy: str
     embeddingParameter: Dict[str, Any] = {}
+    # 문서 카테고리 (v2 스키마 category 필드, 필터 검색용)
+    category: Optional[str] = None
 
@@ -10,4 +10,5 @@ class ImageEmbeddingProcessRequest(BaseModel):
     collectionNo: Optional[str] = None
     bucket: Optional[str] = None  # "public" 또는 "hebees" (publicRetina_image의 경우)
     partition: Optional[str] = None  # "public" 또는 "hebees" (publicRetina_image의 경우)
-
+    # 문서 카테고리 (v2 스키마 category 필드, 필터 검색용)
+    category: Optional[str] = None
@@ -0,0 +1,2 @@
+"""운영용 오프라인 스크립트 모듈"""
+
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+삭제 후 컬렉션 유지보수(compaction / 벡터 인덱스 재생성) 스크립트
+python -m app.scripts.compact_collections [--collection h1234_1 ...] [--all] [--force] [--dry-run]
+
+파일 삭제는 Milvus expression delete로 tombstone만 남기므로, 삭제가 잦은 컬렉션은 compaction 전까지
+검색 지연과 메모리가 계속 늘어납니다. off-peak 시간대에 cron으로 실행합니다.
+
+1) 삭제 행 수 = max(backend 삭제 서비스가 누적한 Redis milvus:deleted_rows 값, num_entities - count(*))
+2) 삭제 비율/행 수가 임계값(maintenance_compact_*)을 넘은 컬렉션만 compact() 후 완료 대기
+3) 삭제 비율이 maintenance_rebuild_deleted_ratio 이상이거나 --rebuild-index이면
+   release → 벡터 인덱스 drop/create(같은 파라미터) → load (재생성 중에는 검색 불가)
+4) 전후 세그먼트 수/행 수와 저장된 벡터로 측정한 검색 지연(p50/p95)을 JSON으로 출력
+maintenance_window 밖에서는 --force 없이 실행하지 않습니다.
+vector_store_backend=local이면 로컬 컬렉션의 삭제 표시 행을 같은 임계값으로 compact합니다 (Redis/Milvus 미사용).
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from pymilvus import Collection, connections, utility
+from loguru import logger
+
+from app.core.settings import settings
+
+DELETED_ROWS_KEY = "milvus:deleted_rows"
+VECTOR_FIELD = "vector"
+KST = ZoneInfo("Asia/Seoul")
+
+
+def in_window(window: str, now: Optional[datetime] = None) -> bool:
+    """HH:MM-HH:MM 시간대 안인지 확인 (자정을 넘는 구간 허용, 빈 값이면 항상 허용)"""
+    if not window.strip():
+        return True
+    start, end = (datetime.strptime(part.strip(), "%H:%M").time() for part in window.split("-", 1))
+    current = (now or datetime.now(KST)).time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+def _vector_index(collection: Collection):
+    for index in collection.indexes:
+        if index.field_name == VECTOR_FIELD:
+            return index
+    return None
+
+
+def _count(collection: Collection) -> int:
+    return int(collection.query(expr="", output_fields=["count(*)"])[0]["count(*)"])
+
+
+def segment_stats(name: str) -> Dict[str, int]:
+    """로드된 세그먼트 수와 행 수"""
+    segments = utility.get_query_segment_info(name)
+    return {"segments": len(segments), "segmentRows": sum(int(segment.num_rows) for segment in segments)}
+
+
+def sample_probes(collection: Collection, num_probes: int) -> List[List[float]]:
+    """지연 측정용 질의 벡터 (저장된 벡터 일부)"""
+    rows = collection.query(expr="", output_fields=[VECTOR_FIELD], limit=num_probes)
+    return [row[VECTOR_FIELD] for row in rows]
+
+
+def measure_latency(collection: Collection, probes: List[List[float]], k: int) -> Dict[str, float]:
+    """질의 1건씩 검색해 p50/p95 지연(ms) 측정"""
+    if not probes:
+        return {}
+    index = _vector_index(collection)
+    metric = str((index.params or {}).get("metric_type", "COSINE")) if index else "COSINE"
+    param = {"metric_type": metric, "params": {"ef": max(64, k), "nprobe": 16}}
+    latencies: List[float] = []
+    for probe in probes:
+        started = time.perf_counter()
+        collection.search(data=[probe], anns_field=VECTOR_FIELD, param=param, limit=k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50Ms": float(np.percentile(latencies, 50)),
+        "p95Ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def snapshot(collection: Collection, probes: List[List[float]], k: int) -> Dict[str, Any]:
+    return {**segment_stats(collection.name), **measure_latency(collection, probes, k)}
+
+
+def deleted_rows(collection: Collection, tracked: int) -> Dict[str, Any]:
+    """num_entities(삽입 누적)와 count(*)(살아 있는 행)의 차이와 추적 값 중 큰 값"""
+    collection.flush()
+    total = int(collection.num_entities)
+    live = _count(collection)
+    deleted = max(tracked, total - live)
+    return {"numEntities": total, "liveRows": live, "trackedDeleted": tracked, "deleted": deleted,
+            "deletedRatio": deleted / total if total else 0.0}
+
+
+def rebuild_index(collection: Collection) -> None:
+    """벡터 인덱스를 같은 파라미터로 재생성 (release 상태에서만 가능)"""
+    index = _vector_index(collection)
+    if index is None:
+        logger.warning(f"'{collection.name}' has no vector index, skipping rebuild")
+        return
+    params = dict(index.params or {})
+    if isinstance(params.get("params"), str):
+        params["params"] = json.loads(params["params"])
+    collection.release()
+    collection.drop_index(index_name=index.index_name)
+    collection.create_index(field_name=VECTOR_FIELD, index_params=params, index_name=index.index_name)
+    utility.wait_for_index_building_complete(collection.name, index_name=index.index_name)
+    collection.load()
+
+
+def maintain_collection(name: str, tracked: int, args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """
+    컬렉션 하나 점검 후 필요하면 compact / 인덱스 재생성
+
+    Returns:
+        리포트 (임계값 미달이면 action="skip")
+    """
+    collection = Collection(name)
+    collection.load()
+    stats = deleted_rows(collection, tracked)
+    report: Dict[str, Any] = {"collection": name, **stats}
+    needs_compact = (
+        stats["deleted"] >= args.min_deleted_rows and stats["deletedRatio"] >= args.deleted_ratio
+    )
+    needs_rebuild = args.rebuild_index or (needs_compact and stats["deletedRatio"] >= args.rebuild_ratio)
+    if not needs_compact and not args.rebuild_index:
+        report["action"] = "skip"
+        return report
+    report["action"] = "+".join(action for action, needed in (("compact", needs_compact), ("rebuild", needs_rebuild)) if needed)
+    if args.dry_run:
+        return report
+
+    probes = sample_probes(collection, args.probes)
+    report["before"] = snapshot(collection, probes, args.k)
+    started = time.monotonic()
+    if needs_compact:
+        collection.compact()
+        collection.wait_for_compaction_completed(timeout=args.timeout)
+        logger.info(f"[{name}] compaction finished in {time.monotonic() - started:.1f}s")
+    if needs_rebuild:
+        rebuild_started = time.monotonic()
+        rebuild_index(collection)
+        logger.info(f"[{name}] vector index rebuilt in {time.monotonic() - rebuild_started:.1f}s")
+    report["elapsedSeconds"] = round(time.monotonic() - started, 1)
+    report["after"] = snapshot(collection, probes, args.k)
+    return report
+
+
+def write_report(report: List[Dict[str, Any]], failed: int, path: Optional[str]) -> int:
+    """리포트 출력(및 저장) 후 종료 코드 반환"""
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return 1 if failed else 0
+
+
+def maintain_local(names: List[str], args: argparse.Namespace) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    로컬 저장소 컬렉션 compact (지정이 없으면 전체)
+
+    Returns:
+        (리포트 목록, 실패 수)
+    """
+    from app.service.local_vector_store import get_local_vector_store
+
+    store = get_local_vector_store()
+    report: List[Dict[str, Any]] = []
+    failed = 0
+    for name in dict.fromkeys(names or store.list_collections()):
+        try:
+            collection = store.get_collection(name)
+            total, deleted = collection.deleted_stats()
+            result: Dict[str, Any] = {"collection": name, "numEntities": total, "liveRows": total - deleted,
+                                      "deleted": deleted, "deletedRatio": deleted / total if total else 0.0}
+            needs_compact = deleted >= max(args.min_deleted_rows, 1) and result["deletedRatio"] >= args.deleted_ratio
+            result["action"] = "compact" if needs_compact else "skip"
+            if needs_compact and not args.dry_run:
+                started = time.monotonic()
+                result.update(collection.compact())
+                result["elapsedSeconds"] = round(time.monotonic() - started, 1)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Maintenance failed for '{name}': {e}")
+            continue
+        report.append(result)
+    return report, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="삭제 tombstone 정리 (compaction / 인덱스 재생성)")
+    parser.add_argument("--collection", action="append", default=[], help="대상 컬렉션 (여러 번 지정 가능)")
+    parser.add_argument("--all", action="store_true", help="모든 컬렉션 점검 (기본: 삭제가 기록된 컬렉션만)")
+    parser.add_argument("--deleted-ratio", type=float, default=settings.maintenance_compact_deleted_ratio, help="compact 삭제 비율 임계값")
+    parser.add_argument("--min-deleted-rows", type=int, default=settings.maintenance_compact_min_deleted_rows, help="compact 최소 삭제 행 수")
+    parser.add_argument("--rebuild-ratio", type=float, default=settings.maintenance_rebuild_deleted_ratio, help="인덱스 재생성 삭제 비율 임계값")
+    parser.add_argument("--rebuild-index", action="store_true", help="임계값과 무관하게 벡터 인덱스 재생성")
+    parser.add_argument("--probes", type=int, default=50, help="지연 측정 질의 수")
+    parser.add_argument("--k", type=int, default=10, help="지연 측정 limit")
+    parser.add_argument("--timeout", type=float, default=3600, help="compaction 대기 시간 (초)")
+    parser.add_argument("--force", action="store_true", help="maintenance_window 밖에서도 실행")
+    parser.add_argument("--dry-run", action="store_true", help="대상만 출력")
+    parser.add_argument("--output", default=None, help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    if not args.dry_run and not args.force and not in_window(settings.maintenance_window):
+        logger.info(f"Outside maintenance window ({settings.maintenance_window} KST), use --force to run anyway")
+        return 0
+
+    if settings.vector_store_backend == "local":
+        report, failed = maintain_local(args.collection, args)
+        return write_report(report, failed, args.output)
+
+    import redis
+    client = redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_password,
+        username=settings.redis_username,
+        db=settings.redis_db,
+        decode_responses=True,
+    )
+    tracked = {name: int(value) for name, value in (client.hgetall(DELETED_ROWS_KEY) or {}).items()}
+
+    connections.connect(alias="default", host=settings.milvus_host, port=settings.milvus_port)
+    existing = set(utility.list_collections())
+    names = list(args.collection) + list(tracked)
+    if args.all:
+        names += sorted(existing)
+    # 삭제된 컬렉션의 누적 값 정리
+    stale = [name for name in tracked if name not in existing and not utility.has_collection(name)]
+    if stale:
+        client.hdel(DELETED_ROWS_KEY, *stale)
+
+    report: List[Dict[str, Any]] = []
+    failed = 0
+    for name in dict.fromkeys(names):
+        if name in stale:
+            continue
+        try:
+            result = maintain_collection(name, tracked.get(name, 0), args)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Maintenance failed for '{name}': {e}")
+            continue
+        report.append(result)
+        if result["action"].startswith("compact") and not args.dry_run and name in tracked:
+            # compact 이후 tombstone이 정리되었으므로 누적 값에서 처리한 만큼 차감
+            client.hincrby(DELETED_ROWS_KEY, name, -tracked[name])
+
+    return write_report(report, failed, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
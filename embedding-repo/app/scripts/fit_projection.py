@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+컬렉션별 PCA 투영 학습 및 recall@k 평가 스크립트
+python -m app.scripts.fit_projection --collection h1234_1 --dims 256 384 512 로 실행
+
+1) 컬렉션에 저장된 벡터를 샘플링하여 PCA를 학습
+2) 후보 차원별로 원본 공간의 exact top-k 대비 recall@k 측정 (JSON 리포트)
+3) --apply DIM --rebuild 지정 시 기존 벡터를 투영하여 새 컬렉션을 만든 뒤
+   투영 행렬을 COLLECTION_PROJECTION에 저장하고 캐시 무효화(projection:invalidate)를 발행한 다음 이름 교체
+   (재생성 중 들어온 삽입은 원본 컬렉션에 남으므로 인제스트가 없는 시간대에 실행)
+   벡터가 있는 컬렉션에 --rebuild 없이 --apply 하면 기존 차원과 맞지 않으므로 거부
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pymilvus import Collection, CollectionSchema, DataType, connections, utility
+from loguru import logger
+
+from app.core.settings import settings
+from app.models.database import SessionLocal
+from app.models.collection_projection import CollectionProjection
+from app.service.milvus_schema import DEFAULT_VECTOR_INDEX
+from app.service.projection_service import PROJECTION_INVALIDATE_CHANNEL
+
+VECTOR_FIELD = "vector"
+
+
+def load_vectors(collection: Collection, limit: int, batch_size: int = 1000) -> np.ndarray:
+    """query_iterator로 최대 limit개의 벡터를 읽어 float32 행렬로 반환"""
+    iterator = collection.query_iterator(batch_size=batch_size, output_fields=[VECTOR_FIELD])
+    rows: List[List[float]] = []
+    try:
+        while len(rows) < limit:
+            batch = iterator.next()
+            if not batch:
+                break
+            rows.extend(item[VECTOR_FIELD] for item in batch)
+    finally:
+        iterator.close()
+    return np.asarray(rows[:limit], dtype=np.float32)
+
+
+def fit_pca(x: np.ndarray, max_dim: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    중심화 후 SVD로 주성분 계산
+
+    Returns:
+        (mean, components[max_dim, source_dim], 누적 설명 분산 비율[max_dim])
+    """
+    mean = x.mean(axis=0)
+    _, singular_values, vt = np.linalg.svd(x - mean, full_matrices=False)
+    variance = singular_values ** 2
+    cumulative = np.cumsum(variance) / max(float(variance.sum()), 1e-12)
+    return mean.astype(np.float32), vt[:max_dim].astype(np.float32), cumulative[:max_dim]
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def _top_k(corpus: np.ndarray, query_idx: np.ndarray, k: int) -> np.ndarray:
+    """코사인 exact top-k (자기 자신 제외)"""
+    sims = corpus[query_idx] @ corpus.T
+    sims[np.arange(len(query_idx)), query_idx] = -np.inf
+    top = np.argpartition(-sims, k, axis=1)[:, :k]
+    return top
+
+
+def evaluate_recall(
+    x: np.ndarray,
+    mean: np.ndarray,
+    components: np.ndarray,
+    cumulative: np.ndarray,
+    dims: List[int],
+    k: int,
+    num_queries: int,
+    seed: int = 42,
+) -> List[Dict[str, float]]:
+    """후보 차원별 recall@k 계산 (저장된 벡터를 pseudo-query로 사용)"""
+    rng = np.random.default_rng(seed)
+    query_idx = rng.choice(len(x), size=min(num_queries, len(x)), replace=False)
+    truth = _top_k(_normalize(x), query_idx, k)
+
+    report = []
+    for dim in dims:
+        projected = _normalize((x - mean) @ components[:dim].T)
+        approx = _top_k(projected, query_idx, k)
+        hits = [len(np.intersect1d(t, a, assume_unique=True)) for t, a in zip(truth, approx)]
+        report.append({
+            "dim": dim,
+            f"recall@{k}": float(np.mean(hits) / k),
+            "explainedVariance": float(cumulative[dim - 1]),
+            "bytesPerVector": dim * 4,
+        })
+        logger.info(f"dim={dim} recall@{k}={report[-1][f'recall@{k}']:.4f}")
+    return report
+
+
+def save_projection(collection_name: str, mean: np.ndarray, components: np.ndarray, explained: float) -> None:
+    """COLLECTION_PROJECTION에 투영 행렬 저장 (upsert)"""
+    with SessionLocal() as session:
+        session.merge(CollectionProjection(
+            COLLECTION_NAME=collection_name,
+            SOURCE_DIM=int(components.shape[1]),
+            TARGET_DIM=int(components.shape[0]),
+            MEAN=mean.astype(np.float32).tobytes(),
+            COMPONENTS=np.ascontiguousarray(components, dtype=np.float32).tobytes(),
+            EXPLAINED_VARIANCE=explained,
+        ))
+        session.commit()
+    logger.info(f"Saved projection for '{collection_name}' ({components.shape[1]} -> {components.shape[0]})")
+
+
+def publish_invalidation(collection_names: List[str]) -> None:
+    """embedding/query-embedding 서비스의 투영 캐시 무효화 메시지 발행"""
+    import redis
+
+    client = redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_password,
+        username=settings.redis_username,
+        db=settings.redis_db,
+    )
+    try:
+        client.publish(PROJECTION_INVALIDATE_CHANNEL, json.dumps({"collections": collection_names}))
+    finally:
+        client.close()
+    logger.info(f"Published projection invalidation for {collection_names}")
+
+
+def build_projected_collection(source_name: str, mean: np.ndarray, components: np.ndarray, batch_size: int = 1000) -> str:
+    """
+    기존 벡터를 투영하여 새 컬렉션에 복사 (인덱스 생성 및 로드까지)
+
+    Returns:
+        새 컬렉션 이름
+    """
+    source = Collection(source_name)
+    source.load()
+    target_dim = int(components.shape[0])
+    target_name = f"{source_name}__pca{target_dim}"
+    if utility.has_collection(target_name):
+        raise ValueError(f"Collection '{target_name}' already exists")
+
+    schema_dict = source.schema.to_dict()
+    for field in schema_dict["fields"]:
+        if field.get("type") == DataType.FLOAT_VECTOR:
+            field.setdefault("params", {})["dim"] = target_dim
+    target = Collection(name=target_name, schema=CollectionSchema.construct_from_dict(schema_dict))
+
+    output_fields = [
+        f.name for f in source.schema.fields
+        if not (f.is_primary and f.auto_id)
+    ]
+    projection = components.T
+    copied = 0
+    for partition in source.partitions:
+        if partition.name != "_default" and not target.has_partition(partition.name):
+            target.create_partition(partition.name)
+        iterator = source.query_iterator(
+            batch_size=batch_size,
+            output_fields=output_fields,
+            partition_names=[partition.name],
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                vectors = _normalize((np.asarray([row[VECTOR_FIELD] for row in batch], dtype=np.float32) - mean) @ projection)
+                rows = []
+                for row, vector in zip(batch, vectors):
+                    item = {name: row[name] for name in output_fields}
+                    item[VECTOR_FIELD] = vector.tolist()
+                    rows.append(item)
+                target.insert(rows, partition_name=partition.name)
+                copied += len(rows)
+        finally:
+            iterator.close()
+    target.flush()
+
+    # 원본의 모든 인덱스(벡터/희소/스칼라)를 동일 파라미터로 재생성
+    source_indexes = source.indexes
+    if not any(index.field_name == VECTOR_FIELD for index in source_indexes):
+        target.create_index(field_name=VECTOR_FIELD, index_params=DEFAULT_VECTOR_INDEX)
+    for index in source_indexes:
+        target.create_index(field_name=index.field_name, index_params=index.params, index_name=index.index_name)
+    target.load()
+    logger.info(f"Copied {copied} rows into '{target_name}'")
+    return target_name
+
+
+def swap_collections(source_name: str, target_name: str) -> str:
+    """
+    원본 컬렉션을 백업 이름으로 바꾸고 새 컬렉션을 원본 이름으로 교체
+
+    Returns:
+        원본 컬렉션의 백업 이름
+    """
+    backup_name = f"{source_name}__raw_{int(time.time())}"
+    Collection(source_name).release()
+    utility.rename_collection(source_name, backup_name)
+    utility.rename_collection(target_name, source_name)
+    Collection(source_name).load()
+    logger.info(f"Swapped collections: '{source_name}' is now projected, original kept as '{backup_name}'")
+    return backup_name
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="컬렉션 PCA 투영 학습 및 recall@k 평가")
+    parser.add_argument("--collection", required=True, help="Milvus 컬렉션 이름")
+    parser.add_argument("--dims", type=int, nargs="+", default=[128, 256, 384, 512], help="평가할 후보 차원")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--queries", type=int, default=200, help="pseudo-query 개수")
+    parser.add_argument("--sample", type=int, default=50_000, help="학습/평가에 사용할 최대 벡터 수")
+    parser.add_argument("--apply", type=int, default=None, help="선택한 차원의 투영 행렬을 저장")
+    parser.add_argument("--rebuild", action="store_true", help="--apply와 함께 기존 벡터를 투영하여 컬렉션 재생성")
+    parser.add_argument("--output", default=None, help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    connections.connect(alias="default", host=settings.milvus_host, port=settings.milvus_port)
+    if not utility.has_collection(args.collection):
+        logger.error(f"Collection '{args.collection}' does not exist")
+        return 1
+    collection = Collection(args.collection)
+    if args.apply and not args.rebuild and collection.num_entities > 0:
+        logger.error(
+            f"Collection '{args.collection}' already has vectors; --apply requires --rebuild "
+            "(saving a projection alone would mismatch the stored dimension)"
+        )
+        return 1
+    collection.load()
+
+    x = load_vectors(collection, args.sample)
+    if len(x) <= args.k:
+        logger.error(f"Not enough vectors in '{args.collection}': {len(x)}")
+        return 1
+    dims = sorted({d for d in args.dims + ([args.apply] if args.apply else []) if 0 < d <= min(x.shape)})
+    logger.info(f"Fitting PCA on {x.shape[0]} vectors (dim={x.shape[1]}), candidate dims={dims}")
+    mean, components, cumulative = fit_pca(x, max(dims))
+
+    report = {
+        "collection": args.collection,
+        "sourceDim": int(x.shape[1]),
+        "sampleSize": int(x.shape[0]),
+        "k": args.k,
+        "results": evaluate_recall(x, mean, components, cumulative, dims, args.k, args.queries),
+    }
+
+    if args.apply:
+        selected = components[:args.apply]
+        target_name = build_projected_collection(args.collection, mean, selected)
+        # 교체 직전에 투영을 저장하고 캐시를 비워 교체 후 원본 차원 벡터가 새 컬렉션으로 가지 않도록 함
+        save_projection(args.collection, mean, selected, float(cumulative[args.apply - 1]))
+        publish_invalidation([args.collection])
+        report["backupCollection"] = swap_collections(args.collection, target_name)
+        report["appliedDim"] = args.apply
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+오퍼별 컬렉션 → partition key 공유 컬렉션 마이그레이션 스크립트
+python -m app.scripts.migrate_partition_key --collection h1234_1 [--collection ...] [--all] [--drop-source]
+
+1) h{offerNo}[_image]_{version} 컬렉션마다 공유 컬렉션 {prefix}[_image]_{version}을 준비
+   (없으면 원본과 같은 차원/벡터 인덱스/희소 벡터 여부로 offer_no partition key 스키마 생성)
+2) 공유 컬렉션에 남아 있는 해당 오퍼 행을 지운 뒤 (재실행 시 중복 방지)
+   query_iterator로 원본 행을 배치 복사하며 offer_no 값을 채움 (v1 → v2 공유 컬렉션이면 스칼라 값 추출)
+3) 오퍼 행 수 검증 후 원본은 release(또는 --drop-source 시 alias와 함께 삭제)하고 검색 캐시 버전 증가
+복사가 끝난 뒤 embedding/search/backend의 collection_layout을 partition_key로 바꿉니다.
+튜닝된 ef/nprobe는 컬렉션별이므로 공유 컬렉션에 대해 tune_search_params를 다시 실행합니다.
+"""
+import argparse
+import sys
+from typing import Any, Dict, List, Optional
+
+from pymilvus import Collection, CollectionSchema, DataType, connections, utility
+from loguru import logger
+
+from app.core.settings import settings
+from app.service.collection_layout import OFFER_FIELD, CollectionTarget, parse_offer_collection, shared_collection_name
+from app.service.milvus_schema import (
+    DEFAULT_VECTOR_INDEX,
+    SPARSE_FIELD,
+    SPARSE_INDEX,
+    build_fields,
+    create_scalar_indexes,
+    has_partition_key,
+    is_v2,
+    typed_values,
+)
+from app.service.search_cache_invalidator import collection_version_key
+
+
+def _vector_dim(collection: Collection) -> int:
+    for field in collection.schema.fields:
+        if field.dtype == DataType.FLOAT_VECTOR:
+            return int(field.params["dim"])
+    raise ValueError(f"Collection '{collection.name}' has no FLOAT_VECTOR field")
+
+
+def _has_sparse(collection: Collection) -> bool:
+    return any(field.name == SPARSE_FIELD for field in collection.schema.fields)
+
+
+def _count(collection: Collection, expr: str = "") -> int:
+    return int(collection.query(expr=expr, output_fields=["count(*)"])[0]["count(*)"])
+
+
+def _physical_name(name: str) -> str:
+    """alias면 실제 컬렉션 이름 (v2 스키마 마이그레이션 후 h{offerNo}_{version}은 alias)"""
+    collections = utility.list_collections()
+    if name in collections:
+        return name
+    for collection_name in collections:
+        if name in (utility.list_aliases(collection_name) or []):
+            return collection_name
+    return name
+
+
+def ensure_shared_collection(name: str, source: Collection) -> Collection:
+    """공유 컬렉션 준비 (이미 있으면 원본과 스키마 호환 여부 확인)"""
+    if utility.has_collection(name):
+        target = Collection(name)
+        if not has_partition_key(target):
+            raise ValueError(f"Collection '{name}' exists but has no '{OFFER_FIELD}' partition key")
+        if _vector_dim(target) != _vector_dim(source):
+            raise ValueError(f"Vector dim mismatch: '{source.name}'={_vector_dim(source)}, '{name}'={_vector_dim(target)}")
+        if _has_sparse(target) != _has_sparse(source):
+            raise ValueError(f"Sparse field mismatch between '{source.name}' and '{name}'")
+        return target
+
+    schema_version = 2 if is_v2(source) else 1
+    sparse = _has_sparse(source)
+    target = Collection(
+        name=name,
+        schema=CollectionSchema(
+            fields=build_fields(schema_version, _vector_dim(source), sparse=sparse, partition_key=True),
+            description=f"Embedding collection: {name}"
+        ),
+        num_partitions=settings.partition_key_num_partitions,
+    )
+    vector_index = next(
+        (index.params for index in source.indexes if index.field_name == "vector"),
+        DEFAULT_VECTOR_INDEX,
+    )
+    target.create_index(field_name="vector", index_params=vector_index)
+    if sparse:
+        target.create_index(field_name=SPARSE_FIELD, index_params=SPARSE_INDEX)
+    if schema_version >= 2:
+        create_scalar_indexes(target)
+    target.create_index(field_name=OFFER_FIELD, index_params={"index_type": "INVERTED"}, index_name=f"idx_{OFFER_FIELD}")
+    logger.info(f"Created shared collection '{name}' (schema=v{schema_version}, sparse={sparse})")
+    return target
+
+
+def _to_row(row: Dict[str, Any], target_fields: List[str], source_v2: bool, modality: str, offer_no: str) -> Dict[str, Any]:
+    item = {field: row[field] for field in target_fields if field in row}
+    if not source_v2 and "modality" in target_fields:
+        item.update(typed_values(row.get("metadata"), modality))
+    item[OFFER_FIELD] = offer_no
+    return item
+
+
+def migrate_collection(name: str, batch_size: int, drop_source: bool, redis_client=None) -> Optional[str]:
+    """
+    단일 오퍼 컬렉션 마이그레이션
+
+    Returns:
+        공유 컬렉션 이름 (오퍼 컬렉션 형식이 아니면 None)
+    """
+    parsed = parse_offer_collection(name)
+    if parsed is None:
+        logger.info(f"'{name}' is not an offer collection, skipping")
+        return None
+    offer_no = parsed["offer_no"]
+    source = Collection(name)
+    source.load()
+    target_name = shared_collection_name(parsed["version"], parsed["image"])
+    target = ensure_shared_collection(target_name, source)
+    target.load()
+    offer_expr = CollectionTarget(target_name, offer_no).expr
+
+    # 이전 실행에서 일부 복사된 행 제거
+    target.delete(offer_expr)
+
+    source_v2 = is_v2(source)
+    target_fields = [
+        field.name for field in target.schema.fields
+        if not (field.is_primary and field.auto_id) and field.name != OFFER_FIELD
+    ]
+    source_fields = {field.name for field in source.schema.fields}
+    output_fields = [field for field in target_fields if field in source_fields]
+    modality = "image" if parsed["image"] else "text"
+
+    copied = 0
+    iterator = source.query_iterator(batch_size=batch_size, output_fields=output_fields)
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            target.insert([_to_row(row, target_fields, source_v2, modality, offer_no) for row in batch])
+            copied += len(batch)
+            logger.info(f"[{name}] copied {copied} rows -> '{target_name}'")
+    finally:
+        iterator.close()
+    target.flush()
+
+    source_count = _count(source)
+    target_count = _count(target, offer_expr)
+    if target_count != source_count:
+        raise RuntimeError(
+            f"Row count mismatch for '{name}': source={source_count}, '{target_name}' offer rows={target_count} (source kept)"
+        )
+
+    source.release()
+    if drop_source:
+        physical_name = _physical_name(name)
+        for alias in utility.list_aliases(physical_name) or []:
+            utility.drop_alias(alias)
+        utility.drop_collection(physical_name)
+        logger.info(f"Dropped source collection '{physical_name}' ({name})")
+    if redis_client is not None:
+        redis_client.incr(collection_version_key(name))
+    logger.info(f"Migrated '{name}' -> '{target_name}' (offer_no={offer_no}, {copied} rows)")
+    return target_name
+
+
+def list_offer_collections() -> List[str]:
+    """오퍼 컬렉션 형식의 이름 (v2 마이그레이션으로 alias가 된 이름 포함)"""
+    names: List[str] = []
+    for name in utility.list_collections():
+        for candidate in [name] + list(utility.list_aliases(name) or []):
+            if parse_offer_collection(candidate):
+                names.append(candidate)
+                break
+    return names
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="오퍼별 컬렉션 → partition key 공유 컬렉션 마이그레이션")
+    parser.add_argument("--collection", action="append", default=[], help="대상 오퍼 컬렉션 (여러 번 지정 가능)")
+    parser.add_argument("--all", action="store_true", help="모든 오퍼 컬렉션 대상")
+    parser.add_argument("--batch-size", type=int, default=1000, help="query_iterator 배치 크기")
+    parser.add_argument("--drop-source", action="store_true", help="검증 후 원본 컬렉션 삭제 (기본: release만)")
+    args = parser.parse_args(argv)
+
+    connections.connect(alias="default", host=settings.milvus_host, port=settings.milvus_port)
+    names = list(args.collection)
+    if args.all:
+        names += list_offer_collections()
+    if not names:
+        parser.error("--collection or --all is required")
+
+    import redis
+    redis_client = redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_password,
+        username=settings.redis_username,
+        db=settings.redis_db,
+        decode_responses=True,
+    )
+
+    failed = 0
+    for name in dict.fromkeys(names):
+        try:
+            migrate_collection(name, args.batch_size, args.drop_source, redis_client)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Migration failed for '{name}': {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
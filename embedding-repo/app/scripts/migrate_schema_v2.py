@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Milvus v1 → v2 스키마 마이그레이션 스크립트
+python -m app.scripts.migrate_schema_v2 --collection h1234_1 [--collection ...] [--all] [--drop-source]
+
+1) {name}__v2 컬렉션을 v2 스키마(타입 스칼라 필드 + 스칼라 인덱스)로 생성
+2) 파티션별 query_iterator로 v1 행을 배치 복사하며 metadata JSON에서 스칼라 값 추출
+   (category는 FILE.FILE_CATEGORY_NO를 file_no로 조회해 채움)
+3) 행 수 검증 후 원본을 {name}__v1로 이름 변경(또는 --drop-source 시 삭제)하고
+   alias {name} → {name}__v2 생성 (기존 클라이언트는 같은 이름으로 계속 접근)
+복사 중 들어온 삽입은 원본에만 남으므로 인제스트가 없는 시간대에 실행합니다.
+"""
+import argparse
+import sys
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from pymilvus import Collection, CollectionSchema, DataType, connections, utility
+from loguru import logger
+from sqlalchemy import bindparam, text
+
+from app.core.settings import settings
+from app.models.database import SessionLocal
+from app.service.milvus_schema import (
+    DEFAULT_VECTOR_INDEX,
+    SPARSE_FIELD,
+    SPARSE_INDEX,
+    build_fields,
+    create_scalar_indexes,
+    is_v2,
+    typed_values,
+)
+
+V1_FIELDS = ["file_no", "text", "vector", "metadata"]
+
+
+def _vector_dim(collection: Collection) -> int:
+    for field in collection.schema.fields:
+        if field.dtype == DataType.FLOAT_VECTOR:
+            return int(field.params["dim"])
+    raise ValueError(f"Collection '{collection.name}' has no FLOAT_VECTOR field")
+
+
+def _file_no_bytes(file_no: str) -> Optional[bytes]:
+    try:
+        return bytes.fromhex(file_no) if len(file_no) == 32 else uuid.UUID(file_no).bytes
+    except (TypeError, ValueError):
+        return None
+
+
+def load_file_categories(file_nos: Iterable[str], cache: Dict[str, str]) -> None:
+    """FILE.FILE_CATEGORY_NO 조회 (file_no → 카테고리 UUID 문자열, 없으면 ""로 cache에 기록)"""
+    pending = {}
+    for file_no in file_nos:
+        if file_no in cache:
+            continue
+        cache[file_no] = ""
+        key = _file_no_bytes(str(file_no or ""))
+        if key:
+            pending[key] = file_no
+    if not pending:
+        return
+    stmt = text(
+        "SELECT `FILE_NO` AS file_no, `FILE_CATEGORY_NO` AS file_category_no "
+        "FROM `FILE` WHERE `FILE_NO` IN :file_nos"
+    ).bindparams(bindparam("file_nos", expanding=True))
+    with SessionLocal() as session:
+        for row in session.execute(stmt, {"file_nos": list(pending)}):
+            if row.file_no in pending and row.file_category_no:
+                cache[pending[row.file_no]] = str(uuid.UUID(bytes=row.file_category_no))
+
+
+def migrate_collection(name: str, batch_size: int, drop_source: bool) -> Optional[str]:
+    """
+    단일 컬렉션 마이그레이션
+
+    Returns:
+        v2 컬렉션 이름 (이미 v2이거나 건너뛴 경우 None)
+    """
+    source = Collection(name)
+    if is_v2(source):
+        logger.info(f"'{name}' is already v2, skipping")
+        return None
+
+    source.load()
+    has_sparse = any(field.name == SPARSE_FIELD for field in source.schema.fields)
+    modality = "image" if "_image_" in name else "text"
+    target_name = f"{name}__v2"
+    if utility.has_collection(target_name):
+        raise ValueError(f"Collection '{target_name}' already exists (remove it to re-run)")
+
+    target = Collection(
+        name=target_name,
+        schema=CollectionSchema(
+            fields=build_fields(2, _vector_dim(source), sparse=has_sparse),
+            description=f"Embedding collection: {name} (v2)"
+        ),
+    )
+    vector_index = next(
+        (index.params for index in source.indexes if index.field_name == "vector"),
+        DEFAULT_VECTOR_INDEX,
+    )
+    target.create_index(field_name="vector", index_params=vector_index)
+    if has_sparse:
+        target.create_index(field_name=SPARSE_FIELD, index_params=SPARSE_INDEX)
+    create_scalar_indexes(target)
+
+    output_fields = V1_FIELDS + ([SPARSE_FIELD] if has_sparse else [])
+    categories: Dict[str, str] = {}
+    copied = 0
+    for partition in source.partitions:
+        if partition.name != "_default" and not target.has_partition(partition.name):
+            target.create_partition(partition.name)
+        iterator = source.query_iterator(
+            batch_size=batch_size,
+            output_fields=output_fields,
+            partition_names=[partition.name],
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                load_file_categories((row["file_no"] for row in batch), categories)
+                rows = []
+                for row in batch:
+                    item = {field: row[field] for field in output_fields}
+                    item.update(typed_values(row.get("metadata"), modality, categories.get(row["file_no"], "")))
+                    rows.append(item)
+                target.insert(rows, partition_name=partition.name)
+                copied += len(rows)
+                logger.info(f"[{name}] copied {copied} rows (partition={partition.name})")
+        finally:
+            iterator.close()
+    target.flush()
+
+    source_count = source.num_entities
+    if target.num_entities != source_count:
+        raise RuntimeError(
+            f"Row count mismatch for '{name}': source={source_count}, target={target.num_entities} "
+            f"(source kept, '{target_name}' left for inspection)"
+        )
+
+    source.release()
+    if drop_source:
+        utility.drop_collection(name)
+        logger.info(f"Dropped source collection '{name}'")
+    else:
+        utility.rename_collection(name, f"{name}__v1")
+        logger.info(f"Renamed source collection '{name}' -> '{name}__v1'")
+    utility.create_alias(target_name, name)
+    target.load()
+    logger.info(f"Alias '{name}' -> '{target_name}' created ({copied} rows)")
+    return target_name
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Milvus v1 → v2 스키마 마이그레이션")
+    parser.add_argument("--collection", action="append", default=[], help="대상 컬렉션 (여러 번 지정 가능)")
+    parser.add_argument("--all", action="store_true", help="v1 스키마인 모든 컬렉션 대상")
+    parser.add_argument("--batch-size", type=int, default=1000, help="query_iterator 배치 크기")
+    parser.add_argument("--drop-source", action="store_true", help="검증 후 원본 컬렉션 삭제 (기본: __v1로 이름 변경)")
+    args = parser.parse_args(argv)
+
+    connections.connect(alias="default", host=settings.milvus_host, port=settings.milvus_port)
+    names = list(args.collection)
+    if args.all:
+        names += [
+            name for name in utility.list_collections()
+            if not name.endswith(("__v1", "__v2")) and "__raw_" not in name
+        ]
+    if not names:
+        parser.error("--collection or --all is required")
+
+    failed = 0
+    for name in dict.fromkeys(names):
+        try:
+            migrate_collection(name, args.batch_size, args.drop_source)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Migration failed for '{name}': {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+로컬 벡터 저장소 모듈 동기화 스크립트
+python -m app.scripts.sync_local_vector_store [--target ../search-repo/app/service/local_vector_store.py] [--check]
+
+app/service/local_vector_store.py는 embedding 서비스가 원본이고 search 서비스에 같은 내용으로 복사됩니다
+(서비스마다 빌드 컨텍스트가 달라 하나의 패키지로 공유할 수 없음).
+기본은 원본을 대상 경로로 복사하고, --check이면 내용이 다를 때 종료 코드 1을 반환합니다.
+"""
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+from typing import List, Optional
+
+from loguru import logger
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "service", "local_vector_store.py")
+DEFAULT_TARGET = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    os.pardir, "search-repo", "app", "service", "local_vector_store.py",
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="local_vector_store.py 복사본 동기화")
+    parser.add_argument("--target", default=os.path.normpath(DEFAULT_TARGET), help="search 서비스의 local_vector_store.py 경로")
+    parser.add_argument("--check", action="store_true", help="복사하지 않고 차이만 확인")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.target):
+        logger.error(f"Target not found: {args.target}")
+        return 1
+    if filecmp.cmp(SOURCE, args.target, shallow=False):
+        logger.info(f"Up to date: {args.target}")
+        return 0
+    if args.check:
+        logger.error(f"Out of sync: {args.target} differs from {SOURCE}")
+        return 1
+    shutil.copyfile(SOURCE, args.target)
+    logger.info(f"Copied {SOURCE} -> {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
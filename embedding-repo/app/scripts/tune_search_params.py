@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+컬렉션별 검색 파라미터(ef / nprobe) 자동 튜닝 스크립트
+python -m app.scripts.tune_search_params --collection h1234_1 [--collection ...] [--all] [--target-recall 0.95]
+
+1) 저장된 벡터를 reservoir 샘플링하여 pseudo-query로 사용 (1차 스캔)
+2) 전체 벡터와 brute-force 비교로 exact top-k(자기 자신 제외)를 계산 (2차 스캔)
+3) 인덱스 종류에 맞는 파라미터(HNSW: ef, IVF_*: nprobe)를 작은 값부터 올리며
+   실제 Collection.search의 recall@k와 질의 지연(p50/p95)을 측정
+4) 목표 recall을 만족하는 가장 작은 값을 Redis search:config:{collection}에 저장
+   (search 서비스가 요청에 ef/nprobe가 없을 때 사용, --dry-run이면 저장하지 않음)
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pymilvus import Collection, connections, utility
+from loguru import logger
+
+from app.core.settings import settings
+from app.service.search_cache_invalidator import collection_version_key
+
+VECTOR_FIELD = "vector"
+SIMILARITY_METRICS = {"COSINE", "IP"}
+EF_CANDIDATES = [16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512]
+NPROBE_CANDIDATES = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def search_config_key(collection_name: str) -> str:
+    """컬렉션 검색 설정 키 (search 서비스 app/service/search_config_service.py와 공유)"""
+    return f"search:config:{collection_name}"
+
+
+def _vector_index(collection: Collection) -> Tuple[str, str, Dict[str, Any]]:
+    """(index_type, metric_type, build params)"""
+    for index in collection.indexes:
+        if index.field_name == VECTOR_FIELD:
+            params = index.params or {}
+            build_params = params.get("params") or {}
+            if isinstance(build_params, str):
+                build_params = json.loads(build_params)
+            return str(params.get("index_type", "")).upper(), str(params.get("metric_type", "COSINE")).upper(), build_params
+    raise ValueError(f"Collection '{collection.name}' has no index on '{VECTOR_FIELD}'")
+
+
+def _iterate(collection: Collection, batch_size: int):
+    """(ids, vectors) 배치 순회"""
+    iterator = collection.query_iterator(batch_size=batch_size, output_fields=["id", VECTOR_FIELD])
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            yield (
+                np.asarray([row["id"] for row in batch], dtype=np.int64),
+                np.asarray([row[VECTOR_FIELD] for row in batch], dtype=np.float32),
+            )
+    finally:
+        iterator.close()
+
+
+def sample_queries(collection: Collection, num_queries: int, batch_size: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """reservoir 샘플링으로 pseudo-query(id, vector) 선택"""
+    rng = np.random.default_rng(seed)
+    ids: List[int] = []
+    vectors: List[np.ndarray] = []
+    seen = 0
+    for batch_ids, batch_vectors in _iterate(collection, batch_size):
+        for row_id, vector in zip(batch_ids, batch_vectors):
+            seen += 1
+            if len(ids) < num_queries:
+                ids.append(int(row_id))
+                vectors.append(vector)
+            else:
+                slot = int(rng.integers(0, seen))
+                if slot < num_queries:
+                    ids[slot] = int(row_id)
+                    vectors[slot] = vector
+    return np.asarray(ids, dtype=np.int64), np.asarray(vectors, dtype=np.float32)
+
+
+def _scores(queries: np.ndarray, vectors: np.ndarray, metric: str) -> np.ndarray:
+    """정렬 기준 점수 (작을수록 가까움)"""
+    if metric == "COSINE":
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return -(queries @ (vectors / np.maximum(norms, 1e-12)).T)
+    if metric == "IP":
+        return -(queries @ vectors.T)
+    return (
+        (queries ** 2).sum(axis=1, keepdims=True)
+        - 2 * queries @ vectors.T
+        + (vectors ** 2).sum(axis=1)[None, :]
+    )
+
+
+def exact_top_k(collection: Collection, query_ids: np.ndarray, queries: np.ndarray, k: int, metric: str, batch_size: int) -> List[set]:
+    """전체 스캔 brute-force top-k id 집합 (pseudo-query 자신 제외)"""
+    if metric == "COSINE":
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    best_scores = np.full((len(queries), k), np.inf, dtype=np.float32)
+    best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+    for batch_ids, batch_vectors in _iterate(collection, batch_size):
+        scores = _scores(queries, batch_vectors, metric).astype(np.float32)
+        scores[query_ids[:, None] == batch_ids[None, :]] = np.inf
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, np.broadcast_to(batch_ids, scores.shape)], axis=1)
+        order = np.argpartition(merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, order, axis=1)
+        best_ids = np.take_along_axis(merged_ids, order, axis=1)
+    return [set(int(i) for i in row if i >= 0) for row in best_ids]
+
+
+def measure(collection: Collection, query_ids: np.ndarray, queries: np.ndarray, truth: List[set], k: int, metric: str, param_name: str, value: int) -> Dict[str, Any]:
+    """단일 파라미터 값의 recall@k / 지연 측정 (질의 1건씩 실행)"""
+    latencies: List[float] = []
+    recalls: List[float] = []
+    search_param = {"metric_type": metric, "params": {param_name: value}}
+    for query_id, query, expected in zip(query_ids, queries, truth):
+        started = time.perf_counter()
+        hits = collection.search(data=[query.tolist()], anns_field=VECTOR_FIELD, param=search_param, limit=k + 1)[0]
+        latencies.append((time.perf_counter() - started) * 1000)
+        found = [hit.id for hit in hits if hit.id != query_id][:k]
+        if expected:
+            recalls.append(len(expected.intersection(found)) / len(expected))
+    return {
+        param_name: value,
+        f"recall@{k}": float(np.mean(recalls)) if recalls else 0.0,
+        "p50Ms": float(np.percentile(latencies, 50)),
+        "p95Ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def tune_collection(name: str, args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """컬렉션 하나 튜닝 (튜닝 대상 인덱스가 아니면 None)"""
+    collection = Collection(name)
+    collection.load()
+    index_type, metric, build_params = _vector_index(collection)
+    if index_type == "HNSW":
+        param_name, candidates = "ef", [v for v in EF_CANDIDATES if v >= args.k + 1]
+    elif index_type.startswith("IVF"):
+        nlist = int(build_params.get("nlist", max(NPROBE_CANDIDATES)))
+        param_name, candidates = "nprobe", [v for v in NPROBE_CANDIDATES if v <= nlist]
+    else:
+        logger.info(f"'{name}' uses {index_type or 'no'} index, nothing to tune")
+        return None
+
+    query_ids, queries = sample_queries(collection, args.queries, args.batch_size, args.seed)
+    if len(query_ids) == 0 or collection.num_entities <= args.k:
+        logger.info(f"'{name}' has too few vectors ({collection.num_entities}), skipping")
+        return None
+    logger.info(f"[{name}] {index_type}/{metric}: computing exact top-{args.k} for {len(query_ids)} queries")
+    truth = exact_top_k(collection, query_ids, queries, args.k, metric, args.batch_size)
+
+    sweep: List[Dict[str, Any]] = []
+    selected: Optional[Dict[str, Any]] = None
+    for value in candidates:
+        result = measure(collection, query_ids, queries, truth, args.k, metric, param_name, value)
+        sweep.append(result)
+        logger.info(
+            f"[{name}] {param_name}={value} recall@{args.k}={result[f'recall@{args.k}']:.4f} "
+            f"p50={result['p50Ms']:.2f}ms p95={result['p95Ms']:.2f}ms"
+        )
+        if result[f"recall@{args.k}"] >= args.target_recall:
+            selected = result
+            break
+    if selected is None:
+        # 목표 미달이면 가장 큰 값 사용
+        selected = sweep[-1]
+        logger.warning(f"[{name}] target recall {args.target_recall} not reached, using {param_name}={selected[param_name]}")
+
+    config = {
+        param_name: selected[param_name],
+        "recall": selected[f"recall@{args.k}"],
+        "k": args.k,
+        "targetRecall": args.target_recall,
+        "indexType": index_type,
+        "numEntities": collection.num_entities,
+        "tunedAt": int(time.time()),
+    }
+    return {"collection": name, "config": config, "sweep": sweep}
+
+
+def save_config(client, collection_name: str, config: Dict[str, Any]) -> None:
+    """검색 설정 저장 후 캐시된 검색 결과 무효화"""
+    client.set(search_config_key(collection_name), json.dumps(config))
+    client.incr(collection_version_key(collection_name))
+    logger.info(f"Saved search config for '{collection_name}': {config}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="컬렉션별 ef/nprobe 자동 튜닝")
+    parser.add_argument("--collection", action="append", default=[], help="대상 컬렉션 (여러 번 지정 가능)")
+    parser.add_argument("--all", action="store_true", help="모든 컬렉션 대상")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--queries", type=int, default=200, help="pseudo-query 개수")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="목표 recall@k")
+    parser.add_argument("--batch-size", type=int, default=2000, help="query_iterator 배치 크기")
+    parser.add_argument("--seed", type=int, default=42, help="샘플링 시드")
+    parser.add_argument("--dry-run", action="store_true", help="측정만 하고 저장하지 않음")
+    parser.add_argument("--output", default=None, help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    connections.connect(alias="default", host=settings.milvus_host, port=settings.milvus_port)
+    names = list(args.collection)
+    if args.all:
+        names += [
+            name for name in utility.list_collections()
+            if not name.endswith(("__v1", "__v2")) and "__raw_" not in name
+        ]
+    if not names:
+        parser.error("--collection or --all is required")
+
+    client = None
+    if not args.dry_run:
+        import redis
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            username=settings.redis_username,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+
+    report: List[Dict[str, Any]] = []
+    failed = 0
+    for name in dict.fromkeys(names):
+        try:
+            result = tune_collection(name, args)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Tuning failed for '{name}': {e}")
+            continue
+        if result is None:
+            continue
+        report.append(result)
+        if client is not None:
+            save_config(client, name, result["config"])
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+컬렉션 저장 레이아웃
+- per_offer: 오퍼마다 h{offerNo}_{version} / h{offerNo}_image_{version} 컬렉션 생성 (기존 방식)
+- partition_key: 모델(텍스트/이미지)·버전별 공유 컬렉션 {prefix}_{version} / {prefix}_image_{version} 하나에
+  offer_no 필드(Milvus partition key)로 오퍼를 구분 (오퍼 수만큼 인덱스 빌드/load/세그먼트가 늘어나지 않음)
+
+인제스트/백엔드가 사용하는 논리 컬렉션 이름(h{offerNo}_...)은 그대로 두고 Milvus 접근 직전에 실제 컬렉션으로 변환합니다.
+publicRetina_* 등 오퍼 컬렉션 형식이 아닌 이름은 레이아웃과 무관하게 그대로 사용합니다.
+(search 서비스의 app/service/collection_layout.py와 같은 규칙이어야 합니다)
+"""
+import json
+import re
+from typing import NamedTuple, Optional
+
+from app.core.settings import settings
+
+LAYOUT_PER_OFFER = "per_offer"
+LAYOUT_PARTITION_KEY = "partition_key"
+OFFER_FIELD = "offer_no"
+OFFER_COLLECTION_PATTERN = re.compile(r"^h(?P<offer_no>[^_]+)(?P<image>_image)?_(?P<version>\d+)$")
+
+
+class CollectionTarget(NamedTuple):
+    """실제 Milvus 컬렉션과 오퍼 조건 (per_offer 레이아웃이면 offer_no는 None)"""
+
+    name: str
+    offer_no: Optional[str] = None
+
+    @property
+    def expr(self) -> str:
+        """오퍼 조건 expression (partition key 필드이므로 해당 파티션만 검색)"""
+        return f"{OFFER_FIELD} == {json.dumps(self.offer_no)}" if self.offer_no else ""
+
+
+def parse_offer_collection(collection_name: str) -> Optional[dict]:
+    """h{offerNo}[_image]_{version} 형식이면 {"offer_no", "image", "version"} 반환"""
+    match = OFFER_COLLECTION_PATTERN.match(collection_name or "")
+    if not match:
+        return None
+    return {
+        "offer_no": match.group("offer_no"),
+        "image": bool(match.group("image")),
+        "version": int(match.group("version")),
+    }
+
+
+def shared_collection_name(version: int, image: bool = False) -> str:
+    """partition_key 레이아웃의 공유 컬렉션 이름"""
+    return f"{settings.shared_collection_prefix}{'_image' if image else ''}_{version}"
+
+
+def resolve_collection(collection_name: str, layout: Optional[str] = None) -> CollectionTarget:
+    """
+    논리 컬렉션 이름 → 실제 컬렉션
+
+    Args:
+        collection_name: 인제스트가 전달한 컬렉션 이름
+        layout: 레이아웃 (없으면 settings.collection_layout)
+    """
+    if (layout or settings.collection_layout) != LAYOUT_PARTITION_KEY:
+        return CollectionTarget(collection_name)
+    parsed = parse_offer_collection(collection_name)
+    if parsed is None:
+        return CollectionTarget(collection_name)
+    return CollectionTarget(shared_collection_name(parsed["version"], parsed["image"]), parsed["offer_no"])
@@ -0,0 +1,649 @@
+"""
+로컬 벡터 저장소 (Milvus 없이 단일 노드 배포 / 부하 테스트용)
+컬렉션마다 디렉터리 하나를 사용합니다.
+    meta.json       : dim, metric
+    vectors.f32     : float32 행 벡터 (행 번호 = id), 검색 시 np.memmap으로 매핑
+    scalars.sqlite  : 스칼라 필드 사이드카 (id, partition, file_no, text, metadata, v2 스칼라 필드, deleted)
+                      + state 테이블 (compaction 세대 번호)
+    hnsw.bin        : hnswlib 인덱스 (선택, hnswlib가 설치된 경우에만 생성)
+    compaction 이후에는 세대별 vectors.{세대}.f32 / hnsw.{세대}.bin 을 사용합니다.
+쓰기는 .lock 파일 잠금 아래에서 벡터 추가 → SQLite 커밋 순서로 수행하고, 읽기는 SQLite에 커밋된 행만
+보므로 쓰기 도중의 벡터는 검색되지 않습니다. 삭제는 deleted 플래그로 표시(soft delete)하고,
+삭제 비율이 임계값을 넘으면 compact()가 삭제 행을 제거하고 id를 다시 매긴 새 세대 파일로 교체합니다
+(읽기 도중 세대가 바뀌면 검색을 다시 수행).
+hnsw 인덱스에 없는 꼬리 행(hnswlib 없이 추가된 행 등)은 전수 비교로 보완합니다.
+이 모듈은 embedding-repo가 원본이며 search-repo에 같은 내용으로 복사되어 있습니다
+(서비스마다 빌드 컨텍스트가 달라 패키지로 공유할 수 없음). 수정 후
+embedding-repo에서 python -m app.scripts.sync_local_vector_store 로 복사하고, --check로 차이를 확인합니다.
+"""
+import fcntl
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from app.core.settings import settings
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    hnswlib = None
+    HNSWLIB_AVAILABLE = False
+
+META_FILE = "meta.json"
+VECTOR_FILE = "vectors.f32"
+SCALAR_FILE = "scalars.sqlite"
+INDEX_FILE = "hnsw.bin"
+LOCK_FILE = ".lock"
+
+DEFAULT_PARTITION = "_default"
+SIMILARITY_METRICS = {"COSINE", "IP"}
+HNSW_SPACES = {"COSINE": "cosine", "IP": "ip", "L2": "l2"}
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+SCAN_CHUNK_ROWS = 65536
+SQL_IN_CHUNK = 900
+
+SCALAR_COLUMNS = (
+    "partition", "file_no", "text", "metadata",
+    "page", "chunk_id", "file_name", "category", "modality", "created_at",
+)
+HIT_COLUMNS = ("id",) + SCALAR_COLUMNS
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS rows (
+    id INTEGER PRIMARY KEY,
+    partition TEXT NOT NULL DEFAULT '_default',
+    file_no TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL DEFAULT '',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    page INTEGER NOT NULL DEFAULT 0,
+    chunk_id TEXT NOT NULL DEFAULT '',
+    file_name TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    modality TEXT NOT NULL DEFAULT 'text',
+    created_at INTEGER NOT NULL DEFAULT 0,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_rows_file_no ON rows(file_no);
+CREATE INDEX IF NOT EXISTS idx_rows_partition ON rows(partition);
+CREATE INDEX IF NOT EXISTS idx_rows_category ON rows(category);
+CREATE INDEX IF NOT EXISTS idx_rows_created_at ON rows(created_at);
+CREATE TABLE IF NOT EXISTS partitions (name TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+STATE_SQL = "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+SEARCH_ATTEMPTS = 3
+
+
+def _vector_file(generation: int) -> str:
+    return VECTOR_FILE if generation == 0 else f"vectors.{generation}.f32"
+
+
+def _index_file(generation: int) -> str:
+    return INDEX_FILE if generation == 0 else f"hnsw.{generation}.bin"
+
+
+def _generation(conn: sqlite3.Connection) -> int:
+    """현재 compaction 세대 (state 테이블이 없는 이전 형식은 0)"""
+    try:
+        row = conn.execute("SELECT value FROM state WHERE key = 'generation'").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return int(row[0]) if row else 0
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _scores(matrix: np.ndarray, query: np.ndarray, metric: str) -> np.ndarray:
+    """Milvus와 같은 의미의 점수 (COSINE/IP: 클수록 유사, L2: 제곱 거리)"""
+    if metric in SIMILARITY_METRICS:
+        return matrix @ query
+    diff = matrix - query
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+def _top(ids: np.ndarray, scores: np.ndarray, k: int, metric: str) -> List[Tuple[int, float]]:
+    """점수 기준 상위 k개 (id, score)"""
+    if k <= 0 or len(scores) == 0:
+        return []
+    order_scores = -scores if metric in SIMILARITY_METRICS else scores
+    if len(scores) > k:
+        part = np.argpartition(order_scores, k - 1)[:k]
+    else:
+        part = np.arange(len(scores))
+    part = part[np.argsort(order_scores[part], kind="stable")]
+    return [(int(ids[i]), float(scores[i])) for i in part]
+
+
+def _merge(hits: List[Tuple[int, float]], metric: str) -> List[Tuple[int, float]]:
+    """id 중복 제거 후 점수순 정렬"""
+    best: Dict[int, float] = {}
+    for row_id, score in hits:
+        if row_id not in best:
+            best[row_id] = score
+    return sorted(best.items(), key=lambda item: -item[1] if metric in SIMILARITY_METRICS else item[1])
+
+
+def _where_sql(
+    partition: Optional[str] = None,
+    file_nos: Optional[Sequence[str]] = None,
+    categories: Optional[Sequence[str]] = None,
+    created_from: Optional[int] = None,
+    created_to: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+    """스칼라 조건 → SQL WHERE 절 (조건이 없으면 빈 문자열)"""
+    clauses: List[str] = []
+    params: List[Any] = []
+    if partition:
+        clauses.append("partition = ?")
+        params.append(partition)
+    for column, values in (("file_no", file_nos), ("category", categories)):
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(str(v) for v in values)
+    if created_from is not None:
+        clauses.append("created_at >= ?")
+        params.append(int(created_from))
+    if created_to is not None:
+        clauses.append("created_at <= ?")
+        params.append(int(created_to))
+    return " AND ".join(clauses), params
+
+
+class LocalCollection:
+    """로컬 컬렉션 한 개 (디렉터리 단위, 프로세스 간 공유 가능)"""
+
+    def __init__(self, root_dir: str, name: str):
+        self.name = name
+        self.path = os.path.join(root_dir, name)
+        self._lock = threading.RLock()
+        self._meta: Optional[Dict[str, Any]] = None
+        self._vectors: Optional[np.memmap] = None
+        self._vectors_key: Optional[Tuple[str, int, int]] = None
+        self._index = None
+        self._index_key: Optional[Tuple[str, int]] = None
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._file(META_FILE))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._file(SCALAR_FILE), timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """프로세스 간 쓰기 잠금 (embedding/backend 서비스가 같은 디렉터리를 쓸 수 있음)"""
+        with open(self._file(LOCK_FILE), "a+") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    # ---- 메타 / 생성 ----
+
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            if not self.exists():
+                raise ValueError(f"Collection '{self.name}' does not exist")
+            with open(self._file(META_FILE), encoding="utf-8") as f:
+                self._meta = json.load(f)
+        return self._meta
+
+    @property
+    def dim(self) -> int:
+        return int(self.meta()["dim"])
+
+    @property
+    def metric(self) -> str:
+        return str(self.meta().get("metric", "COSINE")).upper()
+
+    def create(self, dim: int, metric: str = "COSINE") -> bool:
+        """
+        컬렉션 생성 (이미 있으면 아무것도 하지 않음)
+
+        Returns:
+            새로 생성했는지 여부
+        """
+        metric = metric.upper()
+        if metric not in HNSW_SPACES:
+            raise ValueError(f"Unsupported metric for local vector store: {metric}")
+        os.makedirs(self.path, exist_ok=True)
+        with self._write_lock():
+            if self.exists():
+                return False
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA_SQL)
+            open(self._file(VECTOR_FILE), "ab").close()
+            tmp_path = self._file(META_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": int(dim), "metric": metric, "format": 1}, f)
+            os.replace(tmp_path, self._file(META_FILE))
+        logger.info(f"[LocalVectorStore] Created collection '{self.name}' (dim={dim}, metric={metric})")
+        return True
+
+    def ensure_partition(self, partition: str) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO partitions (name) VALUES (?)", (partition,))
+
+    def partitions(self) -> List[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT name FROM partitions ORDER BY name")]
+
+    # ---- 쓰기 ----
+
+    def insert(self, vectors: Sequence[Sequence[float]], rows: List[Dict[str, Any]], partition: Optional[str] = None) -> List[int]:
+        """
+        벡터와 스칼라 필드 삽입
+
+        Args:
+            vectors: 벡터 리스트 (dim 길이)
+            rows: SCALAR_COLUMNS 키를 가진 딕셔너리 리스트 (없는 키는 기본값)
+            partition: 파티션 이름 (없으면 _default)
+
+        Returns:
+            부여된 id 리스트
+        """
+        if len(vectors) != len(rows):
+            raise ValueError("vectors and rows must have the same length")
+        if not rows:
+            return []
+        dim = self.dim
+        data = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32).reshape(len(rows), dim))
+        if self.metric == "COSINE":
+            data = _normalize(data).astype(np.float32)
+        partition = partition or DEFAULT_PARTITION
+
+        with self._write_lock():
+            with self._connect() as conn:
+                generation = _generation(conn)
+                start = conn.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM rows").fetchone()[0]
+                with open(self._file(_vector_file(generation)), "r+b") as f:
+                    # 이전 쓰기가 중단되어 남은 (커밋되지 않은) 꼬리 벡터 제거 후 추가
+                    f.truncate(start * dim * 4)
+                    f.seek(0, os.SEEK_END)
+                    f.write(data.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                ids = list(range(start, start + len(rows)))
+                values = []
+                for row_id, row in zip(ids, rows):
+                    values.append((
+                        row_id, partition,
+                        str(row.get("file_no") or ""), str(row.get("text") or ""), str(row.get("metadata") or "{}"),
+                        int(row.get("page") or 0), str(row.get("chunk_id") or ""), str(row.get("file_name") or ""),
+                        str(row.get("category") or ""), str(row.get("modality") or "text"), int(row.get("created_at") or 0),
+                    ))
+                conn.execute("INSERT OR IGNORE INTO partitions (name) VALUES (?)", (partition,))
+                conn.executemany(
+                    f"INSERT INTO rows (id, {', '.join(SCALAR_COLUMNS)}) VALUES ({', '.join('?' for _ in HIT_COLUMNS)})",
+                    values,
+                )
+            self._update_index(start + len(rows), generation)
+        return ids
+
+    def _update_index(self, total: int, generation: int) -> None:
+        """hnsw 인덱스에 아직 없는 행을 추가하고 원자적으로 교체 (쓰기 잠금 안에서 호출)"""
+        if not HNSWLIB_AVAILABLE or total == 0:
+            return
+        index_path = self._file(_index_file(generation))
+        index = hnswlib.Index(space=HNSW_SPACES[self.metric], dim=self.dim)
+        if os.path.exists(index_path):
+            index.load_index(index_path, max_elements=total)
+        else:
+            index.init_index(max_elements=max(total, 1024), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        indexed = index.get_current_count()
+        if indexed >= total:
+            return
+        if index.get_max_elements() < total:
+            index.resize_index(max(total, index.get_max_elements() * 2))
+        vectors = self._map_vectors(total, generation)
+        for begin in range(indexed, total, SCAN_CHUNK_ROWS):
+            end = min(begin + SCAN_CHUNK_ROWS, total)
+            index.add_items(np.asarray(vectors[begin:end]), np.arange(begin, end))
+        tmp_path = index_path + ".tmp"
+        index.save_index(tmp_path)
+        os.replace(tmp_path, index_path)
+        logger.info(f"[LocalVectorStore] Indexed rows {indexed}..{total - 1} of '{self.name}'")
+
+    def delete(self, file_nos: Sequence[str], partition: Optional[str] = None) -> int:
+        """file_no 기준 soft delete, 삭제 표시된 행 수 반환"""
+        where, params = _where_sql(partition=partition, file_nos=file_nos)
+        if not where:
+            raise ValueError("delete requires at least one file_no")
+        with self._write_lock(), self._connect() as conn:
+            return conn.execute(f"UPDATE rows SET deleted = 1 WHERE deleted = 0 AND {where}", params).rowcount
+
+    def deleted_stats(self) -> Tuple[int, int]:
+        """(저장된 전체 행 수, 삭제 표시된 행 수)"""
+        with self._connect() as conn:
+            total, deleted = conn.execute("SELECT COUNT(*), COALESCE(SUM(deleted), 0) FROM rows").fetchone()
+        return int(total), int(deleted)
+
+    def maybe_compact(self, deleted_ratio: float, min_deleted_rows: int = 1) -> bool:
+        """삭제 행 수/비율이 임계값 이상이면 compact (수행 여부 반환)"""
+        total, deleted = self.deleted_stats()
+        if deleted < max(min_deleted_rows, 1) or deleted < deleted_ratio * total:
+            return False
+        self.compact()
+        return True
+
+    def compact(self) -> Dict[str, int]:
+        """
+        삭제 표시된 행 제거 (쓰기 잠금 아래에서 수행)
+
+        살아 있는 행의 벡터를 새 세대 파일에 0부터 다시 번호를 매겨 복사하고 hnsw 인덱스를 새로 만든 뒤,
+        SQLite 트랜잭션 하나로 행 id 재배정 + 세대 번호 변경을 커밋합니다.
+        이전 세대 파일은 커밋 후 삭제합니다 (이미 매핑한 읽기는 계속 동작, 세대가 바뀐 읽기는 재시도).
+
+        Returns:
+            {"removed": 제거한 행 수, "rows": 남은 행 수, "generation": 현재 세대}
+        """
+        dim = self.dim
+        with self._write_lock():
+            with self._connect() as conn:
+                conn.execute(STATE_SQL)
+                generation = _generation(conn)
+                total = conn.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM rows").fetchone()[0]
+                live = np.fromiter(
+                    (row[0] for row in conn.execute("SELECT id FROM rows WHERE deleted = 0 ORDER BY id")),
+                    dtype=np.int64,
+                )
+            if len(live) == total:
+                return {"removed": 0, "rows": int(total), "generation": generation}
+
+            new_generation = generation + 1
+            vector_path = self._file(_vector_file(new_generation))
+            vectors = self._map_vectors(total, generation)
+            with open(vector_path + ".tmp", "wb") as f:
+                for begin in range(0, len(live), SCAN_CHUNK_ROWS):
+                    chunk = np.asarray(vectors[live[begin:begin + SCAN_CHUNK_ROWS]], dtype=np.float32).reshape(-1, dim)
+                    f.write(np.ascontiguousarray(chunk).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(vector_path + ".tmp", vector_path)
+            self._update_index(len(live), new_generation)
+
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM rows WHERE deleted = 1")
+                # PRIMARY KEY 충돌을 피하려고 음수로 옮긴 뒤 양수로 되돌림 (새 id <= 기존 id)
+                conn.executemany(
+                    "UPDATE rows SET id = ? WHERE id = ?",
+                    ((-1 - new_id, int(old_id)) for new_id, old_id in enumerate(live)),
+                )
+                conn.execute("UPDATE rows SET id = -1 - id")
+                conn.execute(
+                    "INSERT INTO state (key, value) VALUES ('generation', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (new_generation,),
+                )
+            for name in (_vector_file(generation), _index_file(generation)):
+                try:
+                    os.remove(self._file(name))
+                except FileNotFoundError:
+                    pass
+        removed = int(total - len(live))
+        logger.info(
+            f"[LocalVectorStore] Compacted '{self.name}': removed {removed} deleted rows, "
+            f"{len(live)} rows remain (generation {new_generation})"
+        )
+        return {"removed": removed, "rows": int(len(live)), "generation": new_generation}
+
+    # ---- 읽기 ----
+
+    def count(self, partition: Optional[str] = None) -> int:
+        where, params = _where_sql(partition=partition)
+        with self._connect() as conn:
+            sql = "SELECT COUNT(*) FROM rows WHERE deleted = 0" + (f" AND {where}" if where else "")
+            return int(conn.execute(sql, params).fetchone()[0])
+
+    def _map_vectors(self, total: int, generation: int) -> np.memmap:
+        """커밋된 행 수(total)만큼 세대의 벡터 파일을 memmap (파일 교체/확장 시 다시 매핑)"""
+        path = self._file(_vector_file(generation))
+        key = (path, os.stat(path).st_ino, total)
+        with self._lock:
+            if self._vectors is None or self._vectors_key != key:
+                self._vectors = np.memmap(path, dtype=np.float32, mode="r", shape=(total, self.dim))
+                self._vectors_key = key
+            return self._vectors
+
+    def _load_index(self, generation: int):
+        """세대의 hnsw 인덱스 로드 (파일이 갱신되었으면 다시 로드)"""
+        if not HNSWLIB_AVAILABLE:
+            return None
+        index_path = self._file(_index_file(generation))
+        try:
+            key = (index_path, os.stat(index_path).st_mtime_ns)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._index is None or self._index_key != key:
+                index = hnswlib.Index(space=HNSW_SPACES[self.metric], dim=self.dim)
+                index.load_index(index_path)
+                self._index = index
+                self._index_key = key
+            return self._index
+
+    def _scan(self, vectors: np.ndarray, query: np.ndarray, ids: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """ids 행 전수 비교 (청크 단위로 memmap에서 읽음)"""
+        hits: List[Tuple[int, float]] = []
+        for begin in range(0, len(ids), SCAN_CHUNK_ROWS):
+            chunk_ids = ids[begin:begin + SCAN_CHUNK_ROWS]
+            chunk = np.asarray(vectors[chunk_ids])
+            hits.extend(_top(chunk_ids, _scores(chunk, query, self.metric), k, self.metric))
+        return _merge(hits, self.metric)[:k]
+
+    def _ann(self, index, vectors: np.ndarray, query: np.ndarray, total: int, k: int, ef: Optional[int]) -> List[Tuple[int, float]]:
+        """hnsw 검색 + 인덱스에 없는 꼬리 행 전수 비교"""
+        indexed = min(index.get_current_count(), total) if index is not None else 0
+        hits: List[Tuple[int, float]] = []
+        if indexed:
+            k_index = min(k, indexed)
+            with self._lock:
+                # set_ef는 인덱스 전역 값이므로 질의와 함께 잠금
+                index.set_ef(max(ef or 64, k_index))
+                labels, distances = index.knn_query(query.reshape(1, -1), k=k_index)
+            for label, distance in zip(labels[0], distances[0]):
+                score = float(distance) if self.metric == "L2" else 1.0 - float(distance)
+                if int(label) < total:
+                    hits.append((int(label), score))
+        if indexed < total:
+            hits.extend(self._scan(vectors, query, np.arange(indexed, total), k))
+        return _merge(hits, self.metric)[:k]
+
+    def search(
+        self,
+        vector: Sequence[float],
+        limit: int,
+        partition: Optional[str] = None,
+        file_nos: Optional[Sequence[str]] = None,
+        categories: Optional[Sequence[str]] = None,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+        ef: Optional[int] = None,
+        exact_scan_max_rows: int = 20000,
+        with_vectors: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        벡터 검색
+
+        스칼라 조건이 있으면 SQLite에서 후보 id를 먼저 구하고,
+        후보가 exact_scan_max_rows 이하이면 해당 행만 전수 비교(pre-filter),
+        많으면 hnsw 검색 결과를 후보 집합으로 거르며 k를 2배씩 확장합니다.
+
+        Returns:
+            점수순 hit 리스트 ({id, score, partition, file_no, text, metadata, page, chunk_id,
+            file_name, category, modality, created_at}, with_vectors면 저장된 vector 포함)
+        """
+        for attempt in range(SEARCH_ATTEMPTS):
+            try:
+                hits = self._search(
+                    vector, limit, partition, file_nos, categories, created_from, created_to,
+                    ef, exact_scan_max_rows, with_vectors,
+                )
+            except FileNotFoundError:
+                # 세대 번호를 읽은 뒤 compaction이 이전 세대 파일을 지운 경우
+                hits = None
+            if hits is not None:
+                return hits
+            logger.debug(f"[LocalVectorStore] '{self.name}' was compacted during search, retrying ({attempt + 1})")
+        raise RuntimeError(f"Collection '{self.name}' kept changing during search")
+
+    def _search(
+        self,
+        vector: Sequence[float],
+        limit: int,
+        partition: Optional[str],
+        file_nos: Optional[Sequence[str]],
+        categories: Optional[Sequence[str]],
+        created_from: Optional[int],
+        created_to: Optional[int],
+        ef: Optional[int],
+        exact_scan_max_rows: int,
+        with_vectors: bool,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """search 1회 (중간에 compaction으로 세대가 바뀌면 None)"""
+        metric = self.metric
+        query = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        if metric == "COSINE":
+            query = _normalize(query).astype(np.float32)
+        where, params = _where_sql(partition, file_nos, categories, created_from, created_to)
+
+        with self._connect() as conn:
+            # 세대 번호와 행 목록을 같은 읽기 스냅숏에서 조회
+            conn.execute("BEGIN")
+            generation = _generation(conn)
+            total, deleted = conn.execute("SELECT COALESCE(MAX(id) + 1, 0), COALESCE(SUM(deleted), 0) FROM rows").fetchone()
+            allowed: Optional[np.ndarray] = None
+            if where:
+                allowed = np.fromiter(
+                    (row[0] for row in conn.execute(f"SELECT id FROM rows WHERE deleted = 0 AND {where}", params)),
+                    dtype=np.int64,
+                )
+        if total == 0 or limit <= 0 or (allowed is not None and len(allowed) == 0):
+            return []
+
+        vectors = self._map_vectors(total, generation)
+        index = self._load_index(generation)
+        if allowed is not None and (index is None or len(allowed) <= exact_scan_max_rows):
+            ranked = self._scan(vectors, query, allowed, limit)
+        elif allowed is not None:
+            allowed_set = set(allowed.tolist())
+            k = min(max(limit * total // max(len(allowed), 1), limit * 2), total)
+            while True:
+                ranked = [hit for hit in self._ann(index, vectors, query, total, k, ef) if hit[0] in allowed_set]
+                if len(ranked) >= limit or k >= total:
+                    break
+                k = min(k * 2, total)
+            ranked = ranked[:limit]
+        elif index is None:
+            ranked = self._scan(vectors, query, np.arange(total), limit + deleted)
+        else:
+            # 삭제 표시된 행 수만큼 더 가져와 삭제 행을 제외해도 limit 개 보장
+            ranked = self._ann(index, vectors, query, total, min(limit + deleted, total), ef)
+
+        rows = self._fetch_rows([row_id for row_id, _ in ranked], generation)
+        if rows is None:
+            return None
+        hits: List[Dict[str, Any]] = []
+        for row_id, score in ranked:
+            row = rows.get(row_id)
+            if row is None:
+                continue
+            hits.append({**row, "score": score})
+            if len(hits) >= limit:
+                break
+        if with_vectors and hits:
+            stored = np.asarray(vectors[np.array([hit["id"] for hit in hits])])
+            for hit, stored_vector in zip(hits, stored):
+                hit["vector"] = stored_vector.tolist()
+        return hits
+
+    def _fetch_rows(self, ids: List[int], generation: int) -> Optional[Dict[int, Dict[str, Any]]]:
+        """삭제되지 않은 행의 스칼라 필드 조회 (그 사이 compaction으로 세대가 바뀌었으면 None)"""
+        rows: Dict[int, Dict[str, Any]] = {}
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            if _generation(conn) != generation:
+                return None
+            for begin in range(0, len(ids), SQL_IN_CHUNK):
+                chunk = ids[begin:begin + SQL_IN_CHUNK]
+                cursor = conn.execute(
+                    f"SELECT {', '.join(HIT_COLUMNS)} FROM rows WHERE deleted = 0 AND id IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                )
+                for values in cursor:
+                    rows[values[0]] = dict(zip(HIT_COLUMNS, values))
+        return rows
+
+
+class LocalVectorStore:
+    """로컬 컬렉션 디렉터리 모음"""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+        self._collections: Dict[str, LocalCollection] = {}
+
+    def collection(self, name: str) -> LocalCollection:
+        """컬렉션 핸들 (존재 여부와 무관, 메모리 매핑/인덱스 캐시를 위해 재사용)"""
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = LocalCollection(self.root_dir, name)
+            return self._collections[name]
+
+    def has_collection(self, name: str) -> bool:
+        return self.collection(name).exists()
+
+    def get_collection(self, name: str) -> LocalCollection:
+        """존재하는 컬렉션 반환 (없으면 ValueError)"""
+        collection = self.collection(name)
+        if not collection.exists():
+            raise ValueError(f"Collection '{name}' does not exist")
+        return collection
+
+    def drop_collection(self, name: str) -> None:
+        """컬렉션 디렉터리와 캐시된 핸들 삭제"""
+        with self._lock:
+            self._collections.pop(name, None)
+        shutil.rmtree(os.path.join(self.root_dir, name), ignore_errors=True)
+
+    def list_collections(self) -> List[str]:
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root_dir)
+            if os.path.exists(os.path.join(self.root_dir, name, META_FILE))
+        )
+
+
+# 싱글톤 인스턴스
+_local_vector_store: Optional[LocalVectorStore] = None
+
+
+def get_local_vector_store() -> LocalVectorStore:
+    """LocalVectorStore 싱글톤 인스턴스 반환 (settings.local_vector_store_path)"""
+    global _local_vector_store
+    if _local_vector_store is None:
+        _local_vector_store = LocalVectorStore(settings.local_vector_store_path)
+    return _local_vector_store
@@ -0,0 +1,94 @@
+"""
+로컬 벡터 저장소 백엔드 (vector_store_backend=local)
+MilvusService와 같은 인터페이스로 app/service/local_vector_store.py 디렉터리 형식에 저장합니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.settings import settings
+from app.service.local_vector_store import LocalCollection, get_local_vector_store
+from app.service.vector_store import VectorStore, prepare_rows
+
+
+class LocalVectorStoreService(VectorStore):
+    """로컬 컬렉션 관리 및 데이터 삽입 서비스"""
+
+    def __init__(self):
+        self.store = get_local_vector_store()
+
+    def ensure_collection(self, collection_name: str, vector_dim: int = 1024, sparse: bool = False) -> Tuple[LocalCollection, bool]:
+        """
+        컬렉션이 존재하는지 확인하고, 없으면 생성
+
+        sparse는 무시됩니다 (로컬 저장소는 hybrid 검색을 지원하지 않음).
+
+        Returns:
+            (LocalCollection, is_newly_created: bool) 튜플
+        """
+        collection = self.store.collection(collection_name)
+        is_newly_created = collection.create(vector_dim, settings.local_vector_store_metric)
+        if not is_newly_created and collection.dim != vector_dim:
+            raise ValueError(
+                f"Collection '{collection_name}' has dim={collection.dim}, but got vectors with dim={vector_dim}"
+            )
+        if sparse and is_newly_created:
+            logger.info(f"Sparse vectors are not stored in local collection '{collection_name}'")
+        return collection, is_newly_created
+
+    def ensure_partitions(self, collection_name: str, partitions: List[str]) -> None:
+        """컬렉션에 필요한 파티션이 없으면 생성"""
+        collection = self.store.get_collection(collection_name)
+        for p in partitions or []:
+            collection.ensure_partition(p)
+
+    def insert_embeddings(
+        self,
+        collection_name: str,
+        embeddings: List[Dict[str, Any]],
+        vector_dim: int = 1024,
+        partition_name: Optional[str] = None,
+        sparse: bool = False,
+        modality: str = "text"
+    ) -> bool:
+        """
+        임베딩 데이터를 로컬 컬렉션에 삽입 (인자는 MilvusService.insert_embeddings와 같음)
+
+        Returns:
+            성공 여부
+        """
+        try:
+            collection, _ = self.ensure_collection(collection_name, vector_dim, sparse=sparse)
+            columns = prepare_rows(embeddings, vector_dim, modality)
+            vectors = columns.pop("vector")
+            rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+            collection.insert(vectors, rows, partition=partition_name)
+            logger.info(f"Inserted {len(embeddings)} embeddings into local collection '{collection_name}'")
+            # 삭제(soft delete)가 쌓인 컬렉션은 삽입 시점에 정리 (검색 over-fetch 방지, 실패해도 삽입은 성공)
+            try:
+                if collection.maybe_compact(
+                    settings.maintenance_compact_deleted_ratio,
+                    settings.maintenance_compact_min_deleted_rows,
+                ):
+                    logger.info(f"Compacted local collection '{collection_name}'")
+            except Exception as e:
+                logger.warning(f"Failed to compact local collection '{collection_name}': {e}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to insert embeddings into local vector store: {str(e)}", exc_info=True)
+            raise
+
+    def get_collection_stats(self, collection_name: str) -> Dict[str, Any]:
+        """컬렉션 통계 정보 조회"""
+        try:
+            if not self.store.has_collection(collection_name):
+                return {"exists": False}
+            num_entities = self.store.get_collection(collection_name).count()
+            return {
+                "exists": True,
+                "num_entities": num_entities,
+                "is_empty": num_entities == 0,
+            }
+        except Exception as e:
+            logger.error(f"Failed to get collection stats: {str(e)}")
+            return {"error": str(e)}
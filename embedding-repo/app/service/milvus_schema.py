@@ -0,0 +1,130 @@
+"""
+Milvus 컬렉션 스키마 정의
+- v1: id, file_no, text, vector, metadata(JSON 문자열)
+- v2: v1 + 타입이 있는 스칼라 필드(page, chunk_id, file_name, category, modality, created_at)와 스칼라 인덱스
+      metadata JSON은 응답 호환을 위해 유지하고, 필터는 스칼라 필드로 Milvus 내부에서 수행
+- partition_key 레이아웃 공유 컬렉션은 버전과 무관하게 offer_no(partition key) 필드 추가
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from pymilvus import DataType, FieldSchema
+
+from app.service.collection_layout import OFFER_FIELD
+
+SPARSE_FIELD = "sparse_vector"
+V2_MARKER_FIELD = "modality"
+
+DEFAULT_VECTOR_INDEX = {
+    "metric_type": "COSINE",
+    "index_type": "HNSW",
+    "params": {"M": 16, "efConstruction": 200},
+}
+SPARSE_INDEX = {
+    "metric_type": "IP",
+    "index_type": "SPARSE_INVERTED_INDEX",
+    "params": {"drop_ratio_build": 0.0},
+}
+# 카디널리티가 낮은 필드는 BITMAP, 나머지는 INVERTED / STL_SORT
+SCALAR_INDEXES_V2 = {
+    "file_no": "INVERTED",
+    "page": "STL_SORT",
+    "chunk_id": "INVERTED",
+    "file_name": "INVERTED",
+    "category": "BITMAP",
+    "modality": "BITMAP",
+    "created_at": "STL_SORT",
+}
+
+
+def build_fields(schema_version: int, vector_dim: int, sparse: bool = False, partition_key: bool = False) -> List[FieldSchema]:
+    """스키마 버전에 맞는 필드 목록 생성 (partition_key면 offer_no partition key 필드 포함)"""
+    fields = [
+        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+        FieldSchema(name="file_no", dtype=DataType.VARCHAR, max_length=36),
+        FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535),
+        FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=vector_dim),
+        FieldSchema(name="metadata", dtype=DataType.VARCHAR, max_length=65535),
+    ]
+    if schema_version >= 2:
+        fields += [
+            FieldSchema(name="page", dtype=DataType.INT64),
+            FieldSchema(name="chunk_id", dtype=DataType.VARCHAR, max_length=64),
+            FieldSchema(name="file_name", dtype=DataType.VARCHAR, max_length=512),
+            FieldSchema(name="category", dtype=DataType.VARCHAR, max_length=128),
+            FieldSchema(name="modality", dtype=DataType.VARCHAR, max_length=16),
+            FieldSchema(name="created_at", dtype=DataType.INT64),
+        ]
+    if sparse:
+        fields.append(FieldSchema(name=SPARSE_FIELD, dtype=DataType.SPARSE_FLOAT_VECTOR))
+    if partition_key:
+        fields.append(FieldSchema(name=OFFER_FIELD, dtype=DataType.VARCHAR, max_length=64, is_partition_key=True))
+    return fields
+
+
+def create_scalar_indexes(collection) -> None:
+    """v2 스칼라 필드 인덱스 생성"""
+    for field_name, index_type in SCALAR_INDEXES_V2.items():
+        collection.create_index(field_name=field_name, index_params={"index_type": index_type}, index_name=f"idx_{field_name}")
+
+
+def has_partition_key(collection) -> bool:
+    """컬렉션이 offer_no partition key 공유 컬렉션인지 확인"""
+    return any(field.name == OFFER_FIELD and getattr(field, "is_partition_key", False) for field in collection.schema.fields)
+
+
+def is_v2(collection) -> bool:
+    """컬렉션이 v2 스키마인지 확인"""
+    return any(field.name == V2_MARKER_FIELD for field in collection.schema.fields)
+
+
+def _to_epoch(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return 0
+        # CREATED_AT은 datetime.utcnow().isoformat() (timezone 없음) → UTC로 해석
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    return 0
+
+
+def _to_int(value: Any, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def typed_values(metadata: Any, modality: str, category: str = "") -> Dict[str, Any]:
+    """
+    metadata(JSON 문자열 또는 딕셔너리)에서 v2 스칼라 필드 값 추출
+
+    Args:
+        metadata: v1 metadata (FILE_NAME, PAGE_NO, INDEX_NO/chunk_id, CREATED_AT, CATEGORY)
+        modality: "text" 또는 "image"
+        category: 요청에서 지정한 카테고리 (없으면 metadata.CATEGORY)
+
+    Returns:
+        {page, chunk_id, file_name, category, modality, created_at}
+    """
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata) if metadata else {}
+        except ValueError:
+            metadata = {}
+    metadata = metadata if isinstance(metadata, dict) else {}
+    chunk_id = metadata.get("chunk_id", metadata.get("INDEX_NO", ""))
+    return {
+        "page": _to_int(metadata.get("PAGE_NO"), 0),
+        "chunk_id": "" if chunk_id is None else str(chunk_id)[:64],
+        "file_name": str(metadata.get("FILE_NAME") or "")[:512],
+        "category": str(category or metadata.get("CATEGORY") or "")[:128],
+        "modality": modality,
+        "created_at": _to_epoch(metadata.get("CREATED_AT")),
+    }
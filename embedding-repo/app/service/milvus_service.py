@@ -1,24 +1,27 @@
 from pymilvus import (
     connections,
     Collection,
-    FieldSchema,
     CollectionSchema,
-    DataType,
     utility
 )
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from loguru import logger
-import json
 
+from app.core.settings import settings
+from app.service.sparse_encoder import SparseEncoder
+from app.service.milvus_schema import SPARSE_FIELD, build_fields, create_scalar_indexes
+from app.service.collection_layout import OFFER_FIELD, resolve_collection
+from app.service.vector_store import VectorStore, prepare_rows
 
-class MilvusService:
+
+class MilvusService(VectorStore):
     """Milvus 컬렉션 관리 및 데이터 삽입 서비스"""
     
     def __init__(self, host: str = "localhost", port: int = 19530):
         self.host = host
         self.port = port
         self._connected = False
+        self._sparse_encoder: Optional[SparseEncoder] = None
     
     def connect(self):
         """Milvus 서버에 연결"""
@@ -35,18 +38,30 @@ class MilvusService:
                 logger.error(f"Failed to connect to Milvus: {str(e)}")
                 raise
     
-    def ensure_collection(self, collection_name: str, vector_dim: int = 1024) -> tuple[Collection, bool]:
+    def ensure_collection(
+        self,
+        collection_name: str,
+        vector_dim: int = 1024,
+        sparse: bool = False,
+        schema_version: Optional[int] = None
+    ) -> tuple[Collection, bool]:
         """
         컬렉션이 존재하는지 확인하고, 없으면 생성
+        partition_key 레이아웃이면 오퍼 컬렉션 이름을 공유 컬렉션(offer_no partition key)으로 변환합니다.
         
         Args:
-            collection_name: 컬렉션 이름
+            collection_name: 컬렉션 이름 (논리 이름)
             vector_dim: 벡터 차원 (임베딩 벡터 크기)
+            sparse: 새로 생성 시 BM25 희소 벡터 필드(sparse_vector) 추가 여부
+            schema_version: 새로 생성 시 스키마 버전 (없으면 settings.milvus_schema_version)
         
         Returns:
             (Collection 객체, is_newly_created: bool) 튜플
         """
         self.connect()
+        target = resolve_collection(collection_name)
+        partition_key = target.offer_no is not None
+        collection_name = target.name
         
         # 컬렉션 존재 여부 확인
         is_newly_created = False
@@ -57,14 +72,9 @@ class MilvusService:
             is_newly_created = True
             logger.info(f"Creating collection '{collection_name}' with vector_dim={vector_dim}")
             
-            # 필드 스키마 정의
-            fields = [
-                FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-                FieldSchema(name="file_no", dtype=DataType.VARCHAR, max_length=36),
-                FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535),
-                FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=vector_dim),
-                FieldSchema(name="metadata", dtype=DataType.VARCHAR, max_length=65535),
-            ]
+            # 필드 스키마 정의 (v2는 타입이 있는 스칼라 필드 포함)
+            schema_version = schema_version or settings.milvus_schema_version
+            fields = build_fields(schema_version, vector_dim, sparse=sparse, partition_key=partition_key)
             
             # 컬렉션 스키마 생성
             schema = CollectionSchema(
@@ -72,8 +82,11 @@ class MilvusService:
                 description=f"Embedding collection: {collection_name}"
             )
             
-            # 컬렉션 생성
-            collection = Collection(name=collection_name, schema=schema)
+            # 컬렉션 생성 (공유 컬렉션은 offer_no 해시로 나뉘는 파티션 수 지정)
+            if partition_key:
+                collection = Collection(name=collection_name, schema=schema, num_partitions=settings.partition_key_num_partitions)
+            else:
+                collection = Collection(name=collection_name, schema=schema)
             
             # 인덱스 생성 (HNSW 인덱스)
             index_params = {
@@ -82,8 +95,20 @@ class MilvusService:
                 "params": {"M": 16, "efConstruction": 200}
             }
             collection.create_index(field_name="vector", index_params=index_params)
+            if sparse:
+                collection.create_index(
+                    field_name=SPARSE_FIELD,
+                    index_params={"metric_type": "IP", "index_type": "SPARSE_INVERTED_INDEX", "params": {"drop_ratio_build": 0.0}}
+                )
+            if schema_version >= 2:
+                create_scalar_indexes(collection)
+            if partition_key:
+                collection.create_index(field_name=OFFER_FIELD, index_params={"index_type": "INVERTED"}, index_name=f"idx_{OFFER_FIELD}")
             
-            logger.info(f"Collection '{collection_name}' created successfully")
+            logger.info(
+                f"Collection '{collection_name}' created successfully "
+                f"(schema=v{schema_version}, sparse={sparse}, partition_key={partition_key})"
+            )
         
         # 컬렉션 로드
         if not collection.has_index():
@@ -103,6 +128,11 @@ class MilvusService:
     def ensure_partitions(self, collection_name: str, partitions: List[str]) -> None:
         """컬렉션에 필요한 파티션이 없으면 생성"""
         self.connect()
+        target = resolve_collection(collection_name)
+        if target.offer_no is not None:
+            # partition key 컬렉션은 파티션을 직접 만들 수 없음 (offer_no로 자동 분배)
+            logger.info(f"Skipping partition ensure for '{collection_name}' (partition key collection '{target.name}')")
+            return
         if not utility.has_collection(collection_name):
             raise ValueError(f"Collection '{collection_name}' does not exist")
         collection = Collection(collection_name)
@@ -119,7 +149,9 @@ class MilvusService:
         collection_name: str,
         embeddings: List[Dict[str, Any]],
         vector_dim: int = 1024,
-        partition_name: Optional[str] = None
+        partition_name: Optional[str] = None,
+        sparse: bool = False,
+        modality: str = "text"
     ) -> bool:
         """
         임베딩 데이터를 Milvus에 삽입
@@ -131,55 +163,41 @@ class MilvusService:
                     "name": str (파일명),
                     "text": str (청크 텍스트),
                     "vector": List[float] (임베딩 벡터),
-                    "metadata": Dict (PAGE_NO, chunk_id, CREATED_AT, UPDATED_AT)
+                    "metadata": Dict (PAGE_NO, chunk_id, CREATED_AT, UPDATED_AT),
+                    "category": str (선택, v2 스키마 category 필드)
                 } 형식
+            sparse: 컬렉션 생성 시 희소 벡터 필드 추가 여부
+                (필드가 있는 컬렉션에는 항상 BM25 희소 벡터를 함께 저장)
+            modality: v2 스키마 modality 필드 값 ("text" / "image")
         
         Returns:
             성공 여부
         """
         try:
-            collection, _ = self.ensure_collection(collection_name, vector_dim)
+            collection, _ = self.ensure_collection(collection_name, vector_dim, sparse=sparse)
+            target = resolve_collection(collection_name)
             
             # 데이터 준비 (입력 값 보정 및 검증)
-            file_nos: List[str] = []
-            texts: List[str] = []
-            vectors: List[List[float]] = []
-            metadata_list: List[str] = []
-
-            for index, emb in enumerate(embeddings):
-                # file_no는 문자열이어야 함. 다양한 키를 허용하고, None은 빈 문자열로 보정
-                raw_file_no = (
-                    emb.get("file_no")
-                    or emb.get("name")
-                    or emb.get("file_id")
-                    or emb.get("fileId")
-                    or emb.get("doc_id")
-                )
-                file_no_str = "" if raw_file_no is None else str(raw_file_no)
-                file_nos.append(file_no_str)
-
-                # text는 문자열이어야 함. None이면 빈 문자열로 보정
-                raw_text = emb.get("text")
-                text_str = "" if raw_text is None else str(raw_text)
-                texts.append(text_str)
-
-                # vector는 필수. 길이가 다르면 보정(부족하면 0 패딩, 길면 잘라냄)
-                raw_vector = emb.get("vector")
-                if raw_vector is None:
-                    raise ValueError(f"embedding[{index}] has no 'vector' field")
-                vec = list(map(float, raw_vector))
-                if len(vec) < vector_dim:
-                    vec = vec + [0.0] * (vector_dim - len(vec))
-                elif len(vec) > vector_dim:
-                    vec = vec[:vector_dim]
-                vectors.append(vec)
-
-                # metadata를 JSON 문자열로 변환 (None → {})
-                metadata_json = json.dumps(emb.get("metadata", {}) or {}, ensure_ascii=False)
-                metadata_list.append(metadata_json)
+            columns = prepare_rows(embeddings, vector_dim, modality)
+            if target.offer_no is not None:
+                columns[OFFER_FIELD] = [target.offer_no] * len(embeddings)
+                if partition_name:
+                    logger.warning(f"Ignoring partition '{partition_name}' for partition key collection '{target.name}'")
+                    partition_name = None
+            
+            if any(field.name == SPARSE_FIELD for field in collection.schema.fields):
+                if self._sparse_encoder is None:
+                    self._sparse_encoder = SparseEncoder()
+                columns[SPARSE_FIELD] = self._sparse_encoder.encode_documents(collection_name, columns["text"])
+            # 컬럼 구성 (스키마 필드 순서대로, auto_id PK 제외)
+            # v1 컬렉션에는 v2 스칼라 필드가 없으므로 스키마에 있는 필드만 사용
+            insert_data = [
+                columns[field.name]
+                for field in collection.schema.fields
+                if not (field.is_primary and field.auto_id)
+            ]
             
             # 데이터 삽입
-            insert_data = [file_nos, texts, vectors, metadata_list]
             if partition_name:
                 collection.insert(insert_data, partition_name=partition_name)
             else:
@@ -188,7 +206,10 @@ class MilvusService:
             # 플러시하여 즉시 반영
             collection.flush()
             
-            logger.info(f"Inserted {len(embeddings)} embeddings into collection '{collection_name}'")
+            logger.info(
+                f"Inserted {len(embeddings)} embeddings into collection '{target.name}'"
+                + (f" (offer_no={target.offer_no})" if target.offer_no else "")
+            )
             return True
             
         except Exception as e:
@@ -196,15 +217,26 @@ class MilvusService:
             raise
     
     def get_collection_stats(self, collection_name: str) -> Dict[str, Any]:
-        """컬렉션 통계 정보 조회"""
+        """컬렉션 통계 정보 조회 (partition_key 레이아웃이면 해당 오퍼 행만 집계)"""
         try:
             self.connect()
-            if not utility.has_collection(collection_name):
+            target = resolve_collection(collection_name)
+            if not utility.has_collection(target.name):
                 return {"exists": False}
             
-            collection = Collection(collection_name)
+            collection = Collection(target.name)
             collection.load()
             
+            if target.offer_no is not None:
+                num_entities = int(collection.query(expr=target.expr, output_fields=["count(*)"])[0]["count(*)"])
+                stats = {
+                    "exists": True,
+                    "num_entities": num_entities,
+                    "is_empty": num_entities == 0,
+                    "collection": target.name,
+                }
+                return stats
+            
             stats = {
                 "exists": True,
                 "num_entities": collection.num_entities,
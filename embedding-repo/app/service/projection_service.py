@@ -0,0 +1,166 @@
+"""
+컬렉션별 PCA 투영 서비스
+COLLECTION_PROJECTION 테이블에 저장된 투영 행렬을 조회하여 삽입 시점에 벡터 차원을 축소합니다.
+- 투영 등록/컬렉션 교체 시 fit_projection 스크립트가 Redis projection:invalidate 채널로 발행하는 메시지를 구독해 즉시 무효화
+"""
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.core.settings import settings
+from app.models.collection_projection import CollectionProjection
+
+# query-embedding-repo app/services/projection_service.py 와 같은 채널
+PROJECTION_INVALIDATE_CHANNEL = "projection:invalidate"
+
+
+class Projection:
+    """PCA 투영 (mean, components) 보관 및 적용"""
+
+    def __init__(self, collection_name: str, mean: np.ndarray, components: np.ndarray):
+        self.collection_name = collection_name
+        self.mean = mean.astype(np.float32, copy=False)
+        self.components = components.astype(np.float32, copy=False)
+
+    @property
+    def source_dim(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def target_dim(self) -> int:
+        return int(self.components.shape[0])
+
+    @classmethod
+    def from_row(cls, row: CollectionProjection) -> "Projection":
+        mean = np.frombuffer(row.MEAN, dtype=np.float32)
+        components = np.frombuffer(row.COMPONENTS, dtype=np.float32).reshape(row.TARGET_DIM, row.SOURCE_DIM)
+        return cls(row.COLLECTION_NAME, mean, components)
+
+    def apply(self, vectors: List[List[float]]) -> List[List[float]]:
+        """
+        (X - mean) @ components.T 후 L2 정규화 (COSINE 검색 유지)
+
+        Args:
+            vectors: 원본 벡터 리스트 (SOURCE_DIM)
+
+        Returns:
+            투영된 벡터 리스트 (TARGET_DIM)
+        """
+        if not vectors:
+            return []
+        x = np.asarray(vectors, dtype=np.float32)
+        if x.ndim != 2 or x.shape[1] != self.source_dim:
+            raise ValueError(
+                f"Projection for '{self.collection_name}' expects dim={self.source_dim}, got shape={x.shape}"
+            )
+        projected = (x - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (projected / norms).tolist()
+
+
+class ProjectionService:
+    """COLLECTION_PROJECTION 조회 서비스 (프로세스 내 TTL 캐시)"""
+
+    _cache: Dict[str, Tuple[float, Optional[Projection]]] = {}
+    ttl_seconds: float = 60.0
+
+    @classmethod
+    async def get_projection(cls, db: AsyncSession, collection_name: str) -> Optional[Projection]:
+        """
+        컬렉션 이름으로 투영 행렬 조회 (없으면 None)
+
+        Args:
+            db: 데이터베이스 세션
+            collection_name: Milvus 컬렉션 이름
+
+        Returns:
+            Projection 또는 None
+
+        Raises:
+            Exception: 투영 조회 실패 (투영된 컬렉션에 원본 차원 벡터를 넣지 않도록 삽입을 중단)
+        """
+        if not collection_name:
+            return None
+        now = time.monotonic()
+        cached = cls._cache.get(collection_name)
+        if cached and now - cached[0] < cls.ttl_seconds:
+            return cached[1]
+
+        projection: Optional[Projection] = None
+        try:
+            result = await db.execute(
+                select(CollectionProjection).where(CollectionProjection.COLLECTION_NAME == collection_name)
+            )
+            row = result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f"Failed to load projection for '{collection_name}': {e}")
+            raise
+        if row:
+            projection = Projection.from_row(row)
+            logger.info(
+                f"Loaded projection for '{collection_name}': {projection.source_dim} -> {projection.target_dim}"
+            )
+
+        cls._cache[collection_name] = (now, projection)
+        return projection
+
+    @classmethod
+    def invalidate(cls, collection_name: Optional[str] = None) -> None:
+        """캐시 무효화 (collection_name이 없으면 전체)"""
+        if collection_name is None:
+            cls._cache.clear()
+        else:
+            cls._cache.pop(collection_name, None)
+
+
+async def run_invalidation_listener() -> None:
+    """
+    projection:invalidate 채널 구독 (앱 수명 동안 실행)
+
+    메시지: {"collections": ["h1234_1", ...]} (collections가 없으면 전체 무효화)
+    연결이 끊기면 놓친 메시지가 있을 수 있으므로 재연결 시 캐시 전체를 비움
+    """
+    import redis.asyncio as redis
+
+    retry_seconds = 1.0
+    while True:
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            username=settings.redis_username,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(PROJECTION_INVALIDATE_CHANNEL)
+                ProjectionService.invalidate()
+                retry_seconds = 1.0
+                logger.info(f"Subscribed to {PROJECTION_INVALIDATE_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        names = json.loads(message.get("data") or "{}").get("collections")
+                    except (TypeError, ValueError):
+                        names = None
+                    for name in names or [None]:
+                        ProjectionService.invalidate(name)
+                    logger.info(f"Projection cache invalidated: {names or 'all'}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Projection invalidation listener error, retrying in {retry_seconds:.0f}s: {e}")
+            ProjectionService.invalidate()
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, 30.0)
+        finally:
+            await client.aclose()
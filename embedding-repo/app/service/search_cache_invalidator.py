@@ -0,0 +1,41 @@
+"""
+검색 캐시 무효화 모듈
+Milvus 삽입 후 컬렉션 버전 카운터를 증가시켜 search 서비스의 캐시된 결과를 무효화합니다.
+"""
+from typing import Optional
+
+from redis.asyncio import Redis
+from app.core.settings import settings
+from loguru import logger
+
+_redis_client: Optional[Redis] = None
+
+
+def collection_version_key(collection_name: str) -> str:
+    """컬렉션 버전 카운터 키 (search 서비스와 공유)"""
+    return f"search:collection_version:{collection_name}"
+
+
+async def bump_collection_version(collection_name: str) -> None:
+    """
+    컬렉션 버전 증가 (실패해도 삽입 흐름은 계속 진행, 캐시는 TTL로 만료)
+
+    Args:
+        collection_name: 삽입이 일어난 Milvus 컬렉션 이름
+    """
+    global _redis_client
+    try:
+        if _redis_client is None:
+            import redis.asyncio as redis
+            _redis_client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True
+            )
+        version = await _redis_client.incr(collection_version_key(collection_name))
+        logger.debug(f"Bumped search cache version for '{collection_name}' -> {version}")
+    except Exception as e:
+        logger.warning(f"Failed to bump search cache version for '{collection_name}': {str(e)}")
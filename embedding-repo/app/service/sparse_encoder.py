@@ -0,0 +1,123 @@
+"""
+BM25 희소 벡터 인코더
+한국어 토큰(어절) + 한글 문자 bigram을 해시하여 Milvus SPARSE_FLOAT_VECTOR로 변환합니다.
+문서 빈도(DF) 통계는 Redis에 컬렉션별로 누적하여 검색 시 IDF 계산에 사용합니다.
+(search 서비스의 app/service/sparse_encoder.py와 토큰화/해시 규칙이 같아야 합니다)
+"""
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+from loguru import logger
+from app.core.settings import settings
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    토큰화: 소문자 영숫자/한글 어절 + 한글 어절의 문자 bigram
+    (조사/어미가 붙은 어절도 bigram으로 부분 일치 가능)
+    """
+    terms: List[str] = []
+    for token in TOKEN_PATTERN.findall((text or "").lower()):
+        terms.append(token)
+        if len(token) > 2 and HANGUL_PATTERN.match(token):
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return terms
+
+
+def term_id(term: str) -> int:
+    """용어 → 희소 벡터 인덱스 (crc32, 프로세스 간 안정적)"""
+    return zlib.crc32(term.encode("utf-8"))
+
+
+class SparseStatsStore:
+    """컬렉션별 BM25 통계 (문서 수, 총 길이, 용어별 DF) Redis 저장소"""
+
+    def __init__(self):
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True,
+            )
+        return self._client
+
+    @staticmethod
+    def stats_key(collection_name: str) -> str:
+        return f"sparse:stats:{collection_name}"
+
+    @staticmethod
+    def df_key(collection_name: str) -> str:
+        return f"sparse:df:{collection_name}"
+
+    def get_stats(self, collection_name: str) -> Dict[str, float]:
+        raw = self._get_client().hgetall(self.stats_key(collection_name)) or {}
+        return {"docs": float(raw.get("docs", 0)), "total_len": float(raw.get("total_len", 0))}
+
+    def add_documents(self, collection_name: str, doc_terms: List[Counter]) -> None:
+        """삽입 문서의 DF/길이 통계 누적 (삭제 시 감소는 하지 않는 근사치)"""
+        df = Counter()
+        for terms in doc_terms:
+            df.update(term_id(t) for t in terms)
+        pipe = self._get_client().pipeline(transaction=False)
+        pipe.hincrby(self.stats_key(collection_name), "docs", len(doc_terms))
+        pipe.hincrby(self.stats_key(collection_name), "total_len", sum(sum(t.values()) for t in doc_terms))
+        for tid, count in df.items():
+            pipe.hincrby(self.df_key(collection_name), str(tid), count)
+        pipe.execute()
+
+
+class SparseEncoder:
+    """문서 측 BM25 가중치(tf 포화 + 길이 정규화) 희소 벡터 생성"""
+
+    def __init__(self, stats_store: Optional[SparseStatsStore] = None):
+        self.stats_store = stats_store or SparseStatsStore()
+
+    def encode_documents(self, collection_name: str, texts: List[str]) -> List[Dict[int, float]]:
+        """
+        문서 텍스트를 희소 벡터로 변환하고 DF 통계를 갱신
+
+        Args:
+            collection_name: 통계를 누적할 컬렉션 이름
+            texts: 문서(청크) 텍스트 리스트
+
+        Returns:
+            {term_id: weight} 리스트 (빈 문서는 빈 딕셔너리 대신 최소 1개 항목)
+        """
+        doc_terms = [Counter(tokenize(text)) for text in texts]
+        batch_len = sum(sum(t.values()) for t in doc_terms)
+        try:
+            stats = self.stats_store.get_stats(collection_name)
+            self.stats_store.add_documents(collection_name, doc_terms)
+        except Exception as e:
+            # 통계 저장 실패 시에도 삽입은 진행 (검색 측 IDF가 근사치가 됨)
+            logger.warning(f"Failed to update sparse stats for '{collection_name}': {e}")
+            stats = {"docs": 0.0, "total_len": 0.0}
+        docs = stats["docs"] + len(doc_terms)
+        avgdl = (stats["total_len"] + batch_len) / docs if docs else 1.0
+
+        vectors: List[Dict[int, float]] = []
+        for terms in doc_terms:
+            dl = sum(terms.values())
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * dl / max(avgdl, 1.0))
+            vector: Dict[int, float] = {}
+            for term, tf in terms.items():
+                tid = term_id(term)
+                vector[tid] = vector.get(tid, 0.0) + tf * (BM25_K1 + 1) / (tf + norm)
+            # Milvus는 빈 희소 벡터를 허용하지 않으므로 placeholder 항목 추가
+            vectors.append(vector or {0: 1e-6})
+        return vectors
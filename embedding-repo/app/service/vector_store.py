@@ -0,0 +1,101 @@
+"""
+벡터 저장소 인터페이스
+settings.vector_store_backend로 Milvus(MilvusService) 또는 로컬 저장소(LocalVectorStoreService)를 선택합니다.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+import json
+
+from app.core.settings import settings
+from app.service.milvus_schema import typed_values
+
+
+class VectorStore(ABC):
+    """임베딩 저장 백엔드 공통 인터페이스"""
+
+    @abstractmethod
+    def ensure_collection(self, collection_name: str, vector_dim: int = 1024, sparse: bool = False) -> Tuple[Any, bool]:
+        """컬렉션이 없으면 생성하고 (컬렉션 핸들, 새로 생성 여부) 반환"""
+
+    @abstractmethod
+    def ensure_partitions(self, collection_name: str, partitions: List[str]) -> None:
+        """컬렉션에 필요한 파티션이 없으면 생성"""
+
+    @abstractmethod
+    def insert_embeddings(
+        self,
+        collection_name: str,
+        embeddings: List[Dict[str, Any]],
+        vector_dim: int = 1024,
+        partition_name: Optional[str] = None,
+        sparse: bool = False,
+        modality: str = "text"
+    ) -> bool:
+        """임베딩 데이터 삽입"""
+
+    @abstractmethod
+    def get_collection_stats(self, collection_name: str) -> Dict[str, Any]:
+        """컬렉션 통계 정보 조회"""
+
+
+def prepare_rows(
+    embeddings: List[Dict[str, Any]],
+    vector_dim: int,
+    modality: str = "text"
+) -> Dict[str, List[Any]]:
+    """
+    삽입 데이터 보정 및 컬럼 구성 (백엔드 공통)
+
+    Args:
+        embeddings: {"name"/"file_no", "text", "vector", "metadata", "category"} 리스트
+        vector_dim: 벡터 차원 (부족하면 0 패딩, 길면 잘라냄)
+        modality: v2 스키마 modality 필드 값
+
+    Returns:
+        {file_no, text, vector, metadata(JSON 문자열), page, chunk_id, file_name, category, modality, created_at} 컬럼
+    """
+    columns: Dict[str, List[Any]] = {"file_no": [], "text": [], "vector": [], "metadata": []}
+    typed_rows: List[Dict[str, Any]] = []
+
+    for index, emb in enumerate(embeddings):
+        # file_no는 문자열이어야 함. 다양한 키를 허용하고, None은 빈 문자열로 보정
+        raw_file_no = (
+            emb.get("file_no")
+            or emb.get("name")
+            or emb.get("file_id")
+            or emb.get("fileId")
+            or emb.get("doc_id")
+        )
+        columns["file_no"].append("" if raw_file_no is None else str(raw_file_no))
+
+        # text는 문자열이어야 함. None이면 빈 문자열로 보정
+        raw_text = emb.get("text")
+        columns["text"].append("" if raw_text is None else str(raw_text))
+
+        # vector는 필수. 길이가 다르면 보정(부족하면 0 패딩, 길면 잘라냄)
+        raw_vector = emb.get("vector")
+        if raw_vector is None:
+            raise ValueError(f"embedding[{index}] has no 'vector' field")
+        vec = list(map(float, raw_vector))
+        if len(vec) < vector_dim:
+            vec = vec + [0.0] * (vector_dim - len(vec))
+        elif len(vec) > vector_dim:
+            vec = vec[:vector_dim]
+        columns["vector"].append(vec)
+
+        # metadata를 JSON 문자열로 변환 (None → {})
+        columns["metadata"].append(json.dumps(emb.get("metadata", {}) or {}, ensure_ascii=False))
+        typed_rows.append(typed_values(emb.get("metadata"), modality, emb.get("category") or ""))
+
+    for field_name in ("page", "chunk_id", "file_name", "category", "modality", "created_at"):
+        columns[field_name] = [row[field_name] for row in typed_rows]
+    return columns
+
+
+def create_vector_store() -> VectorStore:
+    """설정된 백엔드의 VectorStore 생성"""
+    if settings.vector_store_backend == "local":
+        from app.service.local_vector_store_service import LocalVectorStoreService
+        return LocalVectorStoreService()
+    from app.service.milvus_service import MilvusService
+    return MilvusService(host=settings.milvus_host, port=settings.milvus_port)
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     # OpenAI 설정
     openai_api_key: str = ""
 
+    # LLM_KEY 조회 결과 캐시 TTL (초, 0이면 캐시 안 함)
+    llm_key_cache_ttl_seconds: float = 60.0
+
     # Qwen (Ollama) 설정 - DB에서 동적으로 업데이트됨
     qwen_base_url: str = "http://apik.co.kr:11434/"
 
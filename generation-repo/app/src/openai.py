@@ -1,5 +1,5 @@
 from .base import BaseGenerationStrategy
-from typing import Dict, Any, List, Optional, AsyncIterator
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from loguru import logger
 import os
 import time
@@ -9,6 +9,7 @@ import json
 import asyncio
 import queue
 import re
+import threading
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from sqlalchemy import text
@@ -28,6 +29,10 @@ from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_classic.chains.retrieval import create_retrieval_chain
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
 
+# (llm_no, user_no) → (조회 시각, API_KEY) : 요청마다 LLM_KEY를 조회하지 않도록 llm_key_cache_ttl_seconds 동안 재사용
+_api_key_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+_api_key_cache_lock = threading.Lock()
+
 
 class Openai(BaseGenerationStrategy):
     """
@@ -87,7 +92,20 @@ class Openai(BaseGenerationStrategy):
             raise
 
     def _fetch_api_key_from_db(self, llm_no: str, user_no: str) -> Optional[str]:
-        """DB에서 STRATEGY_NO(=llm_no)와 USER_NO로 API_KEY 조회"""
+        """DB에서 STRATEGY_NO(=llm_no)와 USER_NO로 API_KEY 조회 (찾은 키는 TTL 동안 캐시)"""
+        key = (str(llm_no), str(user_no))
+        now = time.monotonic()
+        with _api_key_cache_lock:
+            cached = _api_key_cache.get(key)
+        if cached and now - cached[0] < settings.llm_key_cache_ttl_seconds:
+            return cached[1]
+        api_key = self._query_api_key(llm_no, user_no)
+        if api_key and settings.llm_key_cache_ttl_seconds > 0:
+            with _api_key_cache_lock:
+                _api_key_cache[key] = (now, api_key)
+        return api_key
+
+    def _query_api_key(self, llm_no: str, user_no: str) -> Optional[str]:
         session = SessionLocal()
         try:
             # STRATEGY_NO에 LLM_NO를, USER_NO에 USER_NO를 넣어서 조회
@@ -57,6 +57,13 @@ class Settings(BaseSettings):
     cross_encoder_service_url: str = "http://hebees-cross-encoder:8000"
     generation_service_url: str = "http://hebees-generation:8000"
 
+    # Query Embedding 텍스트(e5Large)/이미지(mclip) 벡터를 /embed/multi 한 번으로 동시 요청 (false이거나 /embed/multi가 404면 /process, /process/image 순차 호출)
+    query_embedding_multi_enabled: bool = True
+
+    # Cross-Encoder 텍스트/이미지 후보를 /process/joint 한 번으로 동시 재정렬 (false면 /process, /process/image 순차 호출)
+    cross_encoder_joint_enabled: bool = True
+    cross_encoder_image_scorer: str = "caption"  # caption: 이미지 캡션 cross-encoder / clip: 검색 CLIP 유사도
+
     # 로깅 설정
     logging_level: str = "INFO"
     log_file_enabled: bool = False
@@ -10,11 +10,11 @@ from app.service.ingest_service import IngestService
 from app.service.gateway_client import GatewayClient
 from app.service.ingest_progress_service import IngestProgressService
 from app.core.database import get_db
-from typing import Optional, List
+from typing import Dict, Optional, List
 import json
 import httpx
 from loguru import logger
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 import uuid
 from datetime import datetime, timezone
 
@@ -264,6 +264,28 @@ async def ingest_process(
             logger.warning("Failed to update FILE.COLLECTION_NO: {}", e)
             await db.rollback()
 
+        # 파일별 카테고리 (FILE.FILE_CATEGORY_NO → v2 스키마 category 필드, 검색 category 필터용)
+        file_categories: Dict[str, str] = {}
+        try:
+            file_no_map: Dict[bytes, str] = {}
+            for f in request.files:
+                file_no_str = (f.fileNo or "").strip()
+                try:
+                    file_no_map[bytes.fromhex(file_no_str) if len(file_no_str) == 32 else uuid.UUID(file_no_str).bytes] = f.fileNo
+                except Exception:
+                    continue
+            if file_no_map:
+                category_stmt = text(
+                    "SELECT `FILE_NO` AS file_no, `FILE_CATEGORY_NO` AS file_category_no "
+                    "FROM `FILE` WHERE `FILE_NO` IN :file_nos"
+                ).bindparams(bindparam("file_nos", expanding=True))
+                category_res = await db.execute(category_stmt, {"file_nos": list(file_no_map)})
+                for row in category_res:
+                    if row.file_no in file_no_map and row.file_category_no:
+                        file_categories[file_no_map[row.file_no]] = str(uuid.UUID(bytes=row.file_category_no))
+        except Exception as e:
+            logger.warning("Failed to load FILE.FILE_CATEGORY_NO: {}", e)
+
         # 기본 전략 결정 및 파라미터 정규화: DB 값 사용 (없을 경우 기본값)
         # Extract
         extraction_strategy = (extraction_strategy_db or "").strip() or "txt"
@@ -340,7 +362,8 @@ async def ingest_process(
                     strategy=default_embed_strategy,
                     parameters=embed_params,
                     bucket=bucket,
-                    extra_headers={"x-user-role": user_role}
+                    extra_headers={"x-user-role": user_role},
+                    category=file_categories.get(file_no)
                 )
                 
                 # 3-1) Image Embedding (이미지 컬렉션에 저장)
@@ -370,7 +393,8 @@ async def ingest_process(
                             extra_headers={
                                 "x-user-role": user_role,
                                 "x-user-uuid": user_uuid
-                            }
+                            },
+                            category=file_categories.get(file_no)
                         )
                         logger.info(f"Image embedding completed for collection: {image_collection_name}")
                     except Exception as img_e:
@@ -1,5 +1,5 @@
 import httpx
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.core.settings import settings
 import json
 from loguru import logger
@@ -24,10 +24,13 @@ class GatewayClient:
         self.embedding_image_direct_url = f"{self.embedding_service_url}/process/image"
         self.query_embedding_direct_url = f"{self.query_embedding_service_url}/process"
         self.query_embedding_image_direct_url = f"{self.query_embedding_service_url}/process/image"
+        self.query_embedding_multi_direct_url = f"{self.query_embedding_service_url}/embed/multi"
         self.search_direct_url = f"{self.search_service_url}/process"
         self.search_image_direct_url = f"{self.search_service_url}/process/image"
+        self.search_multi_direct_url = f"{self.search_service_url}/process/multi"
         self.cross_encoder_direct_url = f"{self.cross_encoder_service_url}/process"
         self.cross_encoder_image_direct_url = f"{self.cross_encoder_service_url}/process/image"
+        self.cross_encoder_joint_direct_url = f"{self.cross_encoder_service_url}/process/joint"
         self.generation_direct_url = f"{self.generation_service_url}/process"
     
     async def request_extraction(
@@ -174,9 +177,10 @@ class GatewayClient:
         strategy: str = None,
         parameters: dict = None,
         bucket: str = None,
-        extra_headers: Dict[str, Any] = None
+        extra_headers: Dict[str, Any] = None,
+        category: str = None
     ) -> Dict[Any, Any]:
-        """Embedding 컨테이너로 요청 - 서비스 간 직접 통신"""
+        """Embedding 컨테이너로 요청 - 서비스 간 직접 통신 (category: FILE_CATEGORY_NO, v2 스키마 category 필드)"""
         logger.debug(f"POST {self.embedding_direct_url} | embeddingStrategy={strategy}")
         # chunking_result에서 chunks 형식으로 변환
         # chunking-repo의 응답 형식: {"chunks": [...], ...}
@@ -190,7 +194,8 @@ class GatewayClient:
                 "fileNo": file_no,
                 "embeddingStrategy": strategy,
                 "embeddingParameter": parameters or {},
-                "bucket": bucket
+                "bucket": bucket,
+                "category": category
             }
             if file_no:
                 request_data["fileNo"] = file_no
@@ -211,7 +216,8 @@ class GatewayClient:
         collection_no: str = None,
         bucket: str = None,
         partition: str = None,
-        extra_headers: Dict[str, Any] = None
+        extra_headers: Dict[str, Any] = None,
+        category: str = None
     ) -> Dict[Any, Any]:
         """Image Embedding 컨테이너로 요청 - 서비스 간 직접 통신"""
         logger.debug(f"POST {self.embedding_image_direct_url} | fileNo={file_no}, userNo={user_no}, collection={collection_name}")
@@ -223,7 +229,8 @@ class GatewayClient:
                 "collectionName": collection_name,
                 "collectionNo": collection_no,
                 "bucket": bucket,
-                "partition": partition
+                "partition": partition,
+                "category": category
             }
             
             response = await client.post(
@@ -238,7 +245,8 @@ class GatewayClient:
         self,
         query: str,
         strategy: str,
-        parameters: dict
+        parameters: dict,
+        collection_names: Optional[List[str]] = None
     ) -> Dict[Any, Any]:
         """Query Embedding 컨테이너로 요청 - 서비스 간 직접 통신"""
         logger.debug(f"POST {self.query_embedding_direct_url} | queryEmbeddingStrategy={strategy}")
@@ -248,7 +256,8 @@ class GatewayClient:
                 json={
                     "query": query,
                     "queryEmbeddingStrategy": strategy,
-                    "queryEmbeddingParameter": parameters
+                    "queryEmbeddingParameter": parameters,
+                    "collectionNames": collection_names or []
                 }
             )
             response.raise_for_status()
@@ -258,7 +267,8 @@ class GatewayClient:
         self,
         query: str,
         strategy: str,
-        parameters: dict
+        parameters: dict,
+        collection_names: Optional[List[str]] = None
     ) -> Dict[Any, Any]:
         """Query Embedding Image 컨테이너로 요청 - 서비스 간 직접 통신 (이미지 모델 사용)"""
         logger.debug(f"POST {self.query_embedding_image_direct_url} | queryEmbeddingStrategy={strategy}")
@@ -268,7 +278,29 @@ class GatewayClient:
                 json={
                     "query": query,
                     "queryEmbeddingStrategy": strategy,
-                    "queryEmbeddingParameter": parameters
+                    "queryEmbeddingParameter": parameters,
+                    "collectionNames": collection_names or []
+                }
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def request_query_embedding_multi(
+        self,
+        query: str,
+        models: List[Dict[str, Any]]
+    ) -> Dict[Any, Any]:
+        """Query Embedding 컨테이너로 여러 모델 임베딩 동시 요청 - 서비스 간 직접 통신
+
+        models: [{"model": 전략 이름, "parameters": {...}, "collectionNames": [...]}, ...]
+        """
+        logger.debug(f"POST {self.query_embedding_multi_direct_url} | models={[m.get('model') for m in models]}")
+        async with httpx.AsyncClient(timeout=3600.0) as client:
+            response = await client.post(
+                self.query_embedding_multi_direct_url,
+                json={
+                    "query": query,
+                    "models": models
                 }
             )
             response.raise_for_status()
@@ -296,6 +328,30 @@ class GatewayClient:
             response.raise_for_status()
             return response.json()
     
+    async def request_search_multi(
+        self,
+        targets: List[Dict[str, Any]],
+        strategy: str = "basic",
+        parameters: dict = None,
+        top_k: Optional[int] = None,
+        query: Optional[str] = None
+    ) -> Dict[Any, Any]:
+        """Search 컨테이너 /process/multi 요청 - 여러 컬렉션/파티션을 한 번에 검색 (query는 hybrid 전략용 원문)"""
+        logger.debug(f"POST {self.search_multi_direct_url} | searchStrategy={strategy} targets={len(targets)}")
+        async with httpx.AsyncClient(timeout=3600.0) as client:
+            response = await client.post(
+                self.search_multi_direct_url,
+                json={
+                    "targets": targets,
+                    "searchStrategy": strategy,
+                    "searchParameter": parameters or {},
+                    "topK": top_k,
+                    "query": query
+                }
+            )
+            response.raise_for_status()
+            return response.json()
+    
     async def request_search_image(
         self,
         embedding: List[float],
@@ -362,6 +418,32 @@ class GatewayClient:
             response.raise_for_status()
             return response.json()
     
+    async def request_cross_encoder_joint(
+        self,
+        query: str,
+        candidate_embeddings: List[Dict[Any, Any]],
+        image_candidate_embeddings: List[Dict[Any, Any]],
+        strategy: str,
+        parameters: dict,
+        image_scorer: Optional[str] = None
+    ) -> Dict[Any, Any]:
+        """Cross Encoder 컨테이너로 텍스트/이미지 후보 동시 재정렬 요청 - 서비스 간 직접 통신"""
+        logger.debug(f"POST {self.cross_encoder_joint_direct_url} | crossEncoderStrategy={strategy}, imageScorer={image_scorer}")
+        async with httpx.AsyncClient(timeout=3600.0) as client:
+            response = await client.post(
+                self.cross_encoder_joint_direct_url,
+                json={
+                    "query": query,
+                    "candidateEmbeddings": candidate_embeddings,
+                    "imageCandidateEmbeddings": image_candidate_embeddings,
+                    "crossEncoderStrategy": strategy,
+                    "crossEncoderParameter": parameters,
+                    "imageScorer": image_scorer
+                }
+            )
+            response.raise_for_status()
+            return response.json()
+    
     async def request_generation(
         self,
         query: str,
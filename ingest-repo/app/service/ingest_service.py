@@ -4,6 +4,7 @@ from app.schemas.request.ingestRequest import IngestRequest
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 from loguru import logger
+import uuid
 
 
 class IngestService:
@@ -83,9 +84,12 @@ class IngestService:
             if file_info:
                 file_no = file_info.file_no.hex() if isinstance(file_info.file_no, bytes) else str(file_info.file_no)
                 file_name = file_info.name if hasattr(file_info, 'name') else f"file_{file_id}"
+                category_no = getattr(file_info, "file_category_no", None)
+                category = str(uuid.UUID(bytes=category_no)) if isinstance(category_no, bytes) and len(category_no) == 16 else None
             else:
                 file_no = file_id_str
                 file_name = f"file_{file_id}"
+                category = None
             
             embedding_result = await self.gateway_client.request_embedding(
                 data=chunking_result,
@@ -94,6 +98,7 @@ class IngestService:
                 file_no=file_no,
                 strategy=request.embeddingStrategy,
                 parameters=request.embeddingParameter,
+                category=category,
             )
 
             pipeline_results.append(
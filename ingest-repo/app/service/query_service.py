@@ -1,7 +1,7 @@
 from app.service.gateway_client import GatewayClient
 from app.schemas.request.queryProcessV2Request import QueryProcessV2Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 from sqlalchemy import text
 from app.core.settings import settings
@@ -9,9 +9,228 @@ import httpx
 
 
 class QueryService:
+    # query-embedding 서비스가 /embed/multi를 지원하지 않으면(404) 프로세스 동안 순차 호출 사용
+    _multi_embedding_supported = True
+
     def __init__(self):
         self.gateway_client = GatewayClient()
     
+    async def _embed_query(
+        self,
+        query: str,
+        collection_names: List[str],
+        image_collection_names: List[str],
+    ) -> Tuple[List[float], Dict[str, Any], Optional[List[float]], Dict[str, Any]]:
+        """
+        쿼리 텍스트/이미지 임베딩
+        - query_embedding_multi_enabled: /embed/multi 한 번으로 e5Large, mclip 동시 계산
+        - 아니면(또는 /embed/multi가 404이면) /process 후 /process/image 순차 호출
+        - 텍스트 임베딩 실패는 예외(/embed/multi의 errors에 담긴 원인 포함), 이미지 임베딩 실패는 이미지 검색 없이 진행
+
+        Returns:
+            (텍스트 임베딩, 텍스트 컬렉션별 투영, 이미지 임베딩 또는 None, 이미지 컬렉션별 투영)
+        """
+        qe_strategy = "e5Large"
+        qe_param = {"model": "intfloat/multilingual-e5-large"}
+        qe_image_strategy = "mclip"
+        qe_image_param = {"model": "sentence-transformers/clip-ViT-B-32-multilingual-v1"}  # 이미지 모델로 변경 필요할 수 있음
+
+        qe_res = None
+        if settings.query_embedding_multi_enabled and QueryService._multi_embedding_supported:
+            try:
+                qe_res = await self.gateway_client.request_query_embedding_multi(
+                    query=query,
+                    models=[
+                        {"model": qe_strategy, "parameters": qe_param, "collectionNames": collection_names},
+                        {"model": qe_image_strategy, "parameters": qe_image_param, "collectionNames": image_collection_names},
+                    ]
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    logger.error(f"Query embedding via query-embedding-repo failed: {str(e)}", exc_info=True)
+                    raise
+                logger.warning("Query embedding /embed/multi is not available, falling back to /process and /process/image")
+                QueryService._multi_embedding_supported = False
+            except Exception as e:
+                logger.error(f"Query embedding via query-embedding-repo failed: {str(e)}", exc_info=True)
+                raise
+        if qe_res is not None:
+            result = qe_res.get("result", {})
+            text_result = (result.get("embeddings") or {}).get(qe_strategy) or {}
+            image_result = (result.get("embeddings") or {}).get(qe_image_strategy) or {}
+            errors = result.get("errors") or {}
+            if qe_strategy in errors:
+                logger.error(f"Query embedding via query-embedding-repo failed: {errors[qe_strategy]}")
+                raise ValueError(f"Query embedding failed for {qe_strategy}: {errors[qe_strategy]}")
+            if qe_image_strategy in errors:
+                logger.warning(f"Query embedding image via query-embedding-repo failed: {errors[qe_image_strategy]}, continuing without image search")
+        else:
+            try:
+                qe_res = await self.gateway_client.request_query_embedding(
+                    query=query,
+                    strategy=qe_strategy,
+                    parameters=qe_param,
+                    collection_names=collection_names
+                )
+            except Exception as e:
+                logger.error(f"Query embedding via query-embedding-repo failed: {str(e)}", exc_info=True)
+                raise
+            text_result = qe_res.get("result", {})
+            try:
+                qe_image_res = await self.gateway_client.request_query_embedding_image(
+                    query=query,
+                    strategy=qe_image_strategy,
+                    parameters=qe_image_param,
+                    collection_names=image_collection_names
+                )
+                image_result = qe_image_res.get("result", {})
+            except Exception as e:
+                logger.warning(f"Query embedding image via query-embedding-repo failed: {str(e)}, continuing without image search")
+                image_result = {}
+
+        embedding = text_result.get("embedding", [])
+        # 컬렉션별 PCA 투영 임베딩 (투영이 등록된 컬렉션만 포함)
+        projected = text_result.get("projectedEmbeddings") or {}
+        if not isinstance(embedding, list) or not embedding:
+            raise ValueError("Invalid query embedding from query-embedding service")
+
+        embedding_image = image_result.get("embedding", [])
+        projected_image = image_result.get("projectedEmbeddings") or {}
+        if not isinstance(embedding_image, list) or not embedding_image:
+            logger.warning("Invalid query embedding image, skipping image search")
+            embedding_image = None
+            projected_image = {}
+        return embedding, projected, embedding_image, projected_image
+    
+    async def _search_candidates(
+        self,
+        query: str,
+        retrieval_strategy: str,
+        retrieval_param: Dict[str, Any],
+        embedding: List[float],
+        projected: Dict[str, Any],
+        embedding_image: Optional[List[float]],
+        projected_image: Dict[str, Any],
+        collection_name: str,
+        public_collection_name: Optional[str],
+        image_collection_name: str,
+        public_image_collection_name: Optional[str],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        텍스트/이미지 후보 검색 (search /process/multi 1회 호출)
+        - public 대상은 partition 미지정 시 "public" 파티션 검색
+        - 기본 텍스트 컬렉션 실패는 예외, 나머지 대상 실패는 경고 후 생략
+
+        Returns:
+            (텍스트 후보 리스트, 이미지 후보 리스트)
+        """
+        partition = (retrieval_param or {}).get("partition")
+        targets: List[Dict[str, Any]] = [{
+            "collection": collection_name,
+            "partition": partition,
+            "vector": projected.get(collection_name, embedding),
+            "image": False,
+        }]
+        if public_collection_name:
+            targets.append({
+                "collection": public_collection_name,
+                "partition": partition or "public",
+                "vector": projected.get(public_collection_name, embedding),
+                "image": False,
+            })
+        if embedding_image:
+            targets.append({
+                "collection": image_collection_name,
+                "partition": partition,
+                "vector": projected_image.get(image_collection_name, embedding_image),
+                "image": True,
+            })
+            if public_image_collection_name:
+                targets.append({
+                    "collection": public_image_collection_name,
+                    "partition": partition or "public",
+                    "vector": projected_image.get(public_image_collection_name, embedding_image),
+                    "image": True,
+                })
+
+        search_res = await self.gateway_client.request_search_multi(
+            targets=targets,
+            strategy=retrieval_strategy,
+            parameters=retrieval_param or {},
+            query=query
+        )
+        target_results = search_res.get("result", {}).get("targets", [])
+
+        candidates: List[Dict[str, Any]] = []
+        candidates_image: List[Dict[str, Any]] = []
+        for index, target_result in enumerate(target_results):
+            error = target_result.get("error")
+            if error:
+                if index == 0:
+                    raise RuntimeError(f"Search failed for collection '{collection_name}': {error}")
+                logger.warning(
+                    "Search target failed or skipped: collection={}, partition={}, error={}",
+                    target_result.get("collection"), target_result.get("partition"), error
+                )
+                continue
+            if target_result.get("image"):
+                candidates_image += target_result.get("candidateEmbeddings", [])
+            else:
+                candidates += target_result.get("candidateEmbeddings", [])
+        return candidates, candidates_image
+    
+    async def _rerank_candidates(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        candidates_image: List[Dict[str, Any]],
+        reranking_strategy: str,
+        reranking_param: Dict[str, Any],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        텍스트/이미지 후보 재정렬
+        - cross_encoder_joint_enabled: /process/joint 한 번으로 동시 재정렬
+        - 아니면 /process 후 /process/image 순차 호출 (이미지 실패는 무시)
+
+        Returns:
+            (텍스트 retrievedChunks, 이미지 retrievedChunks)
+        """
+        if settings.cross_encoder_joint_enabled and candidates_image:
+            cross_res = await self.gateway_client.request_cross_encoder_joint(
+                query=query,
+                candidate_embeddings=candidates,
+                image_candidate_embeddings=candidates_image,
+                strategy=reranking_strategy,
+                parameters=reranking_param,
+                image_scorer=settings.cross_encoder_image_scorer
+            )
+            result = cross_res.get("result", {})
+            return result.get("retrievedChunks", []), result.get("retrievedChunksImage", [])
+
+        cross_res = await self.gateway_client.request_cross_encoder(
+            query=query,
+            candidate_embeddings=candidates,
+            strategy=reranking_strategy,
+            parameters=reranking_param
+        )
+        retrieved_chunks = cross_res.get("result", {}).get("retrievedChunks", [])
+        
+        # 이미지 후보 - 같은 방식으로 candidates_image 전달
+        retrieved_chunks_image = []
+        if candidates_image:
+            try:
+                cross_image_res = await self.gateway_client.request_cross_encoder_image(
+                    query=query,
+                    candidate_embeddings=candidates_image,
+                    strategy=reranking_strategy,
+                    parameters=reranking_param
+                )
+                retrieved_chunks_image = cross_image_res.get("result", {}).get("retrievedChunks", [])
+            except Exception as e:
+                logger.warning(f"Image cross-encoder failed: {str(e)}, continuing without image reranking")
+                retrieved_chunks_image = []
+        return retrieved_chunks, retrieved_chunks_image
+    
     async def process_query(
         self,
         request: QueryProcessV2Request,
@@ -151,124 +370,41 @@ class QueryService:
 
         logger.info("QueryGroup params - retrieval: {}, reranking: {}, generation: {}", retrieval_param, reranking_param, generation_param)
 
-        # 3) Query Embedding - query-embedding-repo 경유 (내부 서비스 호출)
-        try:
-            qe_strategy = "e5Large"
-            qe_param = {"model": "intfloat/multilingual-e5-large"}
-            qe_res = await self.gateway_client.request_query_embedding(
-                query=request.query,
-                strategy=qe_strategy,
-                parameters=qe_param
-            )
-            embedding = qe_res.get("result", {}).get("embedding", [])
-            if not isinstance(embedding, list) or not embedding:
-                raise ValueError("Invalid query embedding from query-embedding service")
-        except Exception as e:
-            logger.error(f"Query embedding via query-embedding-repo failed: {str(e)}", exc_info=True)
-            raise
-
-        # 3-1) Query Embedding Image - query-embedding-repo/image 경유 (이미지 모델 사용)
-        embedding_image = None
-        try:
-            qe_image_strategy = "mclip"  # 같은 전략, 다른 엔드포인트
-            qe_image_param = {"model": "sentence-transformers/clip-ViT-B-32-multilingual-v1"}  # 이미지 모델로 변경 필요할 수 있음
-            qe_image_res = await self.gateway_client.request_query_embedding_image(
-                query=request.query,
-                strategy=qe_image_strategy,
-                parameters=qe_image_param
-            )
-            embedding_image = qe_image_res.get("result", {}).get("embedding", [])
-            if not isinstance(embedding_image, list) or not embedding_image:
-                logger.warning("Invalid query embedding image, skipping image search")
-                embedding_image = None
-        except Exception as e:
-            logger.warning(f"Query embedding image via query-embedding-repo failed: {str(e)}, continuing without image search")
-            embedding_image = None
+        # 3) Query Embedding - 텍스트(e5Large)/이미지(mclip) 임베딩
+        embedding, projected, embedding_image, projected_image = await self._embed_query(
+            query=request.query,
+            collection_names=[collection_name, public_collection_name],
+            image_collection_names=[f"publicRetina_image_{version_no}"] if is_admin else [
+                f"h{offer_no}_image_{version_no}",
+                f"publicRetina_image_{public_version}",
+            ],
+        )
 
-        # 4) Search - 기본 컬렉션
+        # 4) Search - 텍스트/이미지 × 기본/public 대상을 /process/multi 한 번으로 동시 검색
         logger.info("Retrieval param: {}", retrieval_param)
-        search_primary = await self.gateway_client.request_search(
+        candidates, candidates_image = await self._search_candidates(
+            query=request.query,
+            retrieval_strategy=retrieval_strategy,
+            retrieval_param=retrieval_param,
             embedding=embedding,
+            projected=projected,
+            embedding_image=embedding_image,
+            projected_image=projected_image,
             collection_name=collection_name,
-            strategy=retrieval_strategy,
-            parameters=retrieval_param or {}
+            public_collection_name=None if is_admin else public_collection_name,
+            # 이미지 컬렉션 이름 형식: h{offerNo}_image_{versionNo} 또는 publicRetina_image_{versionNo}
+            image_collection_name=f"publicRetina_image_{version_no}" if is_admin else f"h{offer_no}_image_{version_no}",
+            public_image_collection_name=None if is_admin else f"publicRetina_image_{public_version}",
         )
-        candidates = search_primary.get("result", {}).get("candidateEmbeddings", [])
-        
-        # USER의 경우 publicRetina의 public 파티션 추가 검색
-        if not is_admin:
-            public_params = dict(retrieval_param or {})
-            public_params.setdefault("partition", "public")
-            try:
-                search_public = await self.gateway_client.request_search(
-                    embedding=embedding,
-                    collection_name=public_collection_name,
-                    strategy=retrieval_strategy,
-                    parameters=public_params
-                )
-                candidates += search_public.get("result", {}).get("candidateEmbeddings", [])
-            except Exception as se:
-                logger.warning("Public partition search failed or skipped: {}", se)
-        
-        # 4-1) Search Image - 이미지 컬렉션 (컬렉션 이름에 _image_ 추가)
-        candidates_image = []
-        if embedding_image:
-            try:
-                # 컬렉션 이름 형식: h{offerNo}_image_{versionNo} 또는 publicRetina_image_{versionNo}
-                if is_admin:
-                    image_collection_name = f"publicRetina_image_{version_no}"
-                else:
-                    image_collection_name = f"h{offer_no}_image_{version_no}"
-                search_image_primary = await self.gateway_client.request_search_image(
-                    embedding=embedding_image,
-                    collection_name=image_collection_name,
-                    strategy=retrieval_strategy,
-                    parameters=retrieval_param or {}
-                )
-                candidates_image = search_image_primary.get("result", {}).get("candidateEmbeddings", [])
-                
-                # USER의 경우 publicRetina 이미지 컬렉션도 추가 검색
-                if not is_admin:
-                    public_image_collection_name = f"publicRetina_image_{public_version}"
-                    public_image_params = dict(retrieval_param or {})
-                    public_image_params.setdefault("partition", "public")
-                    try:
-                        search_image_public = await self.gateway_client.request_search_image(
-                            embedding=embedding_image,
-                            collection_name=public_image_collection_name,
-                            strategy=retrieval_strategy,
-                            parameters=public_image_params
-                        )
-                        candidates_image += search_image_public.get("result", {}).get("candidateEmbeddings", [])
-                    except Exception as se:
-                        logger.warning("Public image partition search failed or skipped: {}", se)
-            except Exception as e:
-                logger.warning(f"Image search failed: {str(e)}, continuing without image results")
-                candidates_image = []
         
-        # 5) Cross-Encoder
-        cross_res = await self.gateway_client.request_cross_encoder(
+        # 5) Cross-Encoder - 텍스트/이미지 후보 재정렬
+        retrieved_chunks, retrieved_chunks_image = await self._rerank_candidates(
             query=request.query,
-            candidate_embeddings=candidates,
-            strategy=reranking_strategy,
-            parameters=reranking_param or {}
+            candidates=candidates,
+            candidates_image=candidates_image,
+            reranking_strategy=reranking_strategy,
+            reranking_param=reranking_param or {},
         )
-        retrieved_chunks = cross_res.get("result", {}).get("retrievedChunks", [])
-        
-        # 5-1) Cross-Encoder Image - 같은 방식으로 candidates_image 전달
-        retrieved_chunks_image = []
-        if candidates_image:
-            try:
-                cross_image_res = await self.gateway_client.request_cross_encoder_image(
-                    query=request.query,
-                    candidate_embeddings=candidates_image,
-                    strategy=reranking_strategy,
-                    parameters=reranking_param or {}
-                )
-                retrieved_chunks_image = cross_image_res.get("result", {}).get("retrievedChunks", [])
-            except Exception as e:
-                logger.warning(f"Image cross-encoder failed: {str(e)}, continuing without image reranking")
-                retrieved_chunks_image = []
 
         # 6) Generation (provider 전략) - Mongo 저장 메타 포함
         # text와 image 결과를 따로 전달 (generation에서 구분 가능하도록)
@@ -442,123 +578,41 @@ class QueryService:
 
         logger.info("QueryGroup params - retrieval: {}, reranking: {}, generation: {}", retrieval_param, reranking_param, generation_param)
 
-        # 3) Query Embedding
-        try:
-            qe_strategy = "e5Large"
-            qe_param = {"model": "intfloat/multilingual-e5-large"}
-            qe_res = await self.gateway_client.request_query_embedding(
-                query=request.query,
-                strategy=qe_strategy,
-                parameters=qe_param
-            )
-            embedding = qe_res.get("result", {}).get("embedding", [])
-            if not isinstance(embedding, list) or not embedding:
-                raise ValueError("Invalid query embedding from query-embedding service")
-        except Exception as e:
-            logger.error(f"Query embedding via query-embedding-repo failed: {str(e)}", exc_info=True)
-            raise
-
-        # 3-1) Query Embedding Image - query-embedding-repo/image 경유 (이미지 모델 사용)
-        embedding_image = None
-        try:
-            qe_image_strategy = "mclip"  # 같은 전략, 다른 엔드포인트
-            qe_image_param = {"model": "sentence-transformers/clip-ViT-B-32-multilingual-v1"}  # 이미지 모델로 변경 필요할 수 있음
-            qe_image_res = await self.gateway_client.request_query_embedding_image(
-                query=request.query,
-                strategy=qe_image_strategy,
-                parameters=qe_image_param
-            )
-            embedding_image = qe_image_res.get("result", {}).get("embedding", [])
-            if not isinstance(embedding_image, list) or not embedding_image:
-                logger.warning("Invalid query embedding image, skipping image search")
-                embedding_image = None
-        except Exception as e:
-            logger.warning(f"Query embedding image via query-embedding-repo failed: {str(e)}, continuing without image search")
-            embedding_image = None
+        # 3) Query Embedding - 텍스트(e5Large)/이미지(mclip) 임베딩
+        embedding, projected, embedding_image, projected_image = await self._embed_query(
+            query=request.query,
+            collection_names=[collection_name, public_collection_name],
+            image_collection_names=[f"publicRetina_image_{version_no}"] if is_admin else [
+                f"h{offer_no}_image_{version_no}",
+                f"publicRetina_image_{public_version}",
+            ],
+        )
 
-        # 4) Search
+        # 4) Search - 텍스트/이미지 × 기본/public 대상을 /process/multi 한 번으로 동시 검색
         logger.info("Retrieval param: {}", retrieval_param)
-        search_primary = await self.gateway_client.request_search(
+        candidates, candidates_image = await self._search_candidates(
+            query=request.query,
+            retrieval_strategy=retrieval_strategy,
+            retrieval_param=retrieval_param,
             embedding=embedding,
+            projected=projected,
+            embedding_image=embedding_image,
+            projected_image=projected_image,
             collection_name=collection_name,
-            strategy=retrieval_strategy,
-            parameters=retrieval_param or {}
+            public_collection_name=None if is_admin else public_collection_name,
+            # 이미지 컬렉션 이름 형식: h{offerNo}_image_{versionNo} 또는 publicRetina_image_{versionNo}
+            image_collection_name=f"publicRetina_image_{version_no}" if is_admin else f"h{offer_no}_image_{version_no}",
+            public_image_collection_name=None if is_admin else f"publicRetina_image_{public_version}",
         )
-        candidates = search_primary.get("result", {}).get("candidateEmbeddings", [])
-        
-        if not is_admin:
-            public_params = dict(retrieval_param or {})
-            public_params.setdefault("partition", "public")
-            try:
-                search_public = await self.gateway_client.request_search(
-                    embedding=embedding,
-                    collection_name=public_collection_name,
-                    strategy=retrieval_strategy,
-                    parameters=public_params
-                )
-                candidates += search_public.get("result", {}).get("candidateEmbeddings", [])
-            except Exception as se:
-                logger.warning("Public partition search failed or skipped: {}", se)
         
-        # 4-1) Search Image - 이미지 컬렉션 (컬렉션 이름에 _image_ 추가)
-        candidates_image = []
-        if embedding_image:
-            try:
-                # 컬렉션 이름 형식: h{offerNo}_image_{versionNo} 또는 publicRetina_image_{versionNo}
-                if is_admin:
-                    image_collection_name = f"publicRetina_image_{version_no}"
-                else:
-                    image_collection_name = f"h{offer_no}_image_{version_no}"
-                search_image_primary = await self.gateway_client.request_search_image(
-                    embedding=embedding_image,
-                    collection_name=image_collection_name,
-                    strategy=retrieval_strategy,
-                    parameters=retrieval_param or {}
-                )
-                candidates_image = search_image_primary.get("result", {}).get("candidateEmbeddings", [])
-                
-                # USER의 경우 publicRetina 이미지 컬렉션도 추가 검색
-                if not is_admin:
-                    public_image_collection_name = f"publicRetina_image_{public_version}"
-                    public_image_params = dict(retrieval_param or {})
-                    public_image_params.setdefault("partition", "public")
-                    try:
-                        search_image_public = await self.gateway_client.request_search_image(
-                            embedding=embedding_image,
-                            collection_name=public_image_collection_name,
-                            strategy=retrieval_strategy,
-                            parameters=public_image_params
-                        )
-                        candidates_image += search_image_public.get("result", {}).get("candidateEmbeddings", [])
-                    except Exception as se:
-                        logger.warning("Public image partition search failed or skipped: {}", se)
-            except Exception as e:
-                logger.warning(f"Image search failed: {str(e)}, continuing without image results")
-                candidates_image = []
-        
-        # 5) Cross-Encoder
-        cross_res = await self.gateway_client.request_cross_encoder(
+        # 5) Cross-Encoder - 텍스트/이미지 후보 재정렬
+        retrieved_chunks, retrieved_chunks_image = await self._rerank_candidates(
             query=request.query,
-            candidate_embeddings=candidates,
-            strategy=reranking_strategy,
-            parameters=reranking_param or {}
+            candidates=candidates,
+            candidates_image=candidates_image,
+            reranking_strategy=reranking_strategy,
+            reranking_param=reranking_param or {},
         )
-        retrieved_chunks = cross_res.get("result", {}).get("retrievedChunks", [])
-        
-        # 5-1) Cross-Encoder Image - 같은 방식으로 candidates_image 전달
-        retrieved_chunks_image = []
-        if candidates_image:
-            try:
-                cross_image_res = await self.gateway_client.request_cross_encoder_image(
-                    query=request.query,
-                    candidate_embeddings=candidates_image,
-                    strategy=reranking_strategy,
-                    parameters=reranking_param or {}
-                )
-                retrieved_chunks_image = cross_image_res.get("result", {}).get("retrievedChunks", [])
-            except Exception as e:
-                logger.warning(f"Image cross-encoder failed: {str(e)}, continuing without image reranking")
-                retrieved_chunks_image = []
 
         # 6) Generation (스트리밍)
         # text와 image 결과를 따로 전달 (generation에서 구분 가능하도록)
@@ -0,0 +1,57 @@
+"""Vector collection naming and layout (settings.collection_layout).
+
+- ``per_offer``: one Milvus collection per offer, ``h{offer_no}_{version}`` / ``h{offer_no}_image_{version}``.
+- ``partition_key``: one shared collection per model and version, ``{prefix}_{version}`` /
+  ``{prefix}_image_{version}``, with ``offer_no`` as the Milvus partition key.
+
+Callers keep using the logical per-offer names; they are mapped to the physical collection plus an
+``offer_no`` condition right before Milvus is accessed. Must follow the same rules as
+``app/service/collection_layout.py`` in the embedding and search services.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import NamedTuple, Optional
+
+from app.core.config.settings import settings
+
+
+LAYOUT_PARTITION_KEY = "partition_key"
+OFFER_FIELD = "offer_no"
+PUBLIC_COLLECTION_BASE = "publicRetina"
+OFFER_COLLECTION_PATTERN = re.compile(r"^h(?P<offer_no>[^_]+)(?P<image>_image)?_(?P<version>\d+)$")
+
+
+class CollectionTarget(NamedTuple):
+    """Physical collection and offer condition (``offer_no`` is None outside the partition_key layout)."""
+
+    name: str
+    offer_no: Optional[str] = None
+
+    def scoped(self, expr: str) -> str:
+        """AND the offer condition into ``expr``."""
+        if not self.offer_no:
+            return expr
+        offer_expr = f"{OFFER_FIELD} == {json.dumps(self.offer_no)}"
+        return f"({offer_expr}) and ({expr})" if expr else offer_expr
+
+
+def logical_collection_name(base_name: str, version: int, *, image: bool = False) -> str:
+    """Name used by ingest: ``{base}_{version}`` or ``{base}_image_{version}``.
+
+    ``base_name`` is ``h{offer_no}`` or ``publicRetina``.
+    """
+    return f"{base_name}{'_image' if image else ''}_{version}"
+
+
+def resolve_collection(collection_name: str) -> CollectionTarget:
+    """Map a logical collection name to the physical collection for the configured layout."""
+    if settings.collection_layout != LAYOUT_PARTITION_KEY:
+        return CollectionTarget(collection_name)
+    match = OFFER_COLLECTION_PATTERN.match(collection_name or "")
+    if not match:
+        return CollectionTarget(collection_name)
+    shared = logical_collection_name(settings.shared_collection_prefix, int(match.group("version")), image=bool(match.group("image")))
+    return CollectionTarget(shared, match.group("offer_no"))
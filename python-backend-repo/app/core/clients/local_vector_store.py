@@ -0,0 +1,72 @@
+"""Local vector store sidecar access (vector_store_backend=local).
+
+The embedding/search services keep each collection in
+``{local_vector_store_path}/{collection}/`` (vectors.f32 + scalars.sqlite + optional hnsw.bin).
+Deleting only needs the SQLite sidecar: rows are soft-deleted (``deleted = 1``) under the same
+``.lock`` file lock the writers use, and searches skip deleted rows.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import logging
+import os
+import sqlite3
+from typing import Optional, Sequence
+
+from app.core.config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+SCALAR_FILE = "scalars.sqlite"
+LOCK_FILE = ".lock"
+
+
+def _collection_path(collection_name: str) -> str:
+    return os.path.join(settings.local_vector_store_path, collection_name)
+
+
+def delete_by_file_nos(
+    collection_name: str,
+    file_nos: Sequence[str],
+    *,
+    partition_name: Optional[str] = None,
+) -> int:
+    """Soft-delete rows of the given files. Returns number of rows marked deleted."""
+    if not file_nos:
+        return 0
+    path = _collection_path(collection_name)
+    if not os.path.exists(os.path.join(path, SCALAR_FILE)):
+        logger.warning("Local vector store collection not found: %s", collection_name)
+        return 0
+
+    clauses = [f"file_no IN ({', '.join('?' for _ in file_nos)})"]
+    params: list = [str(v) for v in file_nos]
+    if partition_name:
+        clauses.append("partition = ?")
+        params.append(partition_name)
+
+    with open(os.path.join(path, LOCK_FILE), "a+") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            conn = sqlite3.connect(os.path.join(path, SCALAR_FILE), timeout=30)
+            try:
+                count = conn.execute(
+                    f"UPDATE rows SET deleted = 1 WHERE deleted = 0 AND {' AND '.join(clauses)}",
+                    params,
+                ).rowcount
+                conn.commit()
+            finally:
+                conn.close()
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    logger.info(
+        "Local vector delete: collection=%s partition=%s file_nos=%s deleted=%s",
+        collection_name,
+        partition_name,
+        list(file_nos),
+        count,
+    )
+    return count
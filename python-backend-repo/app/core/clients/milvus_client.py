@@ -31,7 +31,8 @@ def get_collection(name: str) -> Collection:
 def delete_by_expr(collection_name: str, expr: str, *, partition_name: str | None = None) -> int:
     """Delete vectors by boolean expression. Returns number of entities marked deleted.
 
-    Milvus performs soft deletion; compaction may be required to purge.
+    Milvus performs soft deletion; compaction may be required to purge
+    (deleted counts are tracked for the embedding service compaction job).
     """
     try:
         col = get_collection(collection_name)
@@ -47,7 +48,7 @@ def delete_by_expr(collection_name: str, expr: str, *, partition_name: str | Non
             expr,
             res,
         )
-        return 1
+        return int(getattr(res, "delete_count", 0) or 0)
     except Exception as e:
         logger.warning(
             "Milvus delete failed: collection=%s partition=%s expr=%s error=%s",
@@ -0,0 +1,35 @@
+"""Vector deletion routed to the configured backend (settings.vector_store_backend)."""
+
+from __future__ import annotations
+
+from app.core.config.settings import settings
+
+
+def delete_by_field(
+    collection_name: str,
+    field: str,
+    value: str,
+    *,
+    partition_name: str | None = None,
+) -> int:
+    """Delete vectors whose ``field`` equals ``value``.
+
+    - milvus: ``{field} == '{value}'`` boolean expression delete; with the partition_key layout the
+      logical offer collection is mapped to the shared collection and scoped by ``offer_no``
+    - local: soft delete in the SQLite sidecar (only ``file_no`` is supported)
+    """
+    if settings.vector_store_backend == "local":
+        from app.core.clients.local_vector_store import delete_by_file_nos
+
+        if field != "file_no":
+            raise ValueError(f"Local vector store can only delete by file_no (got {field})")
+        return delete_by_file_nos(collection_name, [value], partition_name=partition_name)
+
+    from app.core.clients.collection_layout import resolve_collection
+    from app.core.clients.milvus_client import delete_by_expr
+
+    target = resolve_collection(collection_name)
+    if target.offer_no:
+        # partition key collections have no named partitions
+        partition_name = None
+    return delete_by_expr(target.name, target.scoped(f"{field} == '{value}'"), partition_name=partition_name)
@@ -120,9 +120,17 @@ class Settings(BaseSettings):
     redis_metrics_db: int = 8
     ingest_meta_ttl_sec: int = 0  # 0 or less disables TTL
 
+    # Vector store backend: "milvus" or "local" (directory shared with embedding/search services)
+    vector_store_backend: str = "milvus"
+    local_vector_store_path: str = "./data/vector_store"
+    # Offer collection layout: "per_offer" (h{offer_no}_{version}) or "partition_key"
+    # ({prefix}_{version} shared collection keyed by offer_no); must match embedding/search services
+    collection_layout: str = "per_offer"
+    shared_collection_prefix: str = "offers"
+
     # Milvus settings (direct access)
     milvus_host: str = ""
-    milvus_port: int
+    milvus_port: int = 19530
     milvus_collection: str = ""  # e.g., "documents" or "chunks"
     milvus_pk_field: str = "file_no"  # field name storing file UUID as string
     milvus_path_field: str = "path"  # optional secondary field to match by path
@@ -9,13 +9,17 @@ from sqlalchemy import select, delete as sqla_delete
 
 from app.core.clients.minio_client import remove_object
 from app.core.config.settings import settings
-from app.core.clients.milvus_client import delete_by_expr
+from app.core.clients.vector_store_client import delete_by_field
+from app.core.clients.collection_layout import PUBLIC_COLLECTION_BASE, logical_collection_name, resolve_collection
+from app.core.clients.redis_client import get_redis_client
 from app.domains.collection.models.collection import Collection
 from app.domains.file.models.file import File
 
 
 logger = logging.getLogger(__name__)
 
+DELETED_ROWS_KEY = "milvus:deleted_rows"
+
 
 def _uuid_bytes_to_str(b: bytes) -> str:
     try:
@@ -24,6 +28,32 @@ def _uuid_bytes_to_str(b: bytes) -> str:
         return b.hex()
 
 
+async def _bump_search_cache_version(collection_name: str) -> None:
+    """Invalidate search-repo cached results for a collection after vector deletion.
+
+    search 서비스는 search:collection_version:{collection} 값이 바뀐 캐시를 사용하지 않는다.
+    Redis 오류는 삭제 흐름을 막지 않으며, 캐시는 TTL 로 만료된다.
+    """
+    try:
+        await get_redis_client().incr(f"search:collection_version:{collection_name}")
+    except Exception as e:
+        logger.warning("Failed to bump search cache version for %s: %s", collection_name, e)
+
+
+async def _record_deleted_rows(collection_name: str, deleted: int) -> None:
+    """Accumulate Milvus tombstone counts for the compaction job.
+
+    embedding 서비스의 app/scripts/compact_collections.py 가 milvus:deleted_rows 해시(실제 컬렉션 이름별)를
+    읽어 임계값을 넘은 컬렉션을 compact 한다. Redis 오류는 삭제 흐름을 막지 않는다.
+    """
+    if deleted <= 0 or settings.vector_store_backend == "local":
+        return
+    try:
+        await get_redis_client().hincrby(DELETED_ROWS_KEY, resolve_collection(collection_name).name, deleted)
+    except Exception as e:
+        logger.warning("Failed to record deleted rows for %s: %s", collection_name, e)
+
+
 async def _load_children_by_source(
     session: AsyncSession,
     source_file_no: bytes,
@@ -85,6 +115,7 @@ async def delete_file_entity(
 
     special_partitions = {"hebees", "public"}
     coll_name: Optional[str] = None
+    coll_version: Optional[int] = None
     if getattr(file_row, "collection_no", None):
         logger.warning(
             "Source file %s has collection_no; resolving collection row",
@@ -93,17 +124,20 @@ async def delete_file_entity(
         try:
             coll = await session.get(Collection, file_row.collection_no)
             coll_name = getattr(coll, "name", None) if coll else None
+            coll_version = getattr(coll, "version", None) if coll else None
         except Exception:
             coll_name = None
 
+    # Logical names follow ingest (version 1 when the collection row is unknown); the configured
+    # layout maps offer collections to the shared partition-key collection at delete time.
     if coll_name in special_partitions:
-        milvus_collection_name = "publicRetina_1"
+        milvus_collection_name = logical_collection_name(PUBLIC_COLLECTION_BASE, coll_version or 1)
         partition_name = coll_name  # 'hebees' or 'public'
     else:
-        # Offer-based dedicated collection, e.g., h{offer_no}_1
+        # Offer-based collection, e.g., h{offer_no}_{version}
         offer_no = getattr(file_row, "offer_no", None) or ""
         if offer_no:
-            milvus_collection_name = f"h{offer_no}_1"
+            milvus_collection_name = logical_collection_name(f"h{offer_no}", coll_version or 1)
 
     if milvus_collection_name:
         file_no_str = _uuid_bytes_to_str(file_row.file_no)
@@ -118,7 +152,9 @@ async def delete_file_entity(
             partition_name,
             expr1,
         )
-        delete_by_expr(milvus_collection_name, expr1, partition_name=partition_name)
+        deleted = delete_by_field(milvus_collection_name, pk_field, file_no_str, partition_name=partition_name)
+        await _record_deleted_rows(milvus_collection_name, deleted)
+        await _bump_search_cache_version(milvus_collection_name)
     else:
         logger.warning("Milvus target for source file could not be resolved; skipping vector deletion for source.")
 
@@ -143,10 +179,10 @@ async def delete_file_entity(
             if version is not None:
                 if base_name in {"public", "hebees"} :
                     # public / hebees 컬렉션은 모두 publicRetina_image_{version} 안의 파티션으로 저장됨
-                    image_collection_name = f"publicRetina_image_{version}"
+                    image_collection_name = logical_collection_name(PUBLIC_COLLECTION_BASE, version, image=True)
                 elif base_name.startswith("h"):
                     # h{offerNo} -> h{offerNo}_image_{version}
-                    image_collection_name = f"{base_name}_image_{version}"
+                    image_collection_name = logical_collection_name(base_name, version, image=True)
 
     if image_collection_name and child_files:
         parent_file_no_str = _uuid_bytes_to_str(file_row.file_no)
@@ -166,7 +202,9 @@ async def delete_file_entity(
             image_collection_name,
             expr_child,
         )
-        delete_by_expr(image_collection_name, expr_child)
+        deleted = delete_by_field(image_collection_name, image_pk_field, parent_file_no_str)
+        await _record_deleted_rows(image_collection_name, deleted)
+        await _bump_search_cache_version(image_collection_name)
     else:
         if child_files:
             logger.warning(
@@ -11,6 +11,7 @@ from ..services.runpod_service import (
     create_runpod as create_runpod_service,
     get_all_runpods,
     update_runpod_by_name as update_runpod_by_name_service,
+    delete_runpod_by_name as delete_runpod_by_name_service,
     bytes_to_hex,
 )
 from ..repositories.runpod_repository import RunpodRepository
@@ -143,15 +144,13 @@ async def delete_runpod_by_name(
     x_user_role: str = Depends(check_role("ADMIN")),
     session: AsyncSession = Depends(get_db),
 ):
-    runpod = await RunpodRepository.find_by_name(session, name)
-    
-    if not runpod:
+    try:
+        await delete_runpod_by_name_service(session, name)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Runpod를 찾을 수 없습니다."
+            detail=str(e)
         )
     
-    await RunpodRepository.delete(session, runpod)
-    
     return None
 
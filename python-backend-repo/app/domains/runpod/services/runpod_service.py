@@ -2,15 +2,38 @@
 Runpod 서비스
 비즈니스 로직 처리
 """
+import json
+import logging
 import uuid
+from typing import Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.clients.redis_client import get_redis_client
+
 from ..models.runpod import Runpod
 from ..repositories.runpod_repository import RunpodRepository
 from ..schemas.request.create_request import RunpodCreateRequest
 from ..schemas.request.update_request import RunpodUpdateRequest
 
 
+logger = logging.getLogger(__name__)
+
+# Runpod 주소를 캐시하는 서비스(query-embedding 등)가 구독하는 채널
+RUNPOD_INVALIDATE_CHANNEL = "runpod:invalidate"
+
+
+async def _publish_invalidation(names: Iterable[str]) -> None:
+    """Notify subscribers that cached addresses for ``names`` are stale.
+
+    Redis 오류는 CRUD 응답을 막지 않는다 (구독 측 TTL 만료로 반영된다).
+    """
+    payload = json.dumps({"names": sorted({name for name in names if name})})
+    try:
+        await get_redis_client().publish(RUNPOD_INVALIDATE_CHANNEL, payload)
+    except Exception as e:
+        logger.warning("Failed to publish runpod invalidation %s: %s", payload, e)
+
+
 def bytes_to_hex(byte_data: bytes) -> str:
     """바이트를 16진수 문자열로 변환"""
     return byte_data.hex() if byte_data else ""
@@ -26,7 +49,9 @@ async def create_runpod(
         address=request.address,
     )
     
-    return await RunpodRepository.save(session, runpod)
+    saved = await RunpodRepository.save(session, runpod)
+    await _publish_invalidation([saved.name])
+    return saved
 
 async def get_all_runpods(
     session: AsyncSession
@@ -47,4 +72,19 @@ async def update_runpod_by_name(
     runpod.name = request.name
     runpod.address = request.address
     
-    return await RunpodRepository.update(session, runpod)
\ No newline at end of file
+    updated = await RunpodRepository.update(session, runpod)
+    # 이전 이름과 새 이름 모두 무효화
+    await _publish_invalidation([name, updated.name])
+    return updated
+
+async def delete_runpod_by_name(
+    session: AsyncSession,
+    name: str
+) -> None:
+    runpod = await RunpodRepository.find_by_name(session, name)
+
+    if not runpod:
+        raise ValueError("Runpod를 찾을 수 없습니다.")
+
+    await RunpodRepository.delete(session, runpod)
+    await _publish_invalidation([name])
\ No newline at end of file
@@ -17,6 +17,15 @@ class Settings(BaseSettings):
     redis_password: Optional[str] = None
     redis_db: int = 1
 
+    # Runpod 주소 캐시 TTL (backend 수정 시 runpod:invalidate 메시지로 즉시 무효화)
+    runpod_cache_ttl_seconds: float = 300.0
+
+    # 쿼리 임베딩 캐시 ((모델, 정규화 텍스트) → float16 벡터)
+    query_embedding_cache_enabled: bool = True
+    query_embedding_cache_max_entries: int = 20_000
+    query_embedding_cache_redis_enabled: bool = False  # Redis 2차 캐시 (인스턴스 간 공유)
+    query_embedding_cache_redis_ttl_seconds: int = 86400
+
     # 로깅 설정
     logging_level: str = "INFO"
     log_file_enabled: bool = False
@@ -5,6 +5,9 @@ from .config import settings
 from .routers import router
 from datetime import datetime
 from .core.openapi import custom_openapi
+from .services.runpod_service import run_invalidation_listener
+from .services.projection_service import run_invalidation_listener as run_projection_invalidation_listener
+import asyncio
 
 app = FastAPI(
     title=__title__,
@@ -25,6 +28,22 @@ app.openapi = lambda: custom_openapi(app)
 # Router 등록
 app.include_router(router)
 
+
+@app.on_event("startup")
+async def startup_event():
+    """Runpod 주소 / 투영 캐시 무효화 메시지 구독 시작"""
+    app.state.runpod_listener_task = asyncio.create_task(run_invalidation_listener())
+    app.state.projection_listener_task = asyncio.create_task(run_projection_invalidation_listener())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for name in ("runpod_listener_task", "projection_listener_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+
+
 @app.get("/")
 async def root():
     return {
@@ -0,0 +1,30 @@
+"""
+COLLECTION_PROJECTION 테이블 모델
+컬렉션별 PCA 투영 행렬(차원 축소)을 조회하는 모델 (embedding 서비스에서 생성)
+"""
+from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy.dialects.mysql import LONGBLOB
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+
+class CollectionProjection(Base):
+    """
+    COLLECTION_PROJECTION 테이블 모델
+    - MEAN: float32 평균 벡터 (SOURCE_DIM)
+    - COMPONENTS: float32 주성분 행렬 (TARGET_DIM x SOURCE_DIM, row-major)
+    """
+    __tablename__ = "COLLECTION_PROJECTION"
+
+    collection_name = Column("COLLECTION_NAME", String(255), primary_key=True, comment="Milvus 컬렉션 이름")
+    source_dim = Column("SOURCE_DIM", Integer, nullable=False, comment="원본 벡터 차원")
+    target_dim = Column("TARGET_DIM", Integer, nullable=False, comment="투영 후 벡터 차원")
+    mean = Column("MEAN", LONGBLOB, nullable=False, comment="float32 평균 벡터")
+    components = Column("COMPONENTS", LONGBLOB, nullable=False, comment="float32 주성분 행렬")
+    explained_variance = Column("EXPLAINED_VARIANCE", Float, nullable=True, comment="누적 설명 분산 비율")
+    created_at = Column("CREATED_AT", DateTime, nullable=False)
+    updated_at = Column("UPDATED_AT", DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<CollectionProjection(collection_name={self.collection_name}, source_dim={self.source_dim}, target_dim={self.target_dim})>"
@@ -1,9 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from app.schemas.request.queryEmbeddingRequest import QueryEmbeddingProcessRequest
-from app.schemas.response.queryEmbeddingProcessResponse import QueryEmbeddingProcessResponse, QueryEmbeddingProcessResult
+from app.schemas.request.queryEmbeddingRequest import QueryEmbeddingProcessRequest, QueryEmbeddingMultiRequest, QueryEmbeddingModelRequest
+from app.schemas.response.queryEmbeddingProcessResponse import (
+    QueryEmbeddingProcessResponse,
+    QueryEmbeddingProcessResult,
+    QueryEmbeddingMultiResponse,
+    QueryEmbeddingMultiResult,
+)
 from app.schemas.response.errorResponse import ErrorResponse
 from app.middleware.metrics_middleware import with_query_embedding_metrics
-from typing import Dict, Any
+from app.services.projection_service import ProjectionService
+from app.services.embedding_cache import EmbeddingCache
+from typing import Dict, Any, List
 import importlib
 import asyncio
 from loguru import logger
@@ -71,6 +78,12 @@ def get_strategy(strategy_name: str, parameters: Dict[Any, Any] = None) -> Any:
         )
 
 
+@router.get("/cache/stats")
+async def embedding_cache_stats():
+    """쿼리 임베딩 캐시 적중률"""
+    return EmbeddingCache.stats()
+
+
 @router.post("/process")
 @with_query_embedding_metrics
 async def query_embedding_process(request: QueryEmbeddingProcessRequest):
@@ -100,6 +113,9 @@ async def query_embedding_process(request: QueryEmbeddingProcessRequest):
         else:
             result = strategy.embed(query)
 
+        # 컬렉션별 PCA 투영 적용
+        projected = await ProjectionService.project(result["embedding"], request.collectionNames)
+
         # Response 생성
         response = QueryEmbeddingProcessResponse(
             status=200,
@@ -111,7 +127,8 @@ async def query_embedding_process(request: QueryEmbeddingProcessRequest):
                 embedding=result["embedding"],
                 dimension=result["dimension"],
                 strategy=result["strategy"],
-                parameters=result["parameters"]
+                parameters=result["parameters"],
+                projectedEmbeddings=projected
             )
         )
         return response
@@ -165,6 +182,9 @@ async def query_embedding_process_image(request: QueryEmbeddingProcessRequest):
         else:
             result = strategy.embed(query)
 
+        # 컬렉션별 PCA 투영 적용
+        projected = await ProjectionService.project(result["embedding"], request.collectionNames)
+
         # Response 생성
         response = QueryEmbeddingProcessResponse(
             status=200,
@@ -176,7 +196,8 @@ async def query_embedding_process_image(request: QueryEmbeddingProcessRequest):
                 embedding=result["embedding"],
                 dimension=result["dimension"],
                 strategy=result["strategy"],
-                parameters=result["parameters"]
+                parameters=result["parameters"],
+                projectedEmbeddings=projected
             )
         )
         return response
@@ -200,3 +221,110 @@ async def query_embedding_process_image(request: QueryEmbeddingProcessRequest):
         )
         raise HTTPException(status_code=500, detail=error_response.dict())
 
+
+async def _embed_with_strategy(query: str, spec: QueryEmbeddingModelRequest) -> QueryEmbeddingProcessResult:
+    """전략 하나로 임베딩 후 컬렉션별 PCA 투영까지 적용"""
+    strategy = get_strategy(spec.model, spec.parameters)
+
+    if asyncio.iscoroutinefunction(strategy.embed):
+        result = await strategy.embed(query)
+    else:
+        result = strategy.embed(query)
+
+    projected = await ProjectionService.project(result["embedding"], spec.collectionNames)
+    return QueryEmbeddingProcessResult(
+        query=result["query"],
+        embedding=result["embedding"],
+        dimension=result["dimension"],
+        strategy=result["strategy"],
+        parameters=result["parameters"],
+        projectedEmbeddings=projected
+    )
+
+
+@router.post("/embed/multi")
+@with_query_embedding_metrics
+async def query_embedding_multi(request: QueryEmbeddingMultiRequest):
+    """
+    Query Embedding /embed/multi 엔드포인트
+    - 한 쿼리에 대해 요청한 모델(전략)들의 임베딩을 동시에 계산해 모델별로 반환
+      (텍스트 e5Large + 이미지 검색용 mclip을 /process, /process/image 두 번 대신 한 번에 요청)
+    - 일부 모델만 실패하면 성공한 모델은 embeddings, 실패한 모델은 errors에 담아 반환
+    - 모든 모델이 실패하면 첫 번째 오류로 실패 응답
+    """
+    try:
+        query = request.query
+        if not query or not query.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="query cannot be empty"
+            )
+
+        specs: List[QueryEmbeddingModelRequest] = [
+            QueryEmbeddingModelRequest(model=spec) if isinstance(spec, str) else spec
+            for spec in request.models
+        ]
+        if not specs:
+            raise HTTPException(
+                status_code=400,
+                detail="models cannot be empty"
+            )
+        names = [spec.model for spec in specs]
+        if len(set(names)) != len(names):
+            raise HTTPException(
+                status_code=400,
+                detail=f"models must be unique: {names}"
+            )
+
+        logger.info(f"Processing multi query embedding: {query[:50]}... with models: {names}")
+
+        results = await asyncio.gather(
+            *(_embed_with_strategy(query, spec) for spec in specs),
+            return_exceptions=True
+        )
+
+        embeddings: Dict[str, QueryEmbeddingProcessResult] = {}
+        errors: Dict[str, str] = {}
+        for name, result in zip(names, results):
+            if isinstance(result, HTTPException):
+                errors[name] = str(result.detail)
+            elif isinstance(result, Exception):
+                errors[name] = str(result)
+            else:
+                embeddings[name] = result
+        if not embeddings:
+            first = results[0]
+            raise first if isinstance(first, HTTPException) else HTTPException(status_code=500, detail=errors[names[0]])
+        if errors:
+            logger.warning(f"Multi query embedding partially failed: {errors}")
+
+        return QueryEmbeddingMultiResponse(
+            status=200,
+            code="OK",
+            message="요청에 성공하였습니다.",
+            isSuccess=True,
+            result=QueryEmbeddingMultiResult(
+                query=query,
+                embeddings=embeddings,
+                errors=errors
+            )
+        )
+    except HTTPException as e:
+        error_response = ErrorResponse(
+            status=e.status_code,
+            code="VALIDATION_ERROR" if e.status_code == 400 else "NOT_FOUND" if e.status_code == 404 else "INTERNAL_ERROR",
+            message=str(e.detail),
+            isSuccess=False,
+            result={}
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response.dict())
+    except Exception as e:
+        logger.error(f"Error processing multi query embedding: {str(e)}", exc_info=True)
+        error_response = ErrorResponse(
+            status=500,
+            code="INTERNAL_ERROR",
+            message=f"Internal server error: {str(e)}",
+            isSuccess=False,
+            result={}
+        )
+        raise HTTPException(status_code=500, detail=error_response.dict())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 
 
 class QueryEmbeddingProcessRequest(BaseModel):
@@ -7,4 +7,19 @@ class QueryEmbeddingProcessRequest(BaseModel):
     query: str
     queryEmbeddingStrategy: str
     queryEmbeddingParameter: Dict[Any, Any] = {}
+    # PCA 투영을 적용할 대상 컬렉션 (투영이 등록된 컬렉션만 projectedEmbeddings에 포함)
+    collectionNames: List[str] = []
 
+
+
+class QueryEmbeddingModelRequest(BaseModel):
+    """Query Embedding /embed/multi 모델별 요청 (model은 전략 이름이며 응답 embeddings의 키)"""
+    model: str
+    parameters: Dict[Any, Any] = {}
+    collectionNames: List[str] = []
+
+
+class QueryEmbeddingMultiRequest(BaseModel):
+    """Query Embedding /embed/multi 요청 스키마 (models: 전략 이름 문자열 또는 모델별 요청)"""
+    query: str
+    models: List[Union[str, QueryEmbeddingModelRequest]]
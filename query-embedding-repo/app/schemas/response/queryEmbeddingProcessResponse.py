@@ -9,6 +9,7 @@ class QueryEmbeddingProcessResult(BaseModel):
     dimension: int
     strategy: str
     parameters: Dict[Any, Any]
+    projectedEmbeddings: Dict[str, List[float]] = {}
 
 
 class QueryEmbeddingProcessResponse(BaseModel):
@@ -20,10 +21,17 @@ class QueryEmbeddingProcessResponse(BaseModel):
     result: QueryEmbeddingProcessResult
 
 
+class QueryEmbeddingMultiResult(BaseModel):
+    """Query Embedding /embed/multi 결과 스키마 (모델별 결과, 실패한 모델은 errors)"""
+    query: str
+    embeddings: Dict[str, QueryEmbeddingProcessResult]
+    errors: Dict[str, str] = {}
 
 
-
-
-
-
-
+class QueryEmbeddingMultiResponse(BaseModel):
+    """Query Embedding /embed/multi 응답 스키마"""
+    status: int
+    code: str
+    message: str
+    isSuccess: bool
+    result: QueryEmbeddingMultiResult
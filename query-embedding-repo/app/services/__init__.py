@@ -5,9 +5,11 @@ Services 모듈
 
 from .runpod_service import RunpodService
 from .embedding_client import EmbeddingClient
+from .embedding_cache import EmbeddingCache
 
 __all__ = [
     "RunpodService",
-    "EmbeddingClient"
+    "EmbeddingClient",
+    "EmbeddingCache"
 ]
 
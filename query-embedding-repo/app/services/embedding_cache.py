@@ -0,0 +1,113 @@
+"""
+쿼리 임베딩 캐시 모듈
+반복/인기 질문이 매번 Runpod 임베딩을 다시 호출하지 않도록 (모델, 정규화 텍스트) 키로 벡터를 캐시
+- 1차: 프로세스 내 LRU (query_embedding_cache_max_entries)
+- 2차(선택): Redis qemb:{모델}:{텍스트 해시} (query_embedding_cache_redis_enabled, 인스턴스 간 공유, TTL)
+- 벡터는 float16 bytes로 저장 (1024차원 기준 2KB)
+- 텍스트 정규화: NFKC + 앞뒤/연속 공백 정리 (대소문자는 유지)
+"""
+import hashlib
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from app.core.settings import settings
+from loguru import logger
+
+CACHE_KEY_PREFIX = "qemb"
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화"""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def _cache_key(model_name: str, text: str) -> str:
+    digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{model_name}:{digest}"
+
+
+class EmbeddingCache:
+    """쿼리 임베딩 LRU 캐시 (이벤트 루프 안에서만 사용)"""
+
+    _cache: "OrderedDict[str, bytes]" = OrderedDict()
+    _stats: Dict[str, int] = {"lookups": 0, "memoryHits": 0, "redisHits": 0, "misses": 0}
+    _redis = None
+
+    @classmethod
+    def _get_redis(cls):
+        if cls._redis is None:
+            import redis.asyncio as redis
+            cls._redis = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                socket_timeout=0.5,
+            )
+        return cls._redis
+
+    @classmethod
+    def _remember(cls, key: str, value: bytes) -> None:
+        cls._cache[key] = value
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > settings.query_embedding_cache_max_entries:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    async def get(cls, model_name: str, text: str) -> Optional[List[float]]:
+        """
+        캐시된 임베딩 조회
+
+        Returns:
+            임베딩 벡터 (float16 정밀도) 또는 None
+        """
+        if not settings.query_embedding_cache_enabled:
+            return None
+        key = _cache_key(model_name, text)
+        cls._stats["lookups"] += 1
+        value = cls._cache.get(key)
+        if value is not None:
+            cls._cache.move_to_end(key)
+            cls._stats["memoryHits"] += 1
+        elif settings.query_embedding_cache_redis_enabled:
+            try:
+                value = await cls._get_redis().get(key)
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] Redis lookup failed: {e}")
+                value = None
+            if value is not None:
+                cls._remember(key, value)
+                cls._stats["redisHits"] += 1
+        if value is None:
+            cls._stats["misses"] += 1
+            return None
+        return np.frombuffer(value, dtype=np.float16).astype(np.float32).tolist()
+
+    @classmethod
+    async def put(cls, model_name: str, text: str, embedding: List[float]) -> None:
+        """임베딩 저장 (float16)"""
+        if not settings.query_embedding_cache_enabled:
+            return
+        key = _cache_key(model_name, text)
+        value = np.asarray(embedding, dtype=np.float16).tobytes()
+        cls._remember(key, value)
+        if settings.query_embedding_cache_redis_enabled:
+            try:
+                await cls._get_redis().set(key, value, ex=settings.query_embedding_cache_redis_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] Redis store failed: {e}")
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """조회 수, 계층별 적중 수와 적중률"""
+        stats: Dict[str, Any] = dict(cls._stats)
+        lookups = stats["lookups"]
+        stats["hitRatio"] = (stats["memoryHits"] + stats["redisHits"]) / lookups if lookups else 0.0
+        stats["entries"] = len(cls._cache)
+        stats["memoryBytes"] = sum(len(value) for value in cls._cache.values())
+        stats["maxEntries"] = settings.query_embedding_cache_max_entries
+        stats["redisEnabled"] = settings.query_embedding_cache_redis_enabled
+        return stats
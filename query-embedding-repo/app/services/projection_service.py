@@ -0,0 +1,152 @@
+"""
+Projection 서비스 모듈
+컬렉션별 PCA 투영 행렬을 DB에서 조회하여 쿼리 임베딩에 적용
+- 투영 등록/컬렉션 교체 시 embedding-repo fit_projection 스크립트가 Redis projection:invalidate 채널로 발행하는 메시지를 구독해 즉시 무효화
+- DB 조회 실패 시 마지막으로 조회한 투영을 계속 사용하고, 조회한 적이 없으면 예외 (투영된 컬렉션에 원본 차원 벡터를 보내지 않도록)
+"""
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.core.settings import settings
+from app.models.collection_projection import CollectionProjection
+from loguru import logger
+
+# embedding-repo app/service/projection_service.py 와 같은 채널
+PROJECTION_INVALIDATE_CHANNEL = "projection:invalidate"
+
+
+class ProjectionService:
+    """컬렉션별 투영 행렬 조회/적용 서비스 (프로세스 내 TTL 캐시)"""
+
+    _cache: Dict[str, Tuple[float, Optional[Tuple[np.ndarray, np.ndarray]]]] = {}
+    ttl_seconds: float = 60.0
+
+    @classmethod
+    def invalidate(cls, names: Optional[Iterable[str]] = None) -> None:
+        """
+        캐시 무효화 (names가 없으면 전체)
+
+        항목은 만료 처리만 하고 남겨 두어, 다음 DB 조회가 실패하면 마지막 값을 사용합니다.
+        """
+        for name in (list(cls._cache) if names is None else names):
+            cached = cls._cache.get(name)
+            if cached:
+                cls._cache[name] = (float("-inf"), cached[1])
+
+    @classmethod
+    async def _get(cls, collection_name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        now = time.monotonic()
+        cached = cls._cache.get(collection_name)
+        if cached and now - cached[0] < cls.ttl_seconds:
+            return cached[1]
+
+        projection = None
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(CollectionProjection).where(CollectionProjection.collection_name == collection_name)
+                )
+                row = result.scalar_one_or_none()
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning(f"[ProjectionService] Failed to refresh projection for '{collection_name}', using last known value: {str(e)}")
+            return cached[1]
+        if row:
+            mean = np.frombuffer(row.mean, dtype=np.float32)
+            components = np.frombuffer(row.components, dtype=np.float32).reshape(row.target_dim, row.source_dim)
+            projection = (mean, components)
+            logger.info(f"[ProjectionService] Loaded projection for '{collection_name}': {row.source_dim} -> {row.target_dim}")
+
+        cls._cache[collection_name] = (now, projection)
+        return projection
+
+    @classmethod
+    async def project(cls, embedding: List[float], collection_names: List[str]) -> Dict[str, List[float]]:
+        """
+        투영 행렬이 등록된 컬렉션에 대해서만 투영된 임베딩 반환
+
+        Args:
+            embedding: 원본 쿼리 임베딩
+            collection_names: 검색 대상 컬렉션 이름 리스트
+
+        Returns:
+            {컬렉션 이름: 투영된 임베딩} (투영이 없는 컬렉션은 제외)
+
+        Raises:
+            RuntimeError: 투영 조회에 실패했고 마지막 값도 없는 경우
+            ValueError: 임베딩 차원이 투영의 원본 차원과 다른 경우
+        """
+        projected: Dict[str, List[float]] = {}
+        if not collection_names:
+            return projected
+
+        x = np.asarray(embedding, dtype=np.float32)
+        for name in dict.fromkeys(collection_names):
+            try:
+                projection = await cls._get(name)
+            except Exception as e:
+                # 투영된 컬렉션일 수 있으므로 원본 임베딩으로 대체하지 않음
+                logger.error(f"[ProjectionService] Failed to load projection for '{name}': {str(e)}")
+                raise RuntimeError(f"Failed to load projection for collection '{name}': {str(e)}") from e
+            if projection is None:
+                continue
+            mean, components = projection
+            if x.shape[0] != components.shape[1]:
+                raise ValueError(
+                    f"Projection for '{name}' expects dimension {components.shape[1]}, got {x.shape[0]}"
+                )
+            y = (x - mean) @ components.T
+            norm = float(np.linalg.norm(y))
+            projected[name] = (y / norm if norm > 0 else y).tolist()
+        return projected
+
+
+async def run_invalidation_listener() -> None:
+    """
+    projection:invalidate 채널 구독 (앱 수명 동안 실행)
+
+    메시지: {"collections": ["h1234_1", ...]} (collections가 없으면 전체 무효화)
+    연결이 끊기면 놓친 메시지가 있을 수 있으므로 재연결 시 캐시 전체를 비움
+    """
+    import redis.asyncio as redis
+
+    retry_seconds = 1.0
+    while True:
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            username=settings.redis_username,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(PROJECTION_INVALIDATE_CHANNEL)
+                ProjectionService.invalidate()
+                retry_seconds = 1.0
+                logger.info(f"[ProjectionService] Subscribed to {PROJECTION_INVALIDATE_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        names = json.loads(message.get("data") or "{}").get("collections")
+                    except (TypeError, ValueError):
+                        names = None
+                    ProjectionService.invalidate(names)
+                    logger.info(f"[ProjectionService] Cache invalidated: {names or 'all'}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[ProjectionService] Invalidation listener error, retrying in {retry_seconds:.0f}s: {e}")
+            ProjectionService.invalidate()
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, 30.0)
+        finally:
+            await client.aclose()
@@ -1,51 +1,135 @@
 """
 Runpod 서비스 모듈
 DB에서 Runpod 주소를 조회하는 기능 제공
+- 조회한 주소는 프로세스 내 TTL 캐시(runpod_cache_ttl_seconds)에 보관하여 요청마다 DB를 조회하지 않음
+- backend의 Runpod 생성/수정 시 Redis runpod:invalidate 채널로 발행되는 메시지를 구독해 즉시 무효화
 """
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import AsyncSessionLocal
+from app.core.settings import settings
 from app.models.runpod import Runpod
 from loguru import logger
 
+# backend(python-backend-repo) app/domains/runpod/services/runpod_service.py 와 같은 채널
+RUNPOD_INVALIDATE_CHANNEL = "runpod:invalidate"
+
 
 class RunpodService:
     """Runpod 주소 조회 서비스"""
-    
-    @staticmethod
-    async def get_address_by_name(runpod_name: str) -> str:
+
+    _cache: Dict[str, Tuple[float, str]] = {}
+    # 무효화 세대 (DB 조회 중 무효화가 도착하면 조회 결과를 캐시에 넣지 않기 위함)
+    _generations: Dict[str, int] = {}
+    _epoch = 0
+
+    @classmethod
+    def invalidate(cls, names: Optional[Iterable[str]] = None) -> None:
+        """캐시 무효화 (names가 없으면 전체)"""
+        if names is None:
+            cls._epoch += 1
+            cls._cache.clear()
+            return
+        for name in names:
+            cls._generations[name] = cls._generations.get(name, 0) + 1
+            cls._cache.pop(name, None)
+
+    @classmethod
+    def _generation(cls, runpod_name: str) -> Tuple[int, int]:
+        return cls._epoch, cls._generations.get(runpod_name, 0)
+
+    @classmethod
+    async def get_address_by_name(cls, runpod_name: str) -> str:
         """
-        DB에서 Runpod 이름으로 주소 조회
-        
+        DB에서 Runpod 이름으로 주소 조회 (TTL 캐시 우선)
+
         Args:
             runpod_name: Runpod 이름 (예: "EMBEDDING")
-            
+
         Returns:
             Runpod 주소 (예: "https://xxx-8000.proxy.runpod.net")
-            
+
         Raises:
             ValueError: Runpod을 찾을 수 없거나 주소가 비어있는 경우
         """
+        now = time.monotonic()
+        cached = cls._cache.get(runpod_name)
+        if cached and now - cached[0] < settings.runpod_cache_ttl_seconds:
+            return cached[1]
+
+        generation = cls._generation(runpod_name)
         try:
             logger.info(f"[RunpodService] Fetching Runpod address from DB: name={runpod_name}")
-            
+
             async with AsyncSessionLocal() as session:
                 result = await session.execute(
                     select(Runpod).where(Runpod.name == runpod_name)
                 )
                 runpod = result.scalar_one_or_none()
-                
+
                 if not runpod:
                     raise ValueError(f"Runpod not found for name: {runpod_name}")
-                
+
                 address = runpod.address
                 if not address:
                     raise ValueError(f"Runpod address is empty for name: {runpod_name}")
-                
+
                 logger.info(f"[RunpodService] Runpod address retrieved: {address}")
-                return address.rstrip("/")
-                
+                address = address.rstrip("/")
+                if cls._generation(runpod_name) == generation:
+                    cls._cache[runpod_name] = (now, address)
+                return address
+
         except Exception as e:
             logger.error(f"[RunpodService] Error getting Runpod address from DB: {str(e)}")
             raise
 
+
+async def run_invalidation_listener() -> None:
+    """
+    runpod:invalidate 채널 구독 (앱 수명 동안 실행)
+
+    메시지: {"names": ["EMBEDDING", ...]} (names가 없으면 전체 무효화)
+    연결이 끊기면 놓친 메시지가 있을 수 있으므로 재연결 시 캐시 전체를 비움
+    """
+    import redis.asyncio as redis
+
+    retry_seconds = 1.0
+    while True:
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            username=settings.redis_username,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(RUNPOD_INVALIDATE_CHANNEL)
+                RunpodService.invalidate()
+                retry_seconds = 1.0
+                logger.info(f"[RunpodService] Subscribed to {RUNPOD_INVALIDATE_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        names = json.loads(message.get("data") or "{}").get("names")
+                    except (TypeError, ValueError):
+                        names = None
+                    RunpodService.invalidate(names)
+                    logger.info(f"[RunpodService] Cache invalidated: {names or 'all'}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[RunpodService] Invalidation listener error, retrying in {retry_seconds:.0f}s: {e}")
+            RunpodService.invalidate()
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, 30.0)
+        finally:
+            await client.aclose()
@@ -4,6 +4,7 @@ from loguru import logger
 import time
 from app.services.runpod_service import RunpodService
 from app.services.embedding_client import EmbeddingClient
+from app.services.embedding_cache import EmbeddingCache
 
 
 class E5Large(BaseQueryEmbeddingStrategy):
@@ -35,15 +36,19 @@ class E5Large(BaseQueryEmbeddingStrategy):
         t0 = time.time()
         
         try:
-            # Runpod 주소 조회
-            runpod_address = await RunpodService.get_address_by_name(self.runpod_name)
-            
-            # Runpod API 호출하여 임베딩 수행
-            embedding = await EmbeddingClient.get_query_embedding(
-                runpod_address=runpod_address,
-                query=query,
-                model_name=self.model_name
-            )
+            # 캐시에 없을 때만 Runpod API 호출
+            embedding = await EmbeddingCache.get(self.model_name, query)
+            if embedding is None:
+                # Runpod 주소 조회
+                runpod_address = await RunpodService.get_address_by_name(self.runpod_name)
+                
+                # Runpod API 호출하여 임베딩 수행
+                embedding = await EmbeddingClient.get_query_embedding(
+                    runpod_address=runpod_address,
+                    query=query,
+                    model_name=self.model_name
+                )
+                await EmbeddingCache.put(self.model_name, query, embedding)
             
             dt = time.time() - t0
             logger.info(f"[E5Large] Query embedding completed. Dimension: {len(embedding)}, elapsed={dt:.2f}s")
@@ -4,6 +4,7 @@ from loguru import logger
 import time
 from app.services.runpod_service import RunpodService
 from app.services.embedding_client import EmbeddingClient
+from app.services.embedding_cache import EmbeddingCache
 
 
 class Mclip(BaseQueryEmbeddingStrategy):
@@ -38,15 +39,19 @@ class Mclip(BaseQueryEmbeddingStrategy):
         t0 = time.time()
         
         try:
-            # Runpod 주소 조회
-            runpod_address = await RunpodService.get_address_by_name(self.runpod_name)
-            
-            # Runpod API 호출하여 이미지 임베딩 수행
-            embedding = await EmbeddingClient.get_image_embedding(
-                runpod_address=runpod_address,
-                query=query,
-                model_name=self.model_name
-            )
+            # 캐시에 없을 때만 Runpod API 호출
+            embedding = await EmbeddingCache.get(self.model_name, query)
+            if embedding is None:
+                # Runpod 주소 조회
+                runpod_address = await RunpodService.get_address_by_name(self.runpod_name)
+                
+                # Runpod API 호출하여 이미지 임베딩 수행
+                embedding = await EmbeddingClient.get_image_embedding(
+                    runpod_address=runpod_address,
+                    query=query,
+                    model_name=self.model_name
+                )
+                await EmbeddingCache.put(self.model_name, query, embedding)
             
             dt = time.time() - t0
             logger.info(f"[Mclip] Image embedding completed. Dimension: {len(embedding)}, elapsed={dt:.2f}s")
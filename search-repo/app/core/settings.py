@@ -10,9 +10,56 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
-    # Milvus 설정
-    milvus_host: str
+    # 벡터 저장소 백엔드: "milvus" 또는 "local" (Milvus 없이 단일 노드/부하 테스트)
+    vector_store_backend: str = "milvus"
+    # local 백엔드 컬렉션 디렉터리 (embedding 서비스와 같은 경로를 공유)
+    local_vector_store_path: str = "./data/vector_store"
+    # local 백엔드 필터 검색 시 후보가 이 수 이하이면 전수 비교
+    local_exact_scan_max_rows: int = 20000
+
+    # Milvus 설정 (vector_store_backend=local이면 사용하지 않음)
+    milvus_host: str = ""
     milvus_port: int = 19530
+    # 오퍼 컬렉션 레이아웃: "per_offer"(h{offerNo}_{version} 컬렉션) 또는
+    # "partition_key"({prefix}_{version} 공유 컬렉션 + offer_no partition key 필터, embedding/backend와 같은 값 사용)
+    collection_layout: str = "per_offer"
+    shared_collection_prefix: str = "offers"
+    # 컬렉션 핸들 캐시 유지 시간 (초) - 컬렉션 재생성 반영 주기
+    milvus_handle_ttl_seconds: int = 600
+    # 검색 실행 스레드 풀 크기
+    search_max_workers: int = 8
+
+    # 컬렉션 상주 관리: 유휴 TTL이 지나거나 메모리 예산(MB, 0이면 제한 없음)을 넘으면 LRU 순으로 release
+    residency_enabled: bool = True
+    residency_idle_ttl_seconds: int = 1800
+    residency_memory_budget_mb: int = 0
+    residency_sweep_interval_seconds: int = 60
+    residency_touch_interval_seconds: int = 10
+    # 시작 시 최근 접근 상위 N개 preload, 항상 로드 상태로 유지할 컬렉션 (쉼표 구분)
+    residency_preload_count: int = 10
+    residency_pinned_collections: str = ""
+
+    @property
+    def residency_pinned_collections_list(self) -> list[str]:
+        return [name.strip() for name in self.residency_pinned_collections.split(",") if name.strip()]
+
+    # 필터 검색: 선택도 통계 캐시 시간, 이 비율 이상이면 post-filter 확장 검색, 확장 limit 상한
+    filter_stats_ttl_seconds: int = 300
+    filter_postfilter_min_selectivity: float = 0.3
+    filter_max_search_limit: int = 4096
+
+    # 튜닝된 ef/nprobe(search:config:{collection}) 사용 여부와 캐시 시간
+    search_config_enabled: bool = True
+    search_config_ttl_seconds: int = 60
+
+    # MMR 다양화: 기본 lambda, fetchK 기본값(topK 배수)과 상한
+    mmr_default_lambda: float = 0.5
+    mmr_fetch_k_multiplier: int = 4
+    mmr_max_fetch_k: int = 400
+
+    # 문서(file_no)별 결과 제한: Milvus grouping search 사용 여부, 미사용/미지원 시 over-fetch 배수(fetchK 기준)
+    search_group_native_enabled: bool = True
+    search_group_overfetch_multiplier: int = 4
 
     # Redis 설정
     redis_host: str = "database-redis"
@@ -21,6 +68,10 @@ class Settings(BaseSettings):
     redis_password: Optional[str] = None
     redis_db: int = 1
 
+    # 검색 결과 캐시 (컬렉션 버전 기반 무효화)
+    search_cache_enabled: bool = True
+    search_cache_ttl_seconds: int = 300
+
     # 로깅 설정
     logging_level: str = "INFO"
     log_file_enabled: bool = False
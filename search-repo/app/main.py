@@ -5,6 +5,11 @@ from .config import settings
 from .routers import router
 from datetime import datetime
 from .core.openapi import custom_openapi
+from .core.settings import settings as service_settings
+from .service.milvus_connection_service import get_milvus_connection_service
+from .service.collection_residency_service import run_release_listener, run_residency_loop
+from loguru import logger
+import asyncio
 
 app = FastAPI(
     title=__title__,
@@ -25,6 +30,30 @@ app.openapi = lambda: custom_openapi(app)
 # Router 등록
 app.include_router(router)
 
+
+@app.on_event("startup")
+async def startup_event():
+    """Milvus 연결을 미리 생성하여 첫 검색 요청의 연결 비용 제거"""
+    if service_settings.vector_store_backend == "local":
+        logger.info(f"Using local vector store: {service_settings.local_vector_store_path}")
+        return
+    try:
+        await asyncio.to_thread(get_milvus_connection_service().connect)
+    except Exception as e:
+        logger.warning(f"Milvus warm-up connection failed (will retry on first search): {e}")
+    # 컬렉션 상주 관리 (hot 컬렉션 preload + 유휴/예산 초과 컬렉션 release)
+    if service_settings.residency_enabled:
+        app.state.residency_task = asyncio.create_task(run_residency_loop())
+        app.state.residency_listener_task = asyncio.create_task(run_release_listener())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for name in ("residency_task", "residency_listener_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+
 @app.get("/")
 async def root():
     return {
@@ -1,9 +1,17 @@
 from fastapi import APIRouter, HTTPException
-from app.schemas.request.searchRequest import SearchProcessRequest
-from app.schemas.response.searchProcessResponse import SearchProcessResponse, SearchProcessResult, CandidateEmbedding, Metadata, MetadataDetail
+from app.schemas.request.searchRequest import SearchProcessRequest, SearchMultiRequest, SearchTarget, SearchFilter
+from app.schemas.response.searchProcessResponse import (
+    SearchProcessResponse, SearchProcessResult, CandidateEmbedding, Metadata, MetadataDetail,
+    SearchMultiResponse, SearchMultiResult, SearchTargetResult
+)
 from app.schemas.response.errorResponse import ErrorResponse
 from app.middleware.metrics_middleware import with_search_metrics
-from typing import Dict, Any
+from app.service.milvus_connection_service import get_milvus_connection_service
+from app.service.score_normalization import normalize_scores
+from app.service.search_cache_service import get_search_cache_service
+from app.core.settings import settings
+from typing import Dict, Any, List, Optional
+import asyncio
 import importlib
 from loguru import logger
 
@@ -62,6 +70,61 @@ def get_strategy(strategy_name: str, parameters: Dict[Any, Any] = None) -> Any:
         )
 
 
+def resolve_strategy_name(strategy_name: str) -> str:
+    """local 백엔드에서는 Milvus 전용 전략 대신 항상 local 전략 사용"""
+    if settings.vector_store_backend == "local" and strategy_name != "local":
+        logger.debug(f"vector_store_backend=local: strategy '{strategy_name}' -> 'local'")
+        return "local"
+    return strategy_name
+
+
+def to_candidate_embedding(candidate: Dict[str, Any], is_image: bool = False, normalized_score: Optional[float] = None) -> CandidateEmbedding:
+    """
+    전략 검색 결과 1건을 CandidateEmbedding 스키마로 변환
+    
+    Args:
+        candidate: 전략이 반환한 후보 (metadata.metadata는 파싱된 딕셔너리)
+        is_image: 이미지 컬렉션 결과 여부 (IMAGE_FILE_NO를 file_no로 사용)
+        normalized_score: 병합용 정규화 점수
+    
+    Returns:
+        CandidateEmbedding
+    """
+    metadata_dict = candidate.get("metadata", {})
+    metadata_detail = metadata_dict.get("metadata") or {}
+    
+    file_no = str(metadata_dict.get("file_no", ""))
+    # 이미지의 경우 metadata.metadata.IMAGE_FILE_NO가 있으면 그것을 우선 사용
+    if is_image and metadata_detail.get("IMAGE_FILE_NO"):
+        file_no = str(metadata_detail.get("IMAGE_FILE_NO", ""))
+    
+    return CandidateEmbedding(
+        text=candidate.get("text", ""),
+        metadata=Metadata(
+            id=str(metadata_dict.get("id", "")),  # id를 string으로 변환
+            file_no=file_no,
+            metadata=MetadataDetail(
+                FILE_NAME=metadata_detail.get("FILE_NAME", ""),
+                PAGE_NO=metadata_detail.get("PAGE_NO", 1),
+                INDEX_NO=metadata_detail.get("INDEX_NO", 0),
+                CREATED_AT=metadata_detail.get("CREATED_AT", ""),
+                UPDATED_AT=metadata_detail.get("UPDATED_AT", "")
+            )
+        ),
+        score=candidate.get("score", 0.0),
+        normalizedScore=normalized_score
+    )
+
+
+def with_filter(parameters: Dict[Any, Any], search_filter: Optional[SearchFilter]) -> Dict[Any, Any]:
+    """요청 filter를 searchParameter.filter로 병합 (전략과 캐시 키에서 함께 사용)"""
+    if search_filter is None:
+        return parameters
+    merged = dict(parameters or {})
+    merged["filter"] = search_filter.model_dump(mode="json", exclude_none=True)
+    return merged
+
+
 @router.post("/process")
 @with_search_metrics
 async def search_process(request: SearchProcessRequest):
@@ -73,8 +136,8 @@ async def search_process(request: SearchProcessRequest):
     try:
         embedding = request.embedding
         collection_name = request.collectionName
-        strategy_name = request.searchStrategy
-        parameters = request.searchParameter
+        strategy_name = resolve_strategy_name(request.searchStrategy)
+        parameters = with_filter(request.searchParameter, request.filter)
 
         logger.info(f"Processing search: collection={collection_name}, strategy={strategy_name}")
 
@@ -88,35 +151,21 @@ async def search_process(request: SearchProcessRequest):
         strategy = get_strategy(strategy_name, parameters)
 
         # search() 메서드 호출 (기존 코드와 호환을 위해 Dict 형태로 변환)
-        query_embedding_dict = {"embedding": embedding}
-        result = strategy.search(query_embedding_dict, collection_name, parameters)
+        # 동기 Milvus 호출은 스레드 풀에서 실행하여 이벤트 루프 블로킹 방지
+        query_embedding_dict = {"embedding": embedding, "query": request.query}
+        result = await get_search_cache_service().get_or_search(
+            strategy_name, collection_name, embedding, parameters,
+            lambda: get_milvus_connection_service().run(
+                strategy.search, query_embedding_dict, collection_name, parameters
+            ),
+            query=request.query
+        )
         
         # candidateEmbeddings 변환 (텍스트 검색 결과)
-        candidate_embeddings = []
-        for candidate in result.get("candidateEmbeddings", []):
-            metadata_dict = candidate.get("metadata", {})
-            metadata_detail = metadata_dict.get("metadata", {})
-            
-            # metadata_detail이 문자열인 경우 JSON 파싱
-            if isinstance(metadata_detail, str):
-                import json
-                metadata_detail = json.loads(metadata_detail)
-            
-            candidate_embeddings.append(CandidateEmbedding(
-                text=candidate.get("text", ""),
-                metadata=Metadata(
-                    id=str(metadata_dict.get("id", "")),  # id를 string으로 변환
-                    file_no=str(metadata_dict.get("file_no", "")),
-                    metadata=MetadataDetail(
-                        FILE_NAME=metadata_detail.get("FILE_NAME", ""),
-                        PAGE_NO=metadata_detail.get("PAGE_NO", 1),
-                        INDEX_NO=metadata_detail.get("INDEX_NO", 0),
-                        CREATED_AT=metadata_detail.get("CREATED_AT", ""),
-                        UPDATED_AT=metadata_detail.get("UPDATED_AT", "")
-                    )
-                ),
-                score=candidate.get("score", 0.0)
-            ))
+        candidate_embeddings = [
+            to_candidate_embedding(candidate)
+            for candidate in result.get("candidateEmbeddings", [])
+        ]
 
         # Response 생성
         response = SearchProcessResponse(
@@ -166,8 +215,8 @@ async def search_process_image(request: SearchProcessRequest):
     try:
         embedding = request.embedding
         collection_name = request.collectionName
-        strategy_name = request.searchStrategy
-        parameters = request.searchParameter
+        strategy_name = resolve_strategy_name(request.searchStrategy)
+        parameters = with_filter(request.searchParameter, request.filter)
 
         logger.info(f"Processing image search: collection={collection_name}, strategy={strategy_name}")
 
@@ -181,41 +230,21 @@ async def search_process_image(request: SearchProcessRequest):
         strategy = get_strategy(strategy_name, parameters)
 
         # search() 메서드 호출 (기존 코드와 호환을 위해 Dict 형태로 변환)
-        query_embedding_dict = {"embedding": embedding}
-        result = strategy.search(query_embedding_dict, collection_name, parameters)
+        # 동기 Milvus 호출은 스레드 풀에서 실행하여 이벤트 루프 블로킹 방지
+        query_embedding_dict = {"embedding": embedding, "query": request.query}
+        result = await get_search_cache_service().get_or_search(
+            strategy_name, collection_name, embedding, parameters,
+            lambda: get_milvus_connection_service().run(
+                strategy.search, query_embedding_dict, collection_name, parameters
+            ),
+            query=request.query
+        )
         
         # candidateEmbeddings 변환 (이미지 검색 결과 - IMAGE_FILE_NO 사용)
-        candidate_embeddings = []
-        for candidate in result.get("candidateEmbeddings", []):
-            metadata_dict = candidate.get("metadata", {})
-            metadata_detail = metadata_dict.get("metadata", {})
-            
-            # metadata_detail이 문자열인 경우 JSON 파싱
-            if isinstance(metadata_detail, str):
-                import json
-                metadata_detail = json.loads(metadata_detail)
-            
-            # 이미지의 경우 IMAGE_FILE_NO를 file_no로 사용
-            # metadata.metadata.IMAGE_FILE_NO가 있으면 그것을 우선 사용
-            file_no = str(metadata_dict.get("file_no", ""))
-            if metadata_detail.get("IMAGE_FILE_NO"):
-                file_no = str(metadata_detail.get("IMAGE_FILE_NO", ""))
-            
-            candidate_embeddings.append(CandidateEmbedding(
-                text=candidate.get("text", ""),
-                metadata=Metadata(
-                    id=str(metadata_dict.get("id", "")),  # id를 string으로 변환
-                    file_no=file_no,
-                    metadata=MetadataDetail(
-                        FILE_NAME=metadata_detail.get("FILE_NAME", ""),
-                        PAGE_NO=metadata_detail.get("PAGE_NO", 1),
-                        INDEX_NO=metadata_detail.get("INDEX_NO", 0),
-                        CREATED_AT=metadata_detail.get("CREATED_AT", ""),
-                        UPDATED_AT=metadata_detail.get("UPDATED_AT", "")
-                    )
-                ),
-                score=candidate.get("score", 0.0)
-            ))
+        candidate_embeddings = [
+            to_candidate_embedding(candidate, is_image=True)
+            for candidate in result.get("candidateEmbeddings", [])
+        ]
 
         # Response 생성
         response = SearchProcessResponse(
@@ -251,3 +280,148 @@ async def search_process_image(request: SearchProcessRequest):
             result={}
         )
         raise HTTPException(status_code=500, detail=error_response.dict())
+
+
+def build_target_parameters(base_parameters: Dict[Any, Any], target: SearchTarget) -> Dict[Any, Any]:
+    """
+    공통 searchParameter에 대상별 partition/topK/threshold를 덮어쓴 파라미터 생성
+    
+    Semantic/Native/Hybrid 모두 semantic 블록을 읽으므로 semantic 블록에 반영하고,
+    뒤의 블록이 값을 덮어쓰므로(OPTION_BLOCKS) native/hybrid 블록이 있으면 같은 값으로 맞춥니다.
+    """
+    parameters = dict(base_parameters or {})
+    parameters.pop("partition", None)
+    if target.partition:
+        parameters["partition"] = target.partition
+    overrides = {}
+    if target.topK is not None:
+        overrides["topK"] = target.topK
+    if target.threshold is not None:
+        overrides["threshold"] = target.threshold
+    if overrides:
+        parameters["semantic"] = {**(parameters.get("semantic") or {}), **overrides}
+        for block_name in ("native", "hybrid"):
+            if isinstance(parameters.get(block_name), dict):
+                parameters[block_name] = {**parameters[block_name], **overrides}
+    return parameters
+
+
+async def search_target(strategy_name: str, base_parameters: Dict[Any, Any], target: SearchTarget, query: Optional[str] = None) -> Dict[str, Any]:
+    """단일 대상 검색 (전략 search를 스레드 풀에서 실행)"""
+    service = get_milvus_connection_service()
+    parameters = build_target_parameters(base_parameters, target)
+    strategy = get_strategy(strategy_name, parameters)
+    result = await get_search_cache_service().get_or_search(
+        strategy_name, target.collection, target.vector, parameters,
+        lambda: service.run(
+            strategy.search, {"embedding": target.vector, "query": query}, target.collection, parameters
+        ),
+        query=query
+    )
+    # 전략이 점수 종류를 지정하면(예: hybrid의 RRF) 그것을, 아니면 인덱스 metric 사용
+    metric_type = result.get("metricType") or await service.run(service.get_metric_type, target.collection)
+    return {"result": result, "metricType": metric_type}
+
+
+@router.post("/process/multi")
+@with_search_metrics
+async def search_process_multi(request: SearchMultiRequest):
+    """
+    Search /process/multi 엔드포인트
+    - 여러 컬렉션/파티션 대상을 동시에 검색
+    - 대상별 결과와 metric 정규화 점수 기준으로 병합한 결과를 함께 반환
+    - 일부 대상이 실패해도 나머지 결과는 반환 (대상별 error 필드)
+    """
+    try:
+        strategy_name = resolve_strategy_name(request.searchStrategy)
+        parameters = with_filter(request.searchParameter, request.filter)
+
+        logger.info(f"Processing multi search: targets={len(request.targets)}, strategy={strategy_name}")
+
+        if not request.targets:
+            raise HTTPException(
+                status_code=400,
+                detail="targets cannot be empty"
+            )
+        if any(not target.vector for target in request.targets):
+            raise HTTPException(
+                status_code=400,
+                detail="target vector cannot be empty"
+            )
+
+        outcomes = await asyncio.gather(
+            *(search_target(strategy_name, parameters, target, request.query) for target in request.targets),
+            return_exceptions=True
+        )
+
+        target_results: List[SearchTargetResult] = []
+        merged: List[CandidateEmbedding] = []
+        for target, outcome in zip(request.targets, outcomes):
+            if isinstance(outcome, HTTPException):
+                # 전략 로드 실패는 모든 대상에 공통이므로 그대로 전달
+                raise outcome
+            if isinstance(outcome, Exception):
+                logger.warning(f"Multi search target failed: collection={target.collection}, partition={target.partition}, error={outcome}")
+                target_results.append(SearchTargetResult(
+                    collection=target.collection,
+                    partition=target.partition,
+                    image=target.image,
+                    candidateEmbeddings=[],
+                    count=0,
+                    error=str(outcome)
+                ))
+                continue
+
+            candidates = outcome["result"].get("candidateEmbeddings", [])
+            normalized = normalize_scores([float(c.get("score", 0.0)) for c in candidates], outcome["metricType"])
+            converted = [
+                to_candidate_embedding(candidate, is_image=target.image, normalized_score=score)
+                for candidate, score in zip(candidates, normalized)
+            ]
+            merged.extend(converted)
+            target_results.append(SearchTargetResult(
+                collection=target.collection,
+                partition=target.partition,
+                image=target.image,
+                metricType=outcome["metricType"],
+                candidateEmbeddings=converted,
+                count=len(converted)
+            ))
+
+        merged.sort(key=lambda c: c.normalizedScore or 0.0, reverse=True)
+        if request.topK is not None:
+            merged = merged[:request.topK]
+
+        response = SearchMultiResponse(
+            status=200,
+            code="OK",
+            message="요청에 성공하였습니다.",
+            isSuccess=True,
+            result=SearchMultiResult(
+                targets=target_results,
+                merged=merged,
+                count=len(merged),
+                strategy=strategy_name,
+                parameters=parameters
+            )
+        )
+        return response
+    except HTTPException as e:
+        error_response = ErrorResponse(
+            status=e.status_code,
+            code="VALIDATION_ERROR" if e.status_code == 400 else "NOT_FOUND" if e.status_code == 404 else "INTERNAL_ERROR",
+            message=str(e.detail),
+            isSuccess=False,
+            result={}
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response.dict())
+    except Exception as e:
+        logger.exception("Error processing multi search: {}", e)
+        error_response = ErrorResponse(
+            status=500,
+            code="INTERNAL_ERROR",
+            message=f"Internal server error: {str(e)}",
+            isSuccess=False,
+            result={}
+        )
+        raise HTTPException(status_code=500, detail=error_response.dict())
@@ -1,5 +1,15 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+
+class SearchFilter(BaseModel):
+    """검색 필터 (조건 간 AND, 리스트 내 OR)"""
+    fileNos: List[str] = []
+    categories: List[str] = []
+    # 업로드 기간 (timezone 없는 값은 UTC)
+    createdFrom: Optional[datetime] = None
+    createdTo: Optional[datetime] = None
 
 
 class SearchProcessRequest(BaseModel):
@@ -8,4 +18,32 @@ class SearchProcessRequest(BaseModel):
     collectionName: str
     searchStrategy: str
     searchParameter: Dict[Any, Any] = {}
+    # 쿼리 원문 (hybrid 전략의 BM25 희소 검색에 사용)
+    query: Optional[str] = None
+    # 문서/카테고리/기간 필터
+    filter: Optional[SearchFilter] = None
+
+
 
+class SearchTarget(BaseModel):
+    """Search /process/multi 개별 검색 대상"""
+    collection: str
+    partition: Optional[str] = None
+    vector: List[float]
+    topK: Optional[int] = None
+    threshold: Optional[float] = None
+    # 이미지 컬렉션 여부 (IMAGE_FILE_NO를 file_no로 사용)
+    image: bool = False
+
+
+class SearchMultiRequest(BaseModel):
+    """Search /process/multi 요청 스키마"""
+    targets: List[SearchTarget]
+    searchStrategy: str = "native"
+    searchParameter: Dict[Any, Any] = {}
+    # 쿼리 원문 (hybrid 전략의 BM25 희소 검색에 사용)
+    query: Optional[str] = None
+    # 문서/카테고리/기간 필터
+    filter: Optional[SearchFilter] = None
+    # 병합 결과 상위 k개 (없으면 전체)
+    topK: Optional[int] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 class MetadataDetail(BaseModel):
@@ -23,6 +23,8 @@ class CandidateEmbedding(BaseModel):
     text: str
     metadata: Metadata
     score: float
+    # /process/multi 병합 시 metric 간 비교를 위한 정규화 점수 (0~1, 클수록 유사)
+    normalizedScore: Optional[float] = None
 
 
 class SearchProcessResult(BaseModel):
@@ -50,3 +52,32 @@ class SearchProcessResponse(BaseModel):
 
 
 
+
+
+class SearchTargetResult(BaseModel):
+    """Search /process/multi 대상별 결과 스키마"""
+    collection: str
+    partition: Optional[str] = None
+    image: bool = False
+    metricType: Optional[str] = None
+    candidateEmbeddings: List[CandidateEmbedding]
+    count: int
+    error: Optional[str] = None
+
+
+class SearchMultiResult(BaseModel):
+    """Search /process/multi 결과 스키마"""
+    targets: List[SearchTargetResult]
+    merged: List[CandidateEmbedding]
+    count: int
+    strategy: str
+    parameters: Dict[Any, Any]
+
+
+class SearchMultiResponse(BaseModel):
+    """Search /process/multi 응답 스키마"""
+    status: int
+    code: str
+    message: str
+    isSuccess: bool
+    result: SearchMultiResult
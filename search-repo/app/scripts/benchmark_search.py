@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+검색 recall / 지연 벤치마크 스크립트
+python -m app.scripts.benchmark_search --synthetic 100000 --dim 1024 --strategies native,local --ef 32,64,128 --concurrency 1,8
+python -m app.scripts.benchmark_search --synthetic 100000 --index-type IVF_FLAT --strategies native --nprobe 8,16,64
+python -m app.scripts.benchmark_search --fixture test_collection_1 --strategies semantic,native,local
+
+1) 코퍼스 준비
+   --synthetic N: 군집 형태의 정규화 벡터 N개 생성 (file_no는 --chunks-per-file개씩 묶음)
+     Milvus 전략용으로 bench_ 컬렉션을 --index-type 인덱스로 생성하고, local 전략용으로 로컬 저장소에도 적재
+   --fixture NAME: 기존 Milvus 컬렉션(예: TEST_COLLECTION의 테스트 컬렉션)의 벡터를 코퍼스로 사용
+     local 전략용으로 같은 벡터를 로컬 저장소 bench_{NAME}에 복사
+2) 질의: 코퍼스 벡터에 잡음을 더한 벡터, 정답: 코퍼스 전체와 brute-force 비교한 exact top-k
+3) 전략(app.src)별, 검색 파라미터별, 동시성별로 검색을 실행해 recall@k, QPS, p50/p95/p99 지연(ms)을 JSON으로 출력
+   Milvus 컬렉션 인덱스가 IVF 계열이면 --nprobe 후보를, 그 외(HNSW, local)는 --ef 후보를 바꿔 가며 측정
+검색 결과 캐시(router)는 거치지 않으며, ef/nprobe를 직접 지정하므로 튜닝 값(search:config)과 residency 관리는 끕니다.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.core.settings import settings
+from app.routers.router import get_strategy
+from app.service.local_vector_store import get_local_vector_store
+
+MILVUS_STRATEGIES = {"semantic", "native", "hybrid"}
+VECTOR_FIELD = "vector"
+BENCH_PREFIX = "bench_"
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+def synthetic_corpus(size: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """군집 중심 주변에 분포한 정규화 벡터"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size)
+    vectors = centers[labels] + 0.35 * rng.standard_normal((size, dim)).astype(np.float32)
+    return _normalize(vectors).astype(np.float32)
+
+
+def make_queries(corpus: np.ndarray, num_queries: int, noise: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed + 1)
+    picks = corpus[rng.integers(0, len(corpus), num_queries)]
+    return _normalize(picks + noise * rng.standard_normal(picks.shape).astype(np.float32)).astype(np.float32)
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, batch_size: int = 256) -> np.ndarray:
+    """코사인 exact top-k 코퍼스 인덱스 (queries x k)"""
+    normalized = _normalize(corpus)
+    truth = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), batch_size):
+        scores = queries[start:start + batch_size] @ normalized.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        truth[start:start + batch_size] = np.take_along_axis(top, order, axis=1)
+    return truth
+
+
+def _rows(count: int, chunks_per_file: int, offset: int = 0) -> List[Dict[str, Any]]:
+    return [
+        {"file_no": f"bench-{(offset + i) // chunks_per_file:08d}", "text": f"chunk {offset + i}", "metadata": "{}"}
+        for i in range(count)
+    ]
+
+
+def load_local(name: str, corpus: np.ndarray, chunks_per_file: int, batch_size: int, file_nos: Optional[List[str]] = None) -> Dict[int, int]:
+    """
+    로컬 저장소에 코퍼스 적재 (기존 bench_ 컬렉션은 다시 생성)
+
+    Returns:
+        저장소 id → 코퍼스 인덱스
+    """
+    store = get_local_vector_store()
+    store.drop_collection(name)
+    collection = store.collection(name)
+    collection.create(corpus.shape[1], "COSINE")
+    id_map: Dict[int, int] = {}
+    for start in range(0, len(corpus), batch_size):
+        batch = corpus[start:start + batch_size]
+        rows = _rows(len(batch), chunks_per_file, start)
+        if file_nos:
+            for i, row in enumerate(rows):
+                row["file_no"] = file_nos[start + i]
+        ids = collection.insert(batch, rows)
+        id_map.update({row_id: start + i for i, row_id in enumerate(ids)})
+    logger.info(f"[Bench] Loaded {len(corpus)} vectors into local collection '{name}'")
+    return id_map
+
+
+def create_milvus_collection(name: str, corpus: np.ndarray, args: argparse.Namespace) -> Dict[int, int]:
+    """bench_ Milvus 컬렉션 생성 후 코퍼스 삽입, 반환: pk → 코퍼스 인덱스"""
+    from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, utility
+    from app.service.milvus_connection_service import get_milvus_connection_service
+
+    service = get_milvus_connection_service()
+    service.connect()
+    if utility.has_collection(name, using=service.alias):
+        utility.drop_collection(name, using=service.alias)
+        service.invalidate(name)
+    fields = [
+        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+        FieldSchema(name="file_no", dtype=DataType.VARCHAR, max_length=36),
+        FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535),
+        FieldSchema(name=VECTOR_FIELD, dtype=DataType.FLOAT_VECTOR, dim=corpus.shape[1]),
+        FieldSchema(name="metadata", dtype=DataType.VARCHAR, max_length=65535),
+    ]
+    collection = Collection(name, CollectionSchema(fields, description="search benchmark"), using=service.alias)
+    id_map: Dict[int, int] = {}
+    for start in range(0, len(corpus), args.batch_size):
+        batch = corpus[start:start + args.batch_size]
+        rows = _rows(len(batch), args.chunks_per_file, start)
+        result = collection.insert([
+            [row["file_no"] for row in rows],
+            [row["text"] for row in rows],
+            batch.tolist(),
+            [row["metadata"] for row in rows],
+        ])
+        id_map.update({int(pk): start + i for i, pk in enumerate(result.primary_keys)})
+    collection.flush()
+    if args.index_type == "HNSW":
+        build_params = {"M": args.hnsw_m, "efConstruction": args.ef_construction}
+    elif args.index_type.startswith("IVF"):
+        build_params = {"nlist": args.nlist}
+    else:
+        build_params = {}
+    collection.create_index(
+        field_name=VECTOR_FIELD,
+        index_params={"metric_type": "COSINE", "index_type": args.index_type, "params": build_params},
+    )
+    collection.load()
+    logger.info(f"[Bench] Created Milvus collection '{name}' ({args.index_type} {build_params}, {len(corpus)} rows)")
+    return id_map
+
+
+def read_milvus_fixture(name: str, batch_size: int) -> Tuple[np.ndarray, List[int], List[str]]:
+    """기존 Milvus 컬렉션의 (벡터, pk, file_no)"""
+    from app.service.milvus_connection_service import get_milvus_connection_service
+
+    collection = get_milvus_connection_service().get_collection(name)
+    vectors: List[List[float]] = []
+    pks: List[int] = []
+    file_nos: List[str] = []
+    iterator = collection.query_iterator(batch_size=batch_size, output_fields=["id", "file_no", VECTOR_FIELD])
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            for row in batch:
+                pks.append(int(row["id"]))
+                file_nos.append(str(row.get("file_no") or ""))
+                vectors.append(row[VECTOR_FIELD])
+    finally:
+        iterator.close()
+    logger.info(f"[Bench] Read {len(pks)} vectors from fixture collection '{name}'")
+    return _normalize(np.asarray(vectors, dtype=np.float32)).astype(np.float32), pks, file_nos
+
+
+def milvus_index_type(name: str) -> str:
+    """기존 Milvus 컬렉션 벡터 인덱스 종류 (인덱스가 없으면 빈 문자열)"""
+    from app.service.milvus_connection_service import get_milvus_connection_service
+
+    for index in get_milvus_connection_service().get_collection(name).indexes:
+        if index.field_name == VECTOR_FIELD:
+            return str((index.params or {}).get("index_type", "")).upper()
+    return ""
+
+
+def sweep_options(strategy_name: str, index_type: str, args: argparse.Namespace) -> List[Dict[str, Optional[int]]]:
+    """전략/인덱스 종류별 측정할 검색 파라미터 후보 (IVF는 nprobe, HNSW/local은 ef)"""
+    if strategy_name == "semantic":
+        return [{"ef": None, "nprobe": None}]
+    if strategy_name != "local" and index_type.startswith("IVF"):
+        return [{"ef": None, "nprobe": nprobe} for nprobe in _int_list(args.nprobe)]
+    return [{"ef": ef, "nprobe": None} for ef in _int_list(args.ef)]
+
+
+def run_queries(strategy: Any, collection: str, queries: np.ndarray, parameters: Dict[str, Any], concurrency: int) -> Tuple[List[List[Any]], List[float], int, float]:
+    """동시성 concurrency로 질의 실행, 반환: (질의별 결과 id, 지연(ms), 오류 수, 전체 소요(초))"""
+
+    def one(query: np.ndarray) -> Tuple[Optional[List[Any]], float]:
+        started = time.perf_counter()
+        try:
+            result = strategy.search({"embedding": query.tolist()}, collection, parameters)
+        except Exception as e:
+            logger.warning(f"[Bench] Search failed: {e}")
+            return None, (time.perf_counter() - started) * 1000
+        ids = [candidate.get("metadata", {}).get("id") for candidate in result.get("candidateEmbeddings", [])]
+        return ids, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one, queries))
+    elapsed = time.perf_counter() - started
+    errors = sum(1 for ids, _ in outcomes if ids is None)
+    return [ids or [] for ids, _ in outcomes], [latency for _, latency in outcomes], errors, elapsed
+
+
+def recall_at_k(results: List[List[Any]], truth: np.ndarray, id_map: Dict[int, int], k: int) -> float:
+    recalls = []
+    for ids, expected in zip(results, truth):
+        found = {id_map.get(int(i)) for i in ids[:k] if i is not None}
+        recalls.append(len(found.intersection(expected[:k].tolist())) / k)
+    return float(np.mean(recalls)) if recalls else 0.0
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="검색 전략 recall@k / QPS / 지연 벤치마크")
+    corpus_group = parser.add_mutually_exclusive_group(required=True)
+    corpus_group.add_argument("--synthetic", type=int, help="합성 코퍼스 벡터 수")
+    corpus_group.add_argument("--fixture", help="코퍼스로 사용할 기존 Milvus 컬렉션 (예: 테스트 컬렉션)")
+    parser.add_argument("--dim", type=int, default=1024, help="합성 벡터 차원")
+    parser.add_argument("--clusters", type=int, default=64, help="합성 코퍼스 군집 수")
+    parser.add_argument("--chunks-per-file", type=int, default=20, help="합성 코퍼스 file_no당 청크 수")
+    parser.add_argument("--collection", default=None, help="합성 코퍼스 컬렉션 이름 (기본: bench_synthetic)")
+    parser.add_argument("--strategies", default="native,local", help="쉼표 구분 전략 (semantic, native, hybrid, local)")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--noise", type=float, default=0.1, help="질의 생성 잡음 크기")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k (topK)")
+    parser.add_argument("--ef", default="64", help="쉼표 구분 ef 후보 (HNSW/local, semantic은 무시)")
+    parser.add_argument("--nprobe", default="16", help="쉼표 구분 nprobe 후보 (IVF 계열 인덱스, semantic은 무시)")
+    parser.add_argument("--concurrency", default="1,8", help="쉼표 구분 동시성 후보")
+    parser.add_argument("--warmup", type=int, default=20, help="측정 전 예열 질의 수")
+    parser.add_argument("--index-type", default="HNSW", help="합성 Milvus 컬렉션 인덱스 (HNSW, IVF_FLAT, FLAT 등)")
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=2000, help="적재/조회 배치 크기")
+    parser.add_argument("--keep", action="store_true", help="합성 Milvus 컬렉션을 삭제하지 않음")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    strategies = [name.strip() for name in args.strategies.split(",") if name.strip()]
+    uses_milvus = bool(MILVUS_STRATEGIES.intersection(strategies))
+    # ef/nprobe를 직접 지정하므로 튜닝 값과 residency(Redis 접근)는 사용하지 않음
+    settings.search_config_enabled = False
+    settings.residency_enabled = False
+
+    # 코퍼스와 컬렉션 준비 (id_maps: 백엔드별 결과 id → 코퍼스 인덱스)
+    id_maps: Dict[str, Dict[int, int]] = {}
+    if args.synthetic:
+        name = args.collection or f"{BENCH_PREFIX}synthetic"
+        if not name.startswith(BENCH_PREFIX):
+            parser.error(f"--collection must start with '{BENCH_PREFIX}' (the collection is recreated)")
+        corpus = synthetic_corpus(args.synthetic, args.dim, args.clusters, args.seed)
+        milvus_name = local_name = name
+        if uses_milvus:
+            id_maps["milvus"] = create_milvus_collection(name, corpus, args)
+        if "local" in strategies:
+            id_maps["local"] = load_local(name, corpus, args.chunks_per_file, args.batch_size)
+    else:
+        corpus, pks, file_nos = read_milvus_fixture(args.fixture, args.batch_size)
+        milvus_name, local_name = args.fixture, f"{BENCH_PREFIX}{args.fixture}"
+        id_maps["milvus"] = {pk: i for i, pk in enumerate(pks)}
+        if "local" in strategies:
+            id_maps["local"] = load_local(local_name, corpus, args.chunks_per_file, args.batch_size, file_nos)
+
+    index_type = ""
+    if uses_milvus:
+        index_type = args.index_type.upper() if args.synthetic else milvus_index_type(milvus_name)
+
+    queries = make_queries(corpus, args.queries, args.noise, args.seed)
+    logger.info(f"[Bench] Computing exact top-{args.k} for {len(queries)} queries over {len(corpus)} vectors")
+    truth = exact_top_k(corpus, queries, args.k)
+
+    report: Dict[str, Any] = {
+        "corpus": {
+            "source": "synthetic" if args.synthetic else args.fixture,
+            "size": int(len(corpus)),
+            "dim": int(corpus.shape[1]),
+            "indexType": index_type or None,
+        },
+        "queries": int(len(queries)),
+        "k": args.k,
+        "results": [],
+    }
+    for strategy_name in strategies:
+        backend = "local" if strategy_name == "local" else "milvus"
+        collection = local_name if backend == "local" else milvus_name
+        for options in sweep_options(strategy_name, index_type, args):
+            ef, nprobe = options["ef"], options["nprobe"]
+            parameters: Dict[str, Any] = {"semantic": {"topK": args.k}, "native": {"topK": args.k, "ef": ef, "nprobe": nprobe}}
+            if strategy_name == "semantic":
+                parameters.update({"milvus_host": settings.milvus_host, "milvus_port": settings.milvus_port})
+            strategy = get_strategy(strategy_name, parameters)
+            run_queries(strategy, collection, queries[:args.warmup], parameters, 1)
+            for concurrency in _int_list(args.concurrency):
+                results, latencies, errors, elapsed = run_queries(strategy, collection, queries, parameters, concurrency)
+                entry = {
+                    "strategy": strategy_name,
+                    "collection": collection,
+                    "ef": ef,
+                    "nprobe": nprobe,
+                    "concurrency": concurrency,
+                    f"recall@{args.k}": recall_at_k(results, truth, id_maps.get(backend, {}), args.k),
+                    "qps": len(queries) / elapsed if elapsed else 0.0,
+                    "p50Ms": float(np.percentile(latencies, 50)),
+                    "p95Ms": float(np.percentile(latencies, 95)),
+                    "p99Ms": float(np.percentile(latencies, 99)),
+                    "errors": errors,
+                }
+                report["results"].append(entry)
+                logger.info(
+                    f"[Bench] {strategy_name} ef={ef} nprobe={nprobe} c={concurrency} recall@{args.k}={entry[f'recall@{args.k}']:.4f} "
+                    f"qps={entry['qps']:.1f} p50={entry['p50Ms']:.2f}ms p99={entry['p99Ms']:.2f}ms errors={errors}"
+                )
+
+    if args.synthetic and uses_milvus and not args.keep:
+        from pymilvus import utility
+        utility.drop_collection(milvus_name)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
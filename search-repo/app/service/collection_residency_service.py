@@ -0,0 +1,278 @@
+"""
+컬렉션 메모리 상주(load/release) 관리 서비스
+오퍼별 컬렉션이 한 번 로드되면 해제되지 않아 query node 메모리가 테넌트 수에 비례해 늘어나는 문제를 막습니다.
+- 검색 시 컬렉션별 마지막 접근 시각을 Redis ZSET(milvus:residency:last_access)에 기록 (검색 인스턴스 간 공유)
+- 주기적 sweep: 유휴 TTL을 넘긴 컬렉션, 메모리 예산을 넘으면 오래된 순(LRU)으로 release
+- 시작 시 고정(pinned) 컬렉션과 최근 접근 상위 컬렉션을 미리 load
+- ensure_loaded는 컬렉션별 잠금으로 동시 load 요청을 한 번으로 합침 (singleflight)
+- release는 Redis pub/sub(milvus:residency:released)으로 알려 모든 검색 인스턴스가 캐시된 핸들을 폐기
+"""
+import asyncio
+import json
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from app.core.settings import settings
+
+try:
+    from pymilvus import Collection, utility
+    PYMILVUS_AVAILABLE = True
+except ImportError:
+    Collection = None
+    utility = None
+    PYMILVUS_AVAILABLE = False
+
+LAST_ACCESS_KEY = "milvus:residency:last_access"
+SWEEP_LOCK_KEY = "milvus:residency:sweep_lock"
+RELEASE_CHANNEL = "milvus:residency:released"
+ALIAS = "default"
+
+
+def _is_loaded(collection_name: str) -> bool:
+    state = utility.load_state(collection_name, using=ALIAS)
+    return getattr(state, "name", str(state)).endswith("Loaded")
+
+
+def _aliases(collection_name: str) -> List[str]:
+    """컬렉션에 걸린 alias (검색은 alias 이름으로 접근할 수 있음, 예: 스키마 마이그레이션 후)"""
+    try:
+        return list(utility.list_aliases(collection_name, using=ALIAS) or [])
+    except Exception:
+        return []
+
+
+class CollectionResidencyService:
+    """컬렉션 load/release 관리 (동기, 검색 스레드 풀 / 백그라운드 스레드에서 호출)"""
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._last_touch: Dict[str, float] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True,
+                socket_timeout=0.5,
+            )
+        return self._client
+
+    def touch(self, collection_name: str) -> None:
+        """마지막 접근 시각 기록 (인스턴스당 residency_touch_interval_seconds마다 1회)"""
+        now = time.monotonic()
+        last = self._last_touch.get(collection_name)
+        if last is not None and now - last < settings.residency_touch_interval_seconds:
+            return
+        self._last_touch[collection_name] = now
+        try:
+            self._get_client().zadd(LAST_ACCESS_KEY, {collection_name: time.time()})
+        except Exception as e:
+            logger.warning(f"[Residency] Failed to record access for '{collection_name}': {e}")
+
+    def ensure_loaded(self, collection_name: str, collection: Optional[Any] = None) -> None:
+        """
+        컬렉션이 로드되어 있지 않으면 load (같은 컬렉션의 동시 요청은 한 번만 load)
+
+        Args:
+            collection_name: 컬렉션 이름
+            collection: 이미 생성한 Collection 핸들 (없으면 생성)
+        """
+        self.touch(collection_name)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(collection_name, threading.Lock())
+        with load_lock:
+            if _is_loaded(collection_name):
+                return
+            started = time.monotonic()
+            (collection or Collection(collection_name, using=ALIAS)).load()
+            logger.info(f"[Residency] Loaded '{collection_name}' in {time.monotonic() - started:.2f}s")
+
+    def _memory_bytes(self, collection_name: str) -> int:
+        """로드된 세그먼트 메모리 합계 (조회 실패 시 0)"""
+        try:
+            return sum(int(segment.mem_size) for segment in utility.get_query_segment_info(collection_name, using=ALIAS))
+        except Exception as e:
+            logger.debug(f"[Residency] Failed to get segment info for '{collection_name}': {e}")
+            return 0
+
+    def release(self, collection_name: str, reason: str, aliases: Optional[List[str]] = None) -> None:
+        """컬렉션 release 후 핸들 캐시(alias 포함) 무효화 (로컬 + 다른 검색 인스턴스에 알림)"""
+        from app.service.milvus_connection_service import get_milvus_connection_service
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(collection_name, threading.Lock())
+        with load_lock:
+            Collection(collection_name, using=ALIAS).release()
+        names = [collection_name] + list(aliases or [])
+        for name in names:
+            get_milvus_connection_service().invalidate(name)
+        try:
+            self._get_client().publish(RELEASE_CHANNEL, json.dumps({"collections": names}))
+        except Exception as e:
+            logger.warning(f"[Residency] Failed to publish release of '{collection_name}': {e}")
+        logger.info(f"[Residency] Released '{collection_name}' ({reason})")
+
+    def sweep(self) -> List[str]:
+        """
+        유휴/예산 초과 컬렉션 release (여러 검색 인스턴스 중 한 곳만 실행하도록 Redis 잠금)
+
+        Returns:
+            release한 컬렉션 이름 리스트
+        """
+        client = self._get_client()
+        token = uuid.uuid4().hex
+        if not client.set(SWEEP_LOCK_KEY, token, nx=True, ex=max(settings.residency_sweep_interval_seconds, 1)):
+            return []
+
+        now = time.time()
+        loaded = [name for name in utility.list_collections(using=ALIAS) if _is_loaded(name)]
+        # 접근 기록이 없는 로드된 컬렉션(인제스트 등으로 로드)은 지금을 첫 접근으로 간주
+        if loaded:
+            client.zadd(LAST_ACCESS_KEY, {name: now for name in loaded}, nx=True)
+        last_access = {name: score for name, score in client.zrange(LAST_ACCESS_KEY, 0, -1, withscores=True)}
+        aliases = {name: _aliases(name) for name in loaded}
+        for name in loaded:
+            # alias로 접근한 기록도 실제 컬렉션의 접근으로 반영
+            last_access[name] = max([last_access.get(name, now)] + [last_access[a] for a in aliases[name] if a in last_access])
+
+        released: List[str] = []
+        pinned = set(settings.residency_pinned_collections_list)
+        candidates = sorted(
+            (name for name in loaded if name not in pinned and not pinned.intersection(aliases[name])),
+            key=lambda name: last_access.get(name, now),
+        )
+        for name in list(candidates):
+            idle = now - last_access.get(name, now)
+            if idle >= settings.residency_idle_ttl_seconds:
+                self.release(name, f"idle {idle:.0f}s", aliases[name])
+                released.append(name)
+                candidates.remove(name)
+
+        budget = settings.residency_memory_budget_mb * 1024 * 1024
+        if budget > 0:
+            usage = {name: self._memory_bytes(name) for name in loaded if name not in released}
+            total = sum(usage.values())
+            for name in candidates:
+                if total <= budget:
+                    break
+                self.release(name, f"memory budget {total / 1048576:.0f}MB > {settings.residency_memory_budget_mb}MB", aliases[name])
+                released.append(name)
+                total -= usage.get(name, 0)
+
+        # 삭제된 컬렉션 기록 정리 (has_collection은 alias 이름도 확인)
+        existing = set(utility.list_collections(using=ALIAS))
+        stale = [name for name in last_access if name not in existing and not utility.has_collection(name, using=ALIAS)]
+        if stale:
+            client.zrem(LAST_ACCESS_KEY, *stale)
+        if client.get(SWEEP_LOCK_KEY) == token:
+            client.delete(SWEEP_LOCK_KEY)
+        return released
+
+    def preload(self) -> List[str]:
+        """고정 컬렉션과 최근 접근 상위 residency_preload_count개 컬렉션을 미리 load"""
+        names = list(settings.residency_pinned_collections_list)
+        if settings.residency_preload_count > 0:
+            try:
+                names += self._get_client().zrevrange(LAST_ACCESS_KEY, 0, settings.residency_preload_count - 1)
+            except Exception as e:
+                logger.warning(f"[Residency] Failed to read access history: {e}")
+        preloaded: List[str] = []
+        for name in dict.fromkeys(names):
+            try:
+                if utility.has_collection(name, using=ALIAS):
+                    self.ensure_loaded(name)
+                    preloaded.append(name)
+            except Exception as e:
+                logger.warning(f"[Residency] Failed to preload '{name}': {e}")
+        logger.info(f"[Residency] Preloaded {len(preloaded)} collections: {preloaded}")
+        return preloaded
+
+
+async def run_residency_loop() -> None:
+    """시작 시 preload 후 residency_sweep_interval_seconds마다 sweep (앱 수명 동안 실행)"""
+    from app.service.milvus_connection_service import get_milvus_connection_service
+
+    service = get_collection_residency_service()
+    try:
+        await asyncio.to_thread(get_milvus_connection_service().connect)
+        await asyncio.to_thread(service.preload)
+    except Exception as e:
+        logger.warning(f"[Residency] Preload failed: {e}")
+    while True:
+        await asyncio.sleep(settings.residency_sweep_interval_seconds)
+        try:
+            released = await asyncio.to_thread(service.sweep)
+            if released:
+                logger.info(f"[Residency] Sweep released {len(released)} collections")
+        except Exception as e:
+            logger.warning(f"[Residency] Sweep failed: {e}")
+
+
+async def run_release_listener() -> None:
+    """
+    milvus:residency:released 채널 구독 (앱 수명 동안 실행)
+
+    다른 인스턴스의 sweep이 release한 컬렉션의 핸들을 폐기해, 다음 검색이 ensure_loaded로 다시 load하게 합니다.
+    메시지: {"collections": ["h1234_1", ...]} (collections가 없으면 전체 무효화)
+    연결이 끊기면 놓친 메시지가 있을 수 있으므로 재연결 시 핸들 캐시 전체를 비움
+    """
+    import redis.asyncio as redis
+    from app.service.milvus_connection_service import get_milvus_connection_service
+
+    service = get_milvus_connection_service()
+    retry_seconds = 1.0
+    while True:
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            username=settings.redis_username,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(RELEASE_CHANNEL)
+                service.invalidate()
+                retry_seconds = 1.0
+                logger.info(f"[Residency] Subscribed to {RELEASE_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        names = json.loads(message.get("data") or "{}").get("collections")
+                    except (TypeError, ValueError):
+                        names = None
+                    for name in names or [None]:
+                        service.invalidate(name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[Residency] Release listener error, retrying in {retry_seconds:.0f}s: {e}")
+            service.invalidate()
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, 30.0)
+        finally:
+            await client.aclose()
+
+
+# 싱글톤 인스턴스
+_residency_service: Optional[CollectionResidencyService] = None
+
+
+def get_collection_residency_service() -> CollectionResidencyService:
+    """CollectionResidencyService 싱글톤 인스턴스 반환"""
+    global _residency_service
+    if _residency_service is None:
+        _residency_service = CollectionResidencyService()
+    return _residency_service
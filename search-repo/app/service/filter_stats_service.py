@@ -0,0 +1,83 @@
+"""
+필터 선택도(selectivity) 통계 서비스
+count(*) 쿼리로 필터 expression이 남기는 행 비율을 측정하고 TTL 동안 캐시합니다.
+일치하는 행이 없는 결과(0)는 캐시하지 않습니다 (직후 삽입된 파일이 TTL 동안 필터 검색에서 빠지지 않도록).
+검색 전략은 이 값으로 pre-filter(Milvus 내부 bitset)와 post-filter 확장 검색 중 하나를 선택합니다.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+from app.core.settings import settings
+from app.service.milvus_connection_service import get_milvus_connection_service
+
+
+class FilterStatsService:
+    """컬렉션/expression별 선택도 캐시 (동기, 검색 스레드 풀에서 호출)"""
+
+    def __init__(self):
+        self.ttl_seconds = settings.filter_stats_ttl_seconds
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str, Optional[str], str], Tuple[float, float]] = {}
+
+    def _count(self, collection, expr: str, partition: Optional[str]) -> int:
+        rows = collection.query(
+            expr=expr,
+            output_fields=["count(*)"],
+            partition_names=[partition] if partition else None,
+        )
+        return int(rows[0]["count(*)"]) if rows else 0
+
+    def selectivity(self, collection_name: str, expr: str, partition: Optional[str] = None, scope_expr: str = "") -> float:
+        """
+        필터가 남기는 행 비율 (0~1)
+
+        Args:
+            collection_name: 컬렉션 이름
+            expr: Milvus boolean expression
+            partition: 파티션 이름 (선택)
+            scope_expr: 비율의 기준 범위 (partition_key 공유 컬렉션의 오퍼 조건, expr에 포함되어 있어야 함)
+
+        Returns:
+            matched / total (측정 실패 시 1.0 → post-filter 경로로 처리하지 않도록 호출 측에서 판단)
+        """
+        key = (collection_name, expr, partition, scope_expr)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+        try:
+            collection = get_milvus_connection_service().get_collection(collection_name)
+            total = self._count(collection, scope_expr, partition)
+            matched = self._count(collection, expr, partition) if total else 0
+            value = (matched / total) if total else 0.0
+        except Exception as e:
+            logger.warning(f"[FilterStats] Failed to estimate selectivity for '{collection_name}' ({expr}): {e}")
+            return 1.0
+        if value > 0.0:
+            with self._lock:
+                self._cache[key] = (now, value)
+        logger.info(f"[FilterStats] collection={collection_name}, expr={expr}, selectivity={value:.4f}")
+        return value
+
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """캐시 무효화 (collection_name이 없으면 전체)"""
+        with self._lock:
+            if collection_name is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == collection_name]:
+                    self._cache.pop(key, None)
+
+
+# 싱글톤 인스턴스
+_filter_stats_service: Optional[FilterStatsService] = None
+
+
+def get_filter_stats_service() -> FilterStatsService:
+    """FilterStatsService 싱글톤 인스턴스 반환"""
+    global _filter_stats_service
+    if _filter_stats_service is None:
+        _filter_stats_service = FilterStatsService()
+    return _filter_stats_service
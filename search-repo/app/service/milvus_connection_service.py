@@ -0,0 +1,188 @@
+"""
+Milvus 연결 및 컬렉션 핸들 캐시 서비스
+프로세스당 하나의 연결을 유지하고, 로드된 Collection / VectorStore 객체를 재사용합니다.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from loguru import logger
+from app.core.settings import settings
+from app.service.collection_residency_service import get_collection_residency_service
+
+try:
+    from pymilvus import connections, Collection, utility
+    PYMILVUS_AVAILABLE = True
+except ImportError:
+    connections = None
+    Collection = None
+    utility = None
+    PYMILVUS_AVAILABLE = False
+
+
+class MilvusConnectionService:
+    """Milvus 연결/컬렉션 핸들 캐시 (스레드 안전)"""
+
+    def __init__(self):
+        self.alias = "default"
+        self.ttl_seconds = settings.milvus_handle_ttl_seconds
+        self._address: Optional[Tuple[str, int]] = None
+        self._lock = threading.RLock()
+        self._collections: Dict[str, Tuple[float, Any]] = {}
+        self._vectorstores: Dict[Hashable, Tuple[float, Any]] = {}
+        # VectorStore 생성은 키별 잠금 (한 컬렉션의 cold load가 다른 컬렉션 검색을 막지 않도록)
+        self._vectorstore_locks: Dict[Hashable, threading.Lock] = {}
+        self._metric_types: Dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.search_max_workers,
+            thread_name_prefix="milvus-search",
+        )
+
+    def connect(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
+        """
+        Milvus 연결 (이미 같은 주소로 연결되어 있으면 재사용)
+
+        Args:
+            host: Milvus 호스트 (없으면 settings 사용)
+            port: Milvus 포트 (없으면 settings 사용)
+        """
+        if not PYMILVUS_AVAILABLE:
+            raise ImportError("pymilvus is required for search. Install it with: uv add pymilvus")
+        address = (host or settings.milvus_host, int(port or settings.milvus_port))
+        if self._address == address:
+            return
+        with self._lock:
+            if self._address == address:
+                return
+            if self._address is not None:
+                # 다른 주소로 재연결 시 기존 핸들은 모두 무효
+                logger.info(f"[MilvusConnection] Reconnecting: {self._address} -> {address}")
+                connections.disconnect(self.alias)
+                self._collections.clear()
+                self._vectorstores.clear()
+                self._metric_types.clear()
+            connections.connect(alias=self.alias, host=address[0], port=address[1])
+            self._address = address
+            logger.info(f"[MilvusConnection] Connected to Milvus: {address[0]}:{address[1]}")
+
+    def get_collection(self, collection_name: str) -> Any:
+        """
+        로드된 Collection 객체 반환 (캐시 미스 시 describe + load 1회 수행, residency 관리 시 접근 기록)
+
+        Args:
+            collection_name: 컬렉션 이름
+
+        Returns:
+            pymilvus Collection
+        """
+        self.connect()
+        now = time.monotonic()
+        cached = self._collections.get(collection_name)
+        if cached and now - cached[0] < self.ttl_seconds:
+            if settings.residency_enabled:
+                get_collection_residency_service().touch(collection_name)
+            return cached[1]
+        if not utility.has_collection(collection_name, using=self.alias):
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+        collection = Collection(collection_name, using=self.alias)
+        if settings.residency_enabled:
+            # 접근 기록 + 컬렉션별 singleflight load (다른 컬렉션 load와 서로 막지 않음)
+            get_collection_residency_service().ensure_loaded(collection_name, collection)
+        else:
+            collection.load()
+        with self._lock:
+            self._collections[collection_name] = (now, collection)
+        logger.info(f"[MilvusConnection] Cached collection handle: {collection_name}")
+        return collection
+
+    def get_metric_type(self, collection_name: str, field_name: str = "vector") -> str:
+        """
+        벡터 필드 인덱스의 metric_type 조회 (컬렉션 핸들과 함께 캐시)
+
+        Returns:
+            "COSINE" / "IP" / "L2" 등 (인덱스가 없으면 "COSINE")
+        """
+        metric_type = self._metric_types.get(collection_name)
+        if metric_type and collection_name in self._collections:
+            return metric_type
+        collection = self.get_collection(collection_name)
+        metric_type = "COSINE"
+        for index in collection.indexes:
+            if index.field_name == field_name:
+                metric_type = str(index.params.get("metric_type", metric_type)).upper()
+                break
+        self._metric_types[collection_name] = metric_type
+        return metric_type
+
+    def get_vectorstore(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        LangChain VectorStore 객체 캐시 조회 (없으면 factory로 생성)
+
+        residency 관리 시 get_collection과 같이 접근을 기록하고, 생성 전에 컬렉션을 load합니다
+        (VectorStore만 쓰는 검색도 유휴/예산 release 판단에 반영되도록).
+
+        Args:
+            key: 캐시 키 (첫 원소는 컬렉션 이름)
+            factory: VectorStore 생성 함수
+
+        Returns:
+            VectorStore 객체
+        """
+        collection_name = key[0] if isinstance(key, tuple) and key else None
+        now = time.monotonic()
+        cached = self._vectorstores.get(key)
+        if cached and now - cached[0] < self.ttl_seconds:
+            if settings.residency_enabled and collection_name:
+                get_collection_residency_service().touch(collection_name)
+            return cached[1]
+        with self._lock:
+            key_lock = self._vectorstore_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self._vectorstores.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+                return cached[1]
+            if settings.residency_enabled and collection_name:
+                self.connect()
+                get_collection_residency_service().ensure_loaded(collection_name)
+            vectorstore = factory()
+            with self._lock:
+                self._vectorstores[key] = (time.monotonic(), vectorstore)
+            return vectorstore
+
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """
+        캐시 무효화 (컬렉션 삭제/재생성 또는 검색 오류 시)
+
+        Args:
+            collection_name: 무효화할 컬렉션 (없으면 전체)
+        """
+        with self._lock:
+            if collection_name is None:
+                self._collections.clear()
+                self._vectorstores.clear()
+                self._metric_types.clear()
+                return
+            self._collections.pop(collection_name, None)
+            self._metric_types.pop(collection_name, None)
+            for key in [k for k in self._vectorstores if isinstance(k, tuple) and k and k[0] == collection_name]:
+                self._vectorstores.pop(key, None)
+        logger.info(f"[MilvusConnection] Invalidated handles for: {collection_name}")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """동기 검색 함수를 전용 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+
+# 싱글톤 인스턴스
+_connection_service: Optional[MilvusConnectionService] = None
+
+
+def get_milvus_connection_service() -> MilvusConnectionService:
+    """MilvusConnectionService 싱글톤 인스턴스 반환"""
+    global _connection_service
+    if _connection_service is None:
+        _connection_service = MilvusConnectionService()
+    return _connection_service
@@ -0,0 +1,87 @@
+"""
+MMR(Maximal Marginal Relevance) 다양화
+반복 머리글/상용구 청크처럼 거의 같은 후보가 top-k를 채우지 않도록,
+fetchK개 후보의 벡터로 질의 관련도와 후보 간 유사도를 계산해 탐욕적으로 k개를 고릅니다.
+
+parameters 예시:
+    {"mmr": {"lambda": 0.5, "fetchK": 40}}
+lambda가 1이면 관련도만, 0이면 다양성만 반영합니다.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+from app.core.settings import settings
+
+VECTOR_KEY = "vector"
+
+
+def mmr_options(parameters: Optional[Dict[Any, Any]], top_k: int) -> Optional[Dict[str, Any]]:
+    """
+    searchParameter.mmr 블록 파싱
+
+    Returns:
+        {"lambda": float, "fetchK": int} (블록이 없거나 enabled=false면 None)
+    """
+    block = parameters.get("mmr") if isinstance(parameters, dict) else None
+    if not isinstance(block, dict) or block.get("enabled") is False:
+        return None
+    try:
+        lambda_mult = float(block.get("lambda", settings.mmr_default_lambda))
+    except (TypeError, ValueError):
+        lambda_mult = settings.mmr_default_lambda
+    try:
+        fetch_k = int(block.get("fetchK") or top_k * settings.mmr_fetch_k_multiplier)
+    except (TypeError, ValueError):
+        fetch_k = top_k * settings.mmr_fetch_k_multiplier
+    return {
+        "lambda": min(max(lambda_mult, 0.0), 1.0),
+        "fetchK": min(max(fetch_k, top_k), settings.mmr_max_fetch_k),
+    }
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def mmr_select(query: Sequence[float], vectors: Sequence[Sequence[float]], k: int, lambda_mult: float) -> List[int]:
+    """
+    MMR 선택 순서 (후보 인덱스 리스트)
+
+    질의 관련도(n)를 한 번에 계산하고, 선택된 후보와의 최대 유사도를 벡터로 갱신하며 k번 argmax 합니다.
+    후보 간 유사도는 선택된 후보의 행만 계산하므로 전체 행렬(n x n x d) 대신 k x n x d 연산입니다.
+    """
+    n = len(vectors)
+    if n == 0 or k <= 0:
+        return []
+    matrix = _normalize(np.asarray(vectors, dtype=np.float32))
+    relevance = matrix @ _normalize(np.asarray(query, dtype=np.float32))
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = matrix @ matrix[selected[0]]
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    for _ in range(min(k, n) - 1):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        index = int(np.argmax(scores))
+        selected.append(index)
+        available[index] = False
+        np.maximum(max_similarity, matrix @ matrix[index], out=max_similarity)
+    return selected
+
+
+def apply_mmr(query: Sequence[float], candidates: List[Dict[str, Any]], k: int, lambda_mult: float) -> List[Dict[str, Any]]:
+    """
+    후보(각각 "vector" 키 보유)를 MMR 순서로 k개 선택하고 vector 키를 제거
+
+    vector가 없는 후보가 섞여 있으면 MMR 없이 상위 k개를 반환합니다.
+    """
+    vectors = [candidate.pop(VECTOR_KEY, None) for candidate in candidates]
+    if len(candidates) <= 1 or any(vector is None for vector in vectors):
+        if len(candidates) > 1:
+            logger.warning("[MMR] Candidates without vectors, skipping diversification")
+        return candidates[:k]
+    order = mmr_select(query, vectors, k, lambda_mult)
+    return [candidates[i] for i in order]
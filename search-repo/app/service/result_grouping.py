@@ -0,0 +1,64 @@
+"""
+문서(file_no)별 결과 수 제한
+긴 문서 하나가 top-k를 모두 차지하지 않도록 문서당 결과 수를 size개로 제한하고 남은 자리는 다른 문서로 채웁니다.
+Milvus grouping search(group_by_field/group_size)를 쓸 수 있으면 사용하고,
+아니면 limit을 늘려 가져온 뒤 점수 순서대로 한 번 훑으며 제한합니다.
+
+parameters 예시:
+    {"group": {"field": "file_no", "size": 2}}
+"""
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+GROUP_FIELDS = ("file_no",)
+
+
+def group_options(parameters: Optional[Dict[Any, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    searchParameter.group 블록 파싱
+
+    Returns:
+        {"field": "file_no", "size": int} (블록이 없거나 enabled=false면 None)
+    """
+    block = parameters.get("group") if isinstance(parameters, dict) else None
+    if not isinstance(block, dict) or block.get("enabled") is False:
+        return None
+    field = str(block.get("field") or "file_no")
+    if field not in GROUP_FIELDS:
+        logger.warning(f"[Group] Unsupported group field '{field}', grouping disabled")
+        return None
+    try:
+        size = int(block.get("size") or 1)
+    except (TypeError, ValueError):
+        size = 1
+    return {"field": field, "size": max(size, 1)}
+
+
+class GroupLimiter:
+    """점수 순서로 들어오는 후보의 그룹별 개수 제한 (단일 패스)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._counts: Dict[str, int] = {}
+
+    def accept(self, key: Any) -> bool:
+        """그룹 여유가 있으면 개수를 세고 True"""
+        key = str(key or "")
+        count = self._counts.get(key, 0)
+        if count >= self.size:
+            return False
+        self._counts[key] = count + 1
+        return True
+
+
+def cap_per_group(candidates: List[Dict[str, Any]], size: int, limit: int) -> List[Dict[str, Any]]:
+    """점수 순 후보에서 metadata.file_no별 size개까지, 최대 limit개 선택"""
+    limiter = GroupLimiter(size)
+    selected: List[Dict[str, Any]] = []
+    for candidate in candidates:
+        if limiter.accept(candidate.get("metadata", {}).get("file_no")):
+            selected.append(candidate)
+            if len(selected) >= limit:
+                break
+    return selected
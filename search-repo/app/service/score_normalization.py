@@ -0,0 +1,37 @@
+"""
+검색 점수 정규화 유틸리티
+metric이 다른 컬렉션의 결과를 하나의 순위로 병합하기 위해 0~1 유사도로 변환합니다.
+"""
+from typing import List
+
+
+def normalize_scores(scores: List[float], metric_type: str) -> List[float]:
+    """
+    metric별 원점수를 0~1 유사도(클수록 유사)로 변환
+
+    - COSINE: [-1, 1] → (s + 1) / 2
+    - L2: 거리 → 1 / (1 + d)
+    - IP: 값이 [-1, 1] 범위면 COSINE과 동일, 아니면 대상 내 min-max
+    - RRF: 대상 내 최고 점수 대비 비율
+
+    Args:
+        scores: 원점수 리스트
+        metric_type: 인덱스 metric_type
+
+    Returns:
+        정규화 점수 리스트 (입력 순서 유지)
+    """
+    if not scores:
+        return []
+    metric = (metric_type or "COSINE").upper()
+    if metric == "RRF":
+        top = max(scores)
+        return [float(s) / top if top > 0 else 0.0 for s in scores]
+    if metric == "L2":
+        return [1.0 / (1.0 + max(float(s), 0.0)) for s in scores]
+    if metric == "IP" and any(abs(s) > 1.0 for s in scores):
+        low, high = min(scores), max(scores)
+        if high == low:
+            return [1.0 for _ in scores]
+        return [(float(s) - low) / (high - low) for s in scores]
+    return [min(max((float(s) + 1.0) / 2.0, 0.0), 1.0) for s in scores]
@@ -0,0 +1,131 @@
+"""
+검색 결과 캐시 서비스
+Redis에 (컬렉션, 파티션, 양자화 벡터 해시, topK, threshold, 전략 파라미터, 컬렉션 버전) 기준으로
+전략 검색 결과를 저장합니다.
+컬렉션 버전(search:collection_version:{collection})은 embedding 서비스의 삽입과
+backend의 파일 삭제 시 증가하므로, 버전이 달라진 캐시는 자동으로 무시됩니다.
+"""
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from redis.asyncio import Redis
+from app.core.settings import settings
+from loguru import logger
+
+
+def collection_version_key(collection_name: str) -> str:
+    """컬렉션 버전 카운터 키 (embedding/backend 서비스와 공유)"""
+    return f"search:collection_version:{collection_name}"
+
+
+class SearchCacheService:
+    """검색 결과 Redis 캐시 (버전 기반 무효화)"""
+
+    def __init__(self):
+        self.redis_client: Optional[Redis] = None
+        self.enabled = settings.search_cache_enabled
+        self.ttl_seconds = settings.search_cache_ttl_seconds
+
+    async def _get_redis_client(self) -> Redis:
+        """Redis 클라이언트 가져오기"""
+        if self.redis_client is None:
+            import redis.asyncio as redis
+            self.redis_client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True
+            )
+        return self.redis_client
+
+    @staticmethod
+    def build_cache_key(
+        strategy_name: str,
+        collection_name: str,
+        embedding: List[float],
+        parameters: Dict[Any, Any],
+        query: Optional[str] = None,
+    ) -> str:
+        """
+        캐시 키 생성
+        - 벡터는 float16으로 양자화하여 해시 (부동소수 미세 오차로 인한 미스 방지,
+          정규화되지 않은 벡터도 float16 범위로 잘라 오버플로 없이 해시)
+        - partition/topK/threshold는 parameters에 포함되어 함께 해시됨
+        """
+        digest = hashlib.sha1()
+        vector = np.clip(np.asarray(embedding, dtype=np.float32), -65504.0, 65504.0)
+        digest.update(vector.astype("<f2").tobytes())
+        digest.update(json.dumps(parameters or {}, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update((query or "").encode("utf-8"))
+        return f"search:cache:{collection_name}:{strategy_name}:{digest.hexdigest()}"
+
+    async def get_or_search(
+        self,
+        strategy_name: str,
+        collection_name: str,
+        embedding: List[float],
+        parameters: Dict[Any, Any],
+        search: Callable[[], Awaitable[Dict[str, Any]]],
+        query: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        캐시 조회 후 미스면 search()를 실행하고 결과 저장
+
+        버전과 캐시 값을 MGET 한 번으로 조회하고, 저장 시에는 검색 전에 읽은 버전을 기록하여
+        검색 도중 삽입/삭제가 일어난 경우 해당 결과가 이후 요청에 재사용되지 않도록 합니다.
+
+        Args:
+            strategy_name: 검색 전략 이름
+            collection_name: 컬렉션 이름
+            embedding: 쿼리 벡터
+            parameters: 검색 파라미터 (partition/topK/threshold 포함)
+            search: 캐시 미스 시 실행할 검색 코루틴 함수
+            query: 쿼리 원문 (hybrid 전략)
+
+        Returns:
+            전략 검색 결과 딕셔너리
+        """
+        if not self.enabled:
+            return await search()
+
+        version = "0"
+        try:
+            cache_key = self.build_cache_key(strategy_name, collection_name, embedding, parameters, query)
+            redis = await self._get_redis_client()
+            raw_version, raw_cached = await redis.mget(collection_version_key(collection_name), cache_key)
+            version = raw_version or "0"
+            if raw_cached:
+                cached = json.loads(raw_cached)
+                if cached.get("version") == version:
+                    logger.debug(f"Search cache hit: collection={collection_name}, version={version}")
+                    return cached["result"]
+        except Exception as e:
+            logger.warning(f"Search cache lookup failed: {str(e)}")
+            return await search()
+
+        result = await search()
+        try:
+            await redis.set(
+                cache_key,
+                json.dumps({"version": version, "result": result}, ensure_ascii=False, default=str),
+                ex=self.ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Search cache store failed: {str(e)}")
+        return result
+
+
+# 싱글톤 인스턴스
+_cache_service: Optional[SearchCacheService] = None
+
+
+def get_search_cache_service() -> SearchCacheService:
+    """SearchCacheService 싱글톤 인스턴스 반환"""
+    global _cache_service
+    if _cache_service is None:
+        _cache_service = SearchCacheService()
+    return _cache_service
@@ -0,0 +1,90 @@
+"""
+컬렉션별 튜닝된 검색 파라미터 조회 서비스
+embedding 서비스의 app/scripts/tune_search_params.py가 Redis search:config:{collection}에 저장한
+ef / nprobe를 요청에 값이 없을 때 기본값으로 사용합니다.
+"""
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+from app.core.settings import settings
+
+TUNED_PARAMS = ("ef", "nprobe")
+
+
+def search_config_key(collection_name: str) -> str:
+    """컬렉션 검색 설정 키 (embedding 서비스 튜닝 스크립트와 공유)"""
+    return f"search:config:{collection_name}"
+
+
+class SearchConfigService:
+    """튜닝 결과 캐시 (동기, 검색 스레드 풀에서 호출)"""
+
+    def __init__(self):
+        self.ttl_seconds = settings.search_config_ttl_seconds
+        self._client = None
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True,
+                socket_timeout=0.5,
+            )
+        return self._client
+
+    def get(self, collection_name: str) -> Dict[str, Any]:
+        """
+        튜닝된 검색 파라미터 조회 (없거나 Redis 오류 시 빈 딕셔너리, 둘 다 TTL 동안 캐시)
+
+        Returns:
+            {"ef": int} 또는 {"nprobe": int}
+        """
+        now = time.monotonic()
+        cached = self._cache.get(collection_name)
+        if cached and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+        config: Dict[str, Any] = {}
+        try:
+            raw = self._get_client().get(search_config_key(collection_name))
+            stored = json.loads(raw) if raw else {}
+            config = {key: int(stored[key]) for key in TUNED_PARAMS if stored.get(key)}
+        except Exception as e:
+            logger.warning(f"[SearchConfig] Failed to load search config for '{collection_name}': {e}")
+        with self._lock:
+            self._cache[collection_name] = (now, config)
+        return config
+
+    def apply(self, collection_name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """요청에 ef/nprobe가 없으면 튜닝 값으로 채운 options 반환"""
+        if not settings.search_config_enabled or all(options.get(key) is not None for key in TUNED_PARAMS):
+            return options
+        tuned = self.get(collection_name)
+        if not tuned:
+            return options
+        merged = dict(options)
+        for key, value in tuned.items():
+            if merged.get(key) is None:
+                merged[key] = value
+        return merged
+
+
+# 싱글톤 인스턴스
+_search_config_service: Optional[SearchConfigService] = None
+
+
+def get_search_config_service() -> SearchConfigService:
+    """SearchConfigService 싱글톤 인스턴스 반환"""
+    global _search_config_service
+    if _search_config_service is None:
+        _search_config_service = SearchConfigService()
+    return _search_config_service
@@ -0,0 +1,129 @@
+"""
+검색 필터 → Milvus boolean expression 변환
+- file_no in [...] : v1/v2 모두 push-down
+- category / 업로드 기간(created_at) : v2 스키마의 스칼라 필드로 push-down,
+  v1 컬렉션은 metadata(CATEGORY, CREATED_AT)로 후처리 필터
+  (metadata CATEGORY는 embedding 서비스가 카테고리와 함께 색인한 청크에만 있음, 그 이전 청크는 v2 마이그레이션 필요)
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """ISO 문자열/epoch 값을 UTC epoch 초로 변환 (timezone 없는 값은 UTC로 간주)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _quote(value: str) -> str:
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _in_expr(field: str, values: List[str]) -> str:
+    return f"{field} in [{', '.join(_quote(v) for v in values)}]"
+
+
+class FilterSpec:
+    """검색 필터 조건"""
+
+    def __init__(
+        self,
+        file_nos: Optional[List[str]] = None,
+        categories: Optional[List[str]] = None,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+    ):
+        self.file_nos = [str(v) for v in (file_nos or []) if v]
+        self.categories = [str(v) for v in (categories or []) if v]
+        self.created_from = created_from
+        self.created_to = created_to
+
+    @classmethod
+    def from_parameters(cls, parameters: Optional[Dict[Any, Any]]) -> Optional["FilterSpec"]:
+        """searchParameter.filter 딕셔너리에서 생성 (조건이 없으면 None)"""
+        raw = (parameters or {}).get("filter") if isinstance(parameters, dict) else None
+        if not isinstance(raw, dict):
+            return None
+        spec = cls(
+            file_nos=raw.get("fileNos"),
+            categories=raw.get("categories"),
+            created_from=to_epoch(raw.get("createdFrom")),
+            created_to=to_epoch(raw.get("createdTo")),
+        )
+        return spec if not spec.is_empty() else None
+
+    def is_empty(self) -> bool:
+        return not (self.file_nos or self.categories or self.created_from is not None or self.created_to is not None)
+
+    def has_scalar_conditions(self) -> bool:
+        """v2 스칼라 필드가 필요한 조건(category, 기간) 포함 여부"""
+        return bool(self.categories) or self.created_from is not None or self.created_to is not None
+
+    def to_expr(self, typed_fields: bool) -> Tuple[str, bool]:
+        """
+        Milvus expression 생성
+
+        Args:
+            typed_fields: 컬렉션이 v2 스키마(category, created_at 필드 보유)인지 여부
+
+        Returns:
+            (expression, 모든 조건이 push-down 되었는지 여부)
+        """
+        clauses: List[str] = []
+        if self.file_nos:
+            clauses.append(_in_expr("file_no", self.file_nos))
+        if typed_fields:
+            if self.categories:
+                clauses.append(_in_expr("category", self.categories))
+            if self.created_from is not None:
+                clauses.append(f"created_at >= {self.created_from}")
+            if self.created_to is not None:
+                clauses.append(f"created_at <= {self.created_to}")
+        if not typed_fields and self.categories:
+            logger.warning(
+                "[Filter] category filter on a v1 collection only matches chunks indexed with metadata CATEGORY; "
+                "chunks indexed before that have no category (run migrate_schema_v2 to filter them)"
+            )
+        fully_pushed = typed_fields or not self.has_scalar_conditions()
+        return " and ".join(f"({c})" for c in clauses), fully_pushed
+
+    def matches(self, file_no: str, metadata: Dict[str, Any], category: Optional[str] = None, created_at: Optional[int] = None) -> bool:
+        """
+        후처리 필터 (post-filter 확장 검색 및 v1 컬렉션용)
+
+        Args:
+            file_no: 결과 file_no
+            metadata: 파싱된 metadata (v1: CATEGORY, CREATED_AT 사용)
+            category: v2 category 필드 값
+            created_at: v2 created_at 필드 값 (epoch)
+        """
+        if self.file_nos and str(file_no) not in self.file_nos:
+            return False
+        if self.categories:
+            value = category if category is not None else (metadata or {}).get("CATEGORY")
+            if value not in self.categories:
+                return False
+        if self.created_from is not None or self.created_to is not None:
+            epoch = created_at if created_at is not None else to_epoch((metadata or {}).get("CREATED_AT"))
+            if epoch is None:
+                return False
+            if self.created_from is not None and epoch < self.created_from:
+                return False
+            if self.created_to is not None and epoch > self.created_to:
+                return False
+        return True
@@ -0,0 +1,99 @@
+"""
+BM25 희소 쿼리 인코더
+embedding 서비스(app/service/sparse_encoder.py)와 같은 토큰화/해시 규칙으로 쿼리를 변환하고,
+Redis에 누적된 컬렉션별 문서 빈도(DF)로 IDF 가중치를 계산합니다.
+"""
+import math
+import re
+import zlib
+from typing import Dict, List, Optional
+
+from loguru import logger
+from app.core.settings import settings
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+
+
+def tokenize(text: str) -> List[str]:
+    """토큰화: 소문자 영숫자/한글 어절 + 한글 어절의 문자 bigram"""
+    terms: List[str] = []
+    for token in TOKEN_PATTERN.findall((text or "").lower()):
+        terms.append(token)
+        if len(token) > 2 and HANGUL_PATTERN.match(token):
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return terms
+
+
+def term_id(term: str) -> int:
+    """용어 → 희소 벡터 인덱스 (crc32, 프로세스 간 안정적)"""
+    return zlib.crc32(term.encode("utf-8"))
+
+
+class SparseQueryEncoder:
+    """쿼리 측 BM25 IDF 가중치 희소 벡터 생성 (동기, 검색 스레드 풀에서 호출)"""
+
+    def __init__(self):
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                username=settings.redis_username,
+                db=settings.redis_db,
+                decode_responses=True,
+            )
+        return self._client
+
+    def encode(self, collection_name: str, query: str) -> Optional[Dict[int, float]]:
+        """
+        쿼리 텍스트를 IDF 가중 희소 벡터로 변환
+
+        Args:
+            collection_name: DF 통계를 조회할 컬렉션 이름
+            query: 쿼리 텍스트
+
+        Returns:
+            {term_id: idf} (토큰이 없으면 None)
+        """
+        term_ids = list(dict.fromkeys(term_id(t) for t in tokenize(query)))
+        if not term_ids:
+            return None
+        docs = 0.0
+        dfs: List[Optional[str]] = [None] * len(term_ids)
+        try:
+            client = self._get_client()
+            pipe = client.pipeline(transaction=False)
+            pipe.hget(f"sparse:stats:{collection_name}", "docs")
+            pipe.hmget(f"sparse:df:{collection_name}", [str(t) for t in term_ids])
+            raw_docs, dfs = pipe.execute()
+            docs = float(raw_docs or 0)
+        except Exception as e:
+            # 통계 조회 실패 시 모든 용어 동일 가중치
+            logger.warning(f"[Sparse] Failed to load DF stats for '{collection_name}': {e}")
+
+        vector: Dict[int, float] = {}
+        for tid, df in zip(term_ids, dfs):
+            df_value = float(df or 0)
+            if docs > 0 and df_value == 0:
+                # 컬렉션에 없는 용어는 검색에 기여하지 않음
+                continue
+            idf = math.log(1 + (docs - df_value + 0.5) / (df_value + 0.5)) if docs > 0 else 1.0
+            vector[tid] = idf
+        return vector or None
+
+
+# 싱글톤 인스턴스
+_query_encoder: Optional[SparseQueryEncoder] = None
+
+
+def get_sparse_query_encoder() -> SparseQueryEncoder:
+    """SparseQueryEncoder 싱글톤 인스턴스 반환"""
+    global _query_encoder
+    if _query_encoder is None:
+        _query_encoder = SparseQueryEncoder()
+    return _query_encoder
@@ -5,8 +5,14 @@ Search Strategy 모듈
 
 from .base import BaseSearchStrategy
 from .semantic import Semantic
+from .native import Native
+from .hybrid import Hybrid
+from .local import Local
 __all__ = [
     "BaseSearchStrategy",
-    "Semantic"
+    "Semantic",
+    "Native",
+    "Hybrid",
+    "Local"
 ]
 
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
 from loguru import logger
+import json
 
 
 class BaseSearchStrategy(ABC):
@@ -25,3 +26,24 @@ class BaseSearchStrategy(ABC):
         """
         pass
 
+    @staticmethod
+    def parse_metadata(raw: Any) -> Dict[str, Any]:
+        """
+        Milvus metadata 필드(JSON 문자열)를 딕셔너리로 변환
+        
+        Args:
+            raw: JSON 문자열 또는 딕셔너리
+        
+        Returns:
+            메타데이터 딕셔너리 (파싱 실패 시 빈 딕셔너리)
+        """
+        if isinstance(raw, dict):
+            return raw
+        if not raw:
+            return {}
+        try:
+            parsed = json.loads(raw)
+            return parsed if isinstance(parsed, dict) else {}
+        except (TypeError, ValueError):
+            logger.warning(f"Failed to parse metadata: {str(raw)[:100]}")
+            return {}
@@ -0,0 +1,164 @@
+from .native import Native, OUTPUT_FIELDS
+from typing import Dict, Any, List
+from loguru import logger
+from app.service.milvus_connection_service import get_milvus_connection_service
+from app.service.sparse_encoder import get_sparse_query_encoder
+from app.service.search_filter import FilterSpec
+from app.service.mmr import VECTOR_KEY, apply_mmr, mmr_options
+from app.service.search_config_service import get_search_config_service
+from app.service.collection_layout import resolve_collection
+from app.service.result_grouping import cap_per_group, group_options
+from app.core.settings import settings
+
+try:
+    from pymilvus import AnnSearchRequest, RRFRanker
+    HYBRID_AVAILABLE = True
+except ImportError:
+    AnnSearchRequest = None
+    RRFRanker = None
+    HYBRID_AVAILABLE = False
+
+SPARSE_FIELD = "sparse_vector"
+
+
+class Hybrid(Native):
+    """
+    Dense(HNSW) + BM25 Sparse 하이브리드 검색 전략
+    두 검색 결과를 Milvus hybrid_search의 RRF(Reciprocal Rank Fusion)로 병합합니다.
+
+    parameters 예시:
+        {
+            "hybrid": {"topK": 10, "candidateK": 40, "rrfK": 60, "ef": 128}
+        }
+    query_embedding에 "query"(원문)가 없거나 컬렉션에 sparse_vector 필드가 없으면
+    dense 검색(Native)으로 동작합니다. 반환 score는 RRF 점수입니다.
+    BM25 통계는 partition_key 레이아웃에서도 오퍼(요청 컬렉션 이름)별로 유지됩니다.
+    group 옵션은 RRF 결과를 over-fetch한 뒤 문서별 개수를 제한합니다 (hybrid_search는 grouping 미사용).
+    """
+
+    OPTION_BLOCKS = ("semantic", "native", "hybrid")
+
+    @staticmethod
+    def _hybrid_options(parameters: Dict[Any, Any], top_k: int) -> Dict[str, int]:
+        block = parameters.get("hybrid") if isinstance(parameters, dict) else None
+        block = block if isinstance(block, dict) else {}
+        try:
+            candidate_k = int(block.get("candidateK") or max(top_k * 4, 20))
+        except (TypeError, ValueError):
+            candidate_k = max(top_k * 4, 20)
+        try:
+            rrf_k = int(block.get("rrfK") or 60)
+        except (TypeError, ValueError):
+            rrf_k = 60
+        return {"candidateK": max(candidate_k, top_k), "rrfK": rrf_k}
+
+    def search(self, query_embedding: Dict[Any, Any], collection: str = None, parameters: Dict[Any, Any] = None) -> Dict[Any, Any]:
+        """
+        Dense + Sparse 검색 후 RRF 병합
+
+        Args:
+            query_embedding: {"embedding": [...], "query": "원문"} 딕셔너리
+            collection: 컬렉션 이름
+            parameters: 호출 시점 파라미터
+
+        Returns:
+            검색 결과 딕셔너리 (score는 RRF 점수)
+        """
+        if not query_embedding or "embedding" not in query_embedding:
+            raise ValueError("query_embedding must contain 'embedding' field")
+        if not collection:
+            raise ValueError("collection name is required")
+
+        service = get_milvus_connection_service()
+        call_parameters = parameters if isinstance(parameters, dict) else self.parameters
+        query_text = (query_embedding.get("query") or "").strip()
+        target = resolve_collection(collection)
+
+        try:
+            milvus_collection = service.get_collection(target.name)
+            has_sparse = any(field.name == SPARSE_FIELD for field in milvus_collection.schema.fields)
+        except Exception as e:
+            logger.error(f"[Hybrid] Error loading collection: {str(e)}")
+            service.invalidate(target.name)
+            raise
+
+        sparse_vector = get_sparse_query_encoder().encode(collection, query_text) if (query_text and has_sparse) else None
+        if not HYBRID_AVAILABLE or sparse_vector is None:
+            logger.info(
+                f"[Hybrid] Falling back to dense search (query={'yes' if query_text else 'no'}, sparse_field={has_sparse})"
+            )
+            result = super().search(query_embedding, collection, parameters)
+            result["strategy"] = "hybrid"
+            return result
+
+        # 요청에 ef/nprobe가 없으면 컬렉션별 튜닝 값 사용
+        options = get_search_config_service().apply(target.name, self._search_options(call_parameters))
+        hybrid_options = self._hybrid_options(call_parameters, options["topK"])
+        partition = self._parse_partition(call_parameters) or self.partition
+        top_k = options["topK"]
+        mmr = mmr_options(call_parameters, top_k)
+        # MMR 사용 시 RRF 상위 fetchK개를 벡터와 함께 가져와 topK개로 줄임
+        fetch_k = mmr["fetchK"] if mmr else top_k
+        group = group_options(call_parameters)
+        limit = min(fetch_k * settings.search_group_overfetch_multiplier, settings.filter_max_search_limit) if group else fetch_k
+        candidate_k = max(hybrid_options["candidateK"], limit)
+        # 필터는 두 검색 모두에 pre-filter로 적용 (v1 컬렉션의 category/기간 조건은 후처리)
+        spec = FilterSpec.from_parameters(call_parameters)
+        typed_fields = any(field.name == "category" for field in milvus_collection.schema.fields)
+        expr, fully_pushed = spec.to_expr(typed_fields) if spec else ("", True)
+        expr = target.scoped(expr)
+
+        try:
+            metric_type = service.get_metric_type(target.name)
+            dense_request = AnnSearchRequest(
+                data=[query_embedding["embedding"]],
+                anns_field="vector",
+                param=self.build_search_params(metric_type, candidate_k, options["threshold"], options["ef"], options["nprobe"]),
+                limit=candidate_k,
+                expr=expr or None,
+            )
+            sparse_request = AnnSearchRequest(
+                data=[sparse_vector],
+                anns_field=SPARSE_FIELD,
+                param={"metric_type": "IP", "params": {"drop_ratio_search": 0.0}},
+                limit=candidate_k,
+                expr=expr or None,
+            )
+            logger.info(
+                f"[Hybrid] Searching collection={target.name}, partition={partition}, top_k={top_k}, "
+                f"fetch_k={fetch_k}, limit={limit}, candidate_k={candidate_k}, rrf_k={hybrid_options['rrfK']}, "
+                f"group={group}, sparse_terms={len(sparse_vector)}"
+            )
+            hits = milvus_collection.hybrid_search(
+                reqs=[dense_request, sparse_request],
+                rerank=RRFRanker(hybrid_options["rrfK"]),
+                limit=limit,
+                output_fields=OUTPUT_FIELDS + ([VECTOR_KEY] if mmr else []),
+                partition_names=[partition] if partition else None,
+            )[0]
+        except Exception as e:
+            logger.error(f"[Hybrid] Error during search: {str(e)}")
+            service.invalidate(target.name)
+            raise
+
+        candidate_embeddings: List[Dict[str, Any]] = []
+        for hit in hits:
+            candidate = self._to_candidate(hit, with_vector=mmr is not None)
+            if not fully_pushed and not self._matches_filter(spec, hit, candidate):
+                continue
+            candidate_embeddings.append(candidate)
+        if group:
+            candidate_embeddings = cap_per_group(candidate_embeddings, group["size"], fetch_k)
+        if mmr:
+            candidate_embeddings = apply_mmr(query_embedding["embedding"], candidate_embeddings, top_k, mmr["lambda"])
+
+        logger.info(f"[Hybrid] Found {len(candidate_embeddings)} candidates")
+        return {
+            "collection": collection,
+            "topK": top_k,
+            "candidateEmbeddings": candidate_embeddings,
+            "count": len(candidate_embeddings),
+            "strategy": "hybrid",
+            "metricType": "RRF",
+            "parameters": self.parameters
+        }
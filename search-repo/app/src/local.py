@@ -0,0 +1,93 @@
+from .native import Native
+from typing import Dict, Any, List
+from loguru import logger
+from app.core.settings import settings
+from app.service.local_vector_store import get_local_vector_store
+from app.service.search_filter import FilterSpec
+from app.service.mmr import VECTOR_KEY, apply_mmr, mmr_options
+from app.service.result_grouping import cap_per_group, group_options
+
+
+class Local(Native):
+    """
+    로컬 벡터 저장소(memmap + SQLite 사이드카, 선택적 hnswlib) 검색 전략
+    vector_store_backend=local 설정 시 요청 전략과 무관하게 이 전략이 사용됩니다.
+
+    parameters는 Native와 같습니다 (semantic/native 블록의 topK/threshold/ef, partition, filter, mmr, group).
+    group 옵션은 over-fetch 후 문서별 개수를 제한합니다.
+    """
+
+    def search(self, query_embedding: Dict[Any, Any], collection: str = None, parameters: Dict[Any, Any] = None) -> Dict[Any, Any]:
+        """
+        로컬 컬렉션 검색
+
+        filter 조건은 모두 SQLite 사이드카에서 처리되므로 v1/v2 스키마 구분 없이 push-down 됩니다.
+
+        Args:
+            query_embedding: 쿼리 임베딩 딕셔너리 (embedding 필드 포함)
+            collection: 컬렉션 이름
+            parameters: 호출 시점 파라미터 (없으면 생성 시 파라미터 사용)
+
+        Returns:
+            검색 결과 딕셔너리 (metricType 포함)
+        """
+        if not query_embedding or "embedding" not in query_embedding:
+            raise ValueError("query_embedding must contain 'embedding' field")
+        if not collection:
+            raise ValueError("collection name is required")
+
+        call_parameters = parameters if isinstance(parameters, dict) else self.parameters
+        options = self._search_options(call_parameters)
+        partition = self._parse_partition(call_parameters) or self.partition
+        top_k = options["topK"]
+        threshold = options["threshold"]
+        spec = FilterSpec.from_parameters(call_parameters)
+        mmr = mmr_options(call_parameters, top_k)
+        fetch_k = mmr["fetchK"] if mmr else top_k
+        group = group_options(call_parameters)
+        limit = fetch_k * settings.search_group_overfetch_multiplier if group else fetch_k
+
+        local_collection = get_local_vector_store().get_collection(collection)
+        logger.info(
+            f"[Local] Searching collection={collection}, partition={partition}, top_k={top_k}, fetch_k={fetch_k}, limit={limit}, "
+            f"filter={'yes' if spec else 'no'}, group={group}, ef={options['ef']}"
+        )
+        hits = local_collection.search(
+            query_embedding["embedding"],
+            limit,
+            partition=partition,
+            file_nos=spec.file_nos if spec else None,
+            categories=spec.categories if spec else None,
+            created_from=spec.created_from if spec else None,
+            created_to=spec.created_to if spec else None,
+            ef=options["ef"],
+            exact_scan_max_rows=settings.local_exact_scan_max_rows,
+            with_vectors=mmr is not None,
+        )
+
+        candidate_embeddings: List[Dict[str, Any]] = []
+        for hit in hits:
+            if threshold is not None and not self.passes_threshold(hit["score"], threshold, local_collection.metric):
+                continue
+            candidate = {
+                "text": hit["text"],
+                "metadata": {
+                    "id": hit["id"],
+                    "file_no": hit["file_no"],
+                    "metadata": self.parse_metadata(hit["metadata"]),
+                },
+                "score": hit["score"],
+            }
+            if mmr:
+                candidate[VECTOR_KEY] = hit.get(VECTOR_KEY)
+            candidate_embeddings.append(candidate)
+        if group:
+            candidate_embeddings = cap_per_group(candidate_embeddings, group["size"], fetch_k)
+        if mmr:
+            candidate_embeddings = apply_mmr(query_embedding["embedding"], candidate_embeddings, top_k, mmr["lambda"])
+
+        logger.info(f"[Local] Found {len(candidate_embeddings)} candidates")
+        result = self._result(collection, top_k, candidate_embeddings)
+        result["strategy"] = "local"
+        result["metricType"] = local_collection.metric
+        return result
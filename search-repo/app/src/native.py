@@ -0,0 +1,292 @@
+from .base import BaseSearchStrategy
+from typing import Dict, Any, List, Optional
+from loguru import logger
+import math
+from app.core.settings import settings
+from app.service.milvus_connection_service import get_milvus_connection_service
+from app.service.filter_stats_service import get_filter_stats_service
+from app.service.search_filter import FilterSpec
+from app.service.mmr import VECTOR_KEY, apply_mmr, mmr_options
+from app.service.search_config_service import get_search_config_service
+from app.service.collection_layout import resolve_collection
+from app.service.result_grouping import GroupLimiter, group_options
+
+
+# 유사도가 클수록 가까운 metric (radius/range_filter 하한 push-down 가능)
+SIMILARITY_METRICS = {"COSINE", "IP"}
+OUTPUT_FIELDS = ["text", "file_no", "metadata"]
+# grouping search 미지원(구버전 서버/SDK, 파라미터 거부)으로 판단하는 오류 메시지
+GROUPING_UNSUPPORTED_MARKERS = ("group_by", "group by", "groupby", "not support", "unsupported", "unknown param", "invalid param")
+
+
+class Native(BaseSearchStrategy):
+    """
+    pymilvus Collection.search 직접 호출 검색 전략
+    LangChain 래핑 없이 ef/nprobe, output_fields, range search를 직접 지정합니다.
+
+    parameters 예시:
+        {
+            "partition": "public",
+            "native": {"topK": 30, "threshold": 0.4, "ef": 128, "nprobe": 16},
+            "mmr": {"lambda": 0.5, "fetchK": 120},
+            "group": {"field": "file_no", "size": 2}
+        }
+    native 블록이 없으면 semantic 블록의 topK/threshold를 사용합니다.
+    mmr 블록이 있으면 fetchK개를 벡터와 함께 가져와 MMR로 topK개를 고릅니다.
+    group 블록이 있으면 문서(file_no)당 size개까지만 결과에 포함하고 남은 자리는 다른 문서로 채웁니다.
+    ef/nprobe가 없으면 컬렉션별 튜닝 값(search:config:{collection})을 사용합니다.
+    collection_layout=partition_key이면 오퍼 컬렉션 대신 공유 컬렉션을 offer_no 조건으로 검색합니다.
+    """
+
+    # 뒤의 블록이 앞의 블록 값을 덮어씀
+    OPTION_BLOCKS = ("semantic", "native")
+    # Milvus grouping search를 서버/SDK가 지원하지 않으면 프로세스 동안 over-fetch 방식 사용
+    _native_grouping_supported = True
+
+    def __init__(self, parameters: Dict[Any, Any] = None):
+        super().__init__(parameters)
+        self.partition = self._parse_partition(self.parameters)
+
+    @staticmethod
+    def _parse_partition(parameters: Dict[Any, Any]) -> Optional[str]:
+        try:
+            partition = parameters.get("partition")
+            return str(partition).strip() if partition else None
+        except Exception:
+            return None
+
+    @classmethod
+    def _search_options(cls, parameters: Dict[Any, Any]) -> Dict[str, Any]:
+        """OPTION_BLOCKS 순서(native > semantic)로 topK/threshold/ef/nprobe 추출"""
+        options = {"topK": 5, "threshold": None, "ef": None, "nprobe": None}
+        if not isinstance(parameters, dict):
+            return options
+        for block_name in cls.OPTION_BLOCKS:
+            block = parameters.get(block_name)
+            if not isinstance(block, dict):
+                continue
+            for key, cast in (("topK", int), ("threshold", float), ("ef", int), ("nprobe", int)):
+                if block.get(key) is None:
+                    continue
+                try:
+                    options[key] = cast(block.get(key))
+                except (TypeError, ValueError):
+                    logger.warning(f"[Native] Ignoring invalid {block_name}.{key}: {block.get(key)}")
+        return options
+
+    @staticmethod
+    def build_search_params(metric_type: str, top_k: int, threshold: Optional[float], ef: Optional[int], nprobe: Optional[int]) -> Dict[str, Any]:
+        """
+        Milvus search param 구성
+
+        COSINE/IP는 threshold를 radius(하한)로 push-down 하고,
+        L2는 거리 의미가 반대이므로 push-down 하지 않습니다 (후처리 필터).
+        """
+        params: Dict[str, Any] = {}
+        # HNSW는 ef >= limit 이어야 함
+        params["ef"] = max(ef or 64, top_k)
+        if nprobe:
+            params["nprobe"] = nprobe
+        if threshold is not None and metric_type in SIMILARITY_METRICS:
+            params["radius"] = threshold
+            if metric_type == "COSINE":
+                params["range_filter"] = 1.0
+        return {"metric_type": metric_type, "params": params}
+
+    @staticmethod
+    def grouping_unsupported(error: Exception) -> bool:
+        """grouping search 미지원 오류인지 (타임아웃 등 일시적 오류는 False)"""
+        if isinstance(error, TypeError):
+            return True
+        message = str(error).lower()
+        if "timeout" in message or "deadline" in message:
+            return False
+        return any(marker in message for marker in GROUPING_UNSUPPORTED_MARKERS)
+
+    @staticmethod
+    def passes_threshold(score: float, threshold: float, metric_type: str) -> bool:
+        """threshold 후처리 (COSINE/IP는 score > threshold, L2는 거리이므로 score < threshold)"""
+        if metric_type in SIMILARITY_METRICS:
+            return score > threshold
+        return score < threshold
+
+    def _to_candidate(self, hit: Any, with_vector: bool = False) -> Dict[str, Any]:
+        """Milvus hit → 후보 딕셔너리 (metadata.metadata는 파싱된 딕셔너리, MMR용 vector 선택)"""
+        candidate = {
+            "text": hit.entity.get("text") or "",
+            "metadata": {
+                "id": hit.id,
+                "file_no": hit.entity.get("file_no") or "",
+                "metadata": self.parse_metadata(hit.entity.get("metadata")),
+            },
+            "score": float(hit.distance),
+        }
+        if with_vector:
+            candidate[VECTOR_KEY] = hit.entity.get(VECTOR_KEY)
+        return candidate
+
+    @staticmethod
+    def _matches_filter(spec: Optional[FilterSpec], hit: Any, candidate: Dict[str, Any]) -> bool:
+        if spec is None:
+            return True
+        return spec.matches(
+            candidate["metadata"]["file_no"],
+            candidate["metadata"]["metadata"],
+            category=hit.entity.get("category"),
+            created_at=hit.entity.get("created_at"),
+        )
+
+    def search(self, query_embedding: Dict[Any, Any], collection: str = None, parameters: Dict[Any, Any] = None) -> Dict[Any, Any]:
+        """
+        Collection.search로 검색
+
+        parameters.filter(fileNos, categories, createdFrom, createdTo)가 있으면
+        필터 선택도에 따라 다음 중 하나로 검색합니다.
+        - pre-filter: expression을 Milvus에 전달 (선택도가 낮은 필터)
+        - post-filter 확장: 필터 없이 limit을 키워 검색 후 후처리, 부족하면 limit을 2배씩 확장
+          (선택도가 높은 필터 또는 v1 컬렉션의 category/기간 조건)
+
+        group 옵션은 후처리 필터가 없으면 Milvus grouping search(group_by_field/group_size)로,
+        아니면 limit을 늘려 가져온 뒤 후보 수집 루프에서 문서별 개수를 제한합니다.
+
+        Args:
+            query_embedding: 쿼리 임베딩 딕셔너리 (embedding 필드 포함)
+            collection: 컬렉션 이름
+            parameters: 호출 시점 파라미터 (없으면 생성 시 파라미터 사용)
+
+        Returns:
+            검색 결과 딕셔너리 (metadata.metadata는 파싱된 딕셔너리)
+        """
+        if not query_embedding or "embedding" not in query_embedding:
+            raise ValueError("query_embedding must contain 'embedding' field")
+        if not collection:
+            raise ValueError("collection name is required")
+
+        embedding = query_embedding["embedding"]
+        call_parameters = parameters if isinstance(parameters, dict) else self.parameters
+        # partition_key 레이아웃이면 공유 컬렉션 + offer_no 조건 (응답의 collection은 요청 이름 유지)
+        target = resolve_collection(collection)
+        # 요청에 ef/nprobe가 없으면 컬렉션별 튜닝 값 사용
+        options = get_search_config_service().apply(target.name, self._search_options(call_parameters))
+        partition = self._parse_partition(call_parameters) or self.partition
+        top_k = options["topK"]
+        threshold = options["threshold"]
+        spec = FilterSpec.from_parameters(call_parameters)
+        mmr = mmr_options(call_parameters, top_k)
+        # MMR 사용 시 fetchK개를 모은 뒤 topK개로 줄임
+        fetch_k = mmr["fetchK"] if mmr else top_k
+        group = group_options(call_parameters)
+
+        service = get_milvus_connection_service()
+        try:
+            milvus_collection = service.get_collection(target.name)
+            metric_type = service.get_metric_type(target.name)
+            typed_fields = any(field.name == "category" for field in milvus_collection.schema.fields)
+
+            # 필터 실행 계획 결정 (선택도는 오퍼 행 대비 비율)
+            expr, fully_pushed = spec.to_expr(typed_fields) if spec else ("", True)
+            selectivity = (
+                get_filter_stats_service().selectivity(target.name, target.scoped(expr), partition, scope_expr=target.expr)
+                if expr else 1.0
+            )
+            if spec and expr and selectivity == 0.0:
+                logger.info(f"[Native] Filter matches no rows in {collection}: {expr}")
+                return self._result(collection, top_k, [])
+            use_post_filter = spec is not None and (
+                not expr or selectivity >= settings.filter_postfilter_min_selectivity
+            )
+            needs_check = spec is not None and (use_post_filter or not fully_pushed)
+            # 오퍼 조건은 post-filter 경로에서도 항상 push-down
+            search_expr = target.scoped("" if use_post_filter else expr)
+            # grouping search는 그룹 수가 limit이므로 후처리 필터와 함께 쓰지 않음
+            native_group = group is not None and not needs_check and settings.search_group_native_enabled and Native._native_grouping_supported
+            # 후처리 필터나 over-fetch 그룹 제한으로 후보가 부족하면 limit 확장
+            needs_more = needs_check or (group is not None and not native_group)
+            limit = fetch_k
+            if needs_check:
+                limit = min(max(math.ceil(fetch_k / max(selectivity, 0.01) * 1.2), fetch_k * 2), settings.filter_max_search_limit)
+            if group is not None and not native_group:
+                limit = min(max(limit, fetch_k * settings.search_group_overfetch_multiplier), settings.filter_max_search_limit)
+            output_fields = OUTPUT_FIELDS + (["category", "created_at"] if spec and typed_fields else [])
+            if mmr:
+                output_fields = output_fields + [VECTOR_KEY]
+
+            # L2는 push-down 하지 않았으므로 후처리 (거리이므로 score < threshold, passes_threshold 참고)
+            # (grouping search는 range search를 지원하지 않으므로 모든 metric을 후처리)
+            post_threshold = threshold is not None and (native_group or metric_type not in SIMILARITY_METRICS)
+            while True:
+                search_params = self.build_search_params(
+                    metric_type, limit, None if native_group else threshold, options["ef"], options["nprobe"]
+                )
+                search_kwargs: Dict[str, Any] = {}
+                if native_group:
+                    search_kwargs = {"group_by_field": group["field"], "group_size": group["size"]}
+                logger.info(
+                    f"[Native] Searching collection={target.name}, partition={partition}, top_k={top_k}, fetch_k={fetch_k}, limit={limit}, "
+                    f"expr={search_expr or '-'}, post_filter={needs_check}, group={group}, native_group={native_group}, params={search_params}"
+                )
+                try:
+                    hits = milvus_collection.search(
+                        data=[embedding],
+                        anns_field="vector",
+                        param=search_params,
+                        limit=limit,
+                        expr=search_expr or None,
+                        output_fields=output_fields,
+                        partition_names=[partition] if partition else None,
+                        **search_kwargs,
+                    )[0]
+                except Exception as e:
+                    if not native_group:
+                        raise
+                    if self.grouping_unsupported(e):
+                        logger.warning(f"[Native] Grouping search unsupported, using over-fetch grouping from now on: {e}")
+                        Native._native_grouping_supported = False
+                    else:
+                        logger.warning(f"[Native] Grouping search failed, falling back to over-fetch grouping for this request: {e}")
+                    native_group = False
+                    needs_more = True
+                    post_threshold = threshold is not None and metric_type not in SIMILARITY_METRICS
+                    limit = min(fetch_k * settings.search_group_overfetch_multiplier, settings.filter_max_search_limit)
+                    continue
+                if native_group:
+                    # 그룹 단위로 반환되므로 점수 순으로 다시 정렬
+                    hits = sorted(hits, key=lambda hit: float(hit.distance), reverse=metric_type in SIMILARITY_METRICS)
+
+                limiter = GroupLimiter(group["size"]) if group else None
+                candidate_embeddings: List[Dict[str, Any]] = []
+                for hit in hits:
+                    if post_threshold and not self.passes_threshold(float(hit.distance), threshold, metric_type):
+                        continue
+                    candidate = self._to_candidate(hit, with_vector=mmr is not None)
+                    if needs_check and not self._matches_filter(spec, hit, candidate):
+                        continue
+                    if limiter and not limiter.accept(candidate["metadata"]["file_no"]):
+                        continue
+                    candidate_embeddings.append(candidate)
+                    if len(candidate_embeddings) >= fetch_k:
+                        break
+
+                exhausted = len(hits) < limit or limit >= settings.filter_max_search_limit
+                if not needs_more or len(candidate_embeddings) >= fetch_k or exhausted:
+                    break
+                limit = min(limit * 2, settings.filter_max_search_limit)
+        except Exception as e:
+            logger.error(f"[Native] Error during search: {str(e)}")
+            service.invalidate(target.name)
+            raise
+
+        if mmr:
+            candidate_embeddings = apply_mmr(embedding, candidate_embeddings, top_k, mmr["lambda"])
+        logger.info(f"[Native] Found {len(candidate_embeddings)} candidates")
+        return self._result(collection, top_k, candidate_embeddings)
+
+    def _result(self, collection: str, top_k: int, candidate_embeddings: List[Dict[str, Any]]) -> Dict[Any, Any]:
+        return {
+            "collection": collection,
+            "topK": top_k,
+            "candidateEmbeddings": candidate_embeddings,
+            "count": len(candidate_embeddings),
+            "strategy": "native",
+            "parameters": self.parameters
+        }
@@ -1,6 +1,11 @@
 from .base import BaseSearchStrategy
 from typing import Dict, Any, List
 from loguru import logger
+from app.service.milvus_connection_service import get_milvus_connection_service
+from app.service.search_filter import FilterSpec
+from app.service.collection_layout import resolve_collection
+from app.service.result_grouping import cap_per_group, group_options
+from app.core.settings import settings
 import os
 
 try:
@@ -83,14 +88,9 @@ class Semantic(BaseSearchStrategy):
             pass
     
     def _connect_milvus(self):
-        """Milvus에 연결"""
+        """Milvus에 연결 (프로세스 공용 연결 재사용)"""
         try:
-            connections.connect(
-                alias="default",
-                host=self.milvus_host,
-                port=self.milvus_port_int
-            )
-            logger.debug(f"[Basic] Connected to Milvus: {self.milvus_host}:{self.milvus_port_int}")
+            get_milvus_connection_service().connect(self.milvus_host, self.milvus_port_int)
         except Exception as e:
             logger.error(f"[Basic] Failed to connect to Milvus: {str(e)}")
             raise
@@ -112,6 +112,8 @@ class Semantic(BaseSearchStrategy):
         
         embedding = query_embedding["embedding"]
         collection_name = collection or self.default_collection
+        # partition_key 레이아웃이면 공유 컬렉션 + offer_no 조건 (응답의 collection은 요청 이름 유지)
+        target = resolve_collection(collection_name)
         
         # Determine effective top_k/threshold
         # Priority: call-time parameters.semantic > init-time overrides > defaults
@@ -146,8 +148,7 @@ class Semantic(BaseSearchStrategy):
             # Milvus 연결
             self._connect_milvus()
             
-            logger.info(f"[Basic] USE_MILVUS_VECTOR_STORE: {USE_MILVUS_VECTOR_STORE}")
-            logger.info(f"[Basic] Creating vectorstore with host={self.milvus_host}, port={self.milvus_port_int}")
+            logger.debug(f"[Basic] USE_MILVUS_VECTOR_STORE: {USE_MILVUS_VECTOR_STORE}")
             
             # connection_args 준비 (포트는 문자열로 전달)
             connection_args = {
@@ -156,72 +157,103 @@ class Semantic(BaseSearchStrategy):
                 "alias": "default"  # 이미 연결된 connection 사용
             }
             
-            # MilvusVectorStore 생성 (검색용)
-            if USE_MILVUS_VECTOR_STORE:
-                # MilvusVectorStore는 embedding_function 없이 사용 가능
-                # connection_args에 alias를 명시하여 이미 연결된 connection 사용
-                vs_kwargs = {
-                    "collection_name": collection_name,
-                    "connection_args": connection_args
-                }
-                # Apply partition if supported
-                if getattr(self, "partition", None):
-                    vs_kwargs["partition_name"] = self.partition
-                try:
-                    vectorstore = MilvusVectorStore(**vs_kwargs)
-                except TypeError:
-                    # 일부 버전은 partition_name을 생성자에서 지원하지 않음 → 제거 후 재시도
-                    if "partition_name" in vs_kwargs:
-                        _ = vs_kwargs.pop("partition_name", None)
-                        logger.info("[Basic] MilvusVectorStore ctor doesn't support partition_name, retrying without it")
-                        vectorstore = MilvusVectorStore(**vs_kwargs)
-                    else:
-                        raise
-            else:
-                # Milvus 클래스는 embedding_function이 필수이므로 더미 함수 제공
-                # 실제로는 사용하지 않지만 생성자에 필요
-                embedding_dim = len(embedding)
-                class DummyEmbedding:
-                    def embed_documents(self, texts):
-                        return [[0.0] * embedding_dim for _ in texts]
-                    def embed_query(self, text):
-                        return [0.0] * embedding_dim
+            # MilvusVectorStore 생성 (검색용) - 컬렉션/파티션별로 캐시하여 재사용
+            embedding_dim = len(embedding)
+
+            def _build_vectorstore():
+                logger.info(f"[Basic] Creating vectorstore for collection={target.name}")
+                if USE_MILVUS_VECTOR_STORE:
+                    # MilvusVectorStore는 embedding_function 없이 사용 가능
+                    # connection_args에 alias를 명시하여 이미 연결된 connection 사용
+                    vs_kwargs = {
+                        "collection_name": target.name,
+                        "connection_args": connection_args
+                    }
+                    # Apply partition if supported
+                    if getattr(self, "partition", None):
+                        vs_kwargs["partition_name"] = self.partition
+                    try:
+                        return MilvusVectorStore(**vs_kwargs)
+                    except TypeError:
+                        # 일부 버전은 partition_name을 생성자에서 지원하지 않음 → 제거 후 재시도
+                        if "partition_name" in vs_kwargs:
+                            _ = vs_kwargs.pop("partition_name", None)
+                            logger.info("[Basic] MilvusVectorStore ctor doesn't support partition_name, retrying without it")
+                            return MilvusVectorStore(**vs_kwargs)
+                        else:
+                            raise
+                else:
+                    # Milvus 클래스는 embedding_function이 필수이므로 더미 함수 제공
+                    # 실제로는 사용하지 않지만 생성자에 필요
+                    class DummyEmbedding:
+                        def embed_documents(self, texts):
+                            return [[0.0] * embedding_dim for _ in texts]
+                        def embed_query(self, text):
+                            return [0.0] * embedding_dim
                 
-                vs_kwargs = {
-                    "embedding_function": DummyEmbedding(),
-                    "collection_name": collection_name,
-                    "connection_args": connection_args
-                }
-                # 주의: Milvus 클래스 생성자는 partition_name을 지원하지 않는 경우가 많음 → 전달하지 않음
-                try:
-                    vectorstore = MilvusVectorStore(**vs_kwargs)
-                except TypeError as e:
-                    logger.info(f"[Basic] Milvus ctor doesn't accept extra kwargs: {e}. Retrying with minimal args.")
-                    vectorstore = MilvusVectorStore(
-                        embedding_function=vs_kwargs["embedding_function"],
-                        collection_name=collection_name,
-                        connection_args=connection_args
-                    )
+                    vs_kwargs = {
+                        "embedding_function": DummyEmbedding(),
+                        "collection_name": target.name,
+                        "connection_args": connection_args
+                    }
+                    # 주의: Milvus 클래스 생성자는 partition_name을 지원하지 않는 경우가 많음 → 전달하지 않음
+                    try:
+                        return MilvusVectorStore(**vs_kwargs)
+                    except TypeError as e:
+                        logger.info(f"[Basic] Milvus ctor doesn't accept extra kwargs: {e}. Retrying with minimal args.")
+                        return MilvusVectorStore(
+                            embedding_function=vs_kwargs["embedding_function"],
+                            collection_name=target.name,
+                            connection_args=connection_args
+                        )
+
+            cache_key = (
+                target.name,
+                getattr(self, "partition", None),
+                None if USE_MILVUS_VECTOR_STORE else embedding_dim,
+            )
+            vectorstore = get_milvus_connection_service().get_vectorstore(cache_key, _build_vectorstore)
             
+            # 필터 expression (LangChain expr 인자로 pre-filter, v1 컬렉션의 category/기간 조건은 후처리)
+            spec = FilterSpec.from_parameters(parameters if isinstance(parameters, dict) else self.parameters)
+            search_kwargs = {}
+            fully_pushed = True
+            expr = ""
+            if spec:
+                milvus_collection = get_milvus_connection_service().get_collection(target.name)
+                typed_fields = any(field.name == "category" for field in milvus_collection.schema.fields)
+                expr, fully_pushed = spec.to_expr(typed_fields)
+                logger.info(f"[Basic] Applying filter expr: {expr or '-'} (post-filter={not fully_pushed})")
+            expr = target.scoped(expr)
+            if expr:
+                search_kwargs["expr"] = expr
+
+            # group 옵션: over-fetch 후 문서(file_no)별 개수 제한
+            group = group_options(parameters if isinstance(parameters, dict) else self.parameters)
+            fetch_k = effective_top_k * settings.search_group_overfetch_multiplier if group else effective_top_k
+
             # similarity_search_with_score_by_vector 사용하여 벡터 직접 검색
             try:
                 if getattr(self, "partition", None):
                     # Try passing partition_names if supported by current backend
                     results = vectorstore.similarity_search_with_score_by_vector(
                         embedding=embedding,
-                    k=effective_top_k,
-                    partition_names=[self.partition]
+                        k=fetch_k,
+                        partition_names=[self.partition],
+                        **search_kwargs
                     )
                 else:
                     results = vectorstore.similarity_search_with_score_by_vector(
                         embedding=embedding,
-                        k=effective_top_k
+                        k=fetch_k,
+                        **search_kwargs
                     )
             except TypeError:
                 # Fallback for backends which don't accept partition_names on search call
                 results = vectorstore.similarity_search_with_score_by_vector(
                     embedding=embedding,
-                    k=effective_top_k
+                    k=fetch_k,
+                    **search_kwargs
                 )
             
             # 결과 처리
@@ -232,12 +264,22 @@ class Semantic(BaseSearchStrategy):
                 # Apply threshold filter if provided: keep only scores > threshold
                 if threshold_val is not None and not (score_float > threshold_val):
                     continue
+                doc_metadata = dict(doc.metadata or {})
+                doc_metadata["metadata"] = self.parse_metadata(doc_metadata.get("metadata"))
+                if not fully_pushed and not spec.matches(
+                    doc_metadata.get("file_no", ""),
+                    doc_metadata["metadata"],
+                    category=doc_metadata.get("category"),
+                    created_at=doc_metadata.get("created_at"),
+                ):
+                    continue
                 candidate_embeddings.append({
                     "text": doc.page_content,
-                    "metadata": doc.metadata,
+                    "metadata": doc_metadata,
                     "score": score_float,
                 })
-            
+            if group:
+                candidate_embeddings = cap_per_group(candidate_embeddings, group["size"], effective_top_k)
             
             logger.info(f"[Basic] Found {len(candidate_embeddings)} candidates")
             
@@ -252,5 +294,7 @@ class Semantic(BaseSearchStrategy):
             
         except Exception as e:
             logger.error(f"[Basic] Error during search: {str(e)}")
+            # 컬렉션 삭제/재생성 등으로 캐시된 핸들이 무효일 수 있으므로 폐기
+            get_milvus_connection_service().invalidate(target.name)
             raise
 